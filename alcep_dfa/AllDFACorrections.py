@@ -1,101 +1,607 @@
 from wofa import FiniteAutomata
-from alcep_dfa.Nodes import SymbolNode, EditNode, EndNode
+from alcep_dfa.Nodes import SymbolNode, EditNode, EndNode, StateEncoding
 from alcep_dfa.Nodes.EditOperations import *
 from .Constants import *
-from queue import Queue
-import copy
-
-
-def all_dfa_corrections(to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata, alphabet=None) -> SymbolNode:
+from .Costs import EditCosts
+from .CompiledDFA import CompiledDFA
+from .TargetLanguage import TargetLanguage
+from .Limits import ConstructionLimits
+from .Worklists import Worklist, FIFOWorklist, PriorityWorklist, COSTS
+
+
+def all_dfa_corrections(to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata | None = None, alphabet=None,
+                        only_minimal: bool = False, max_cost=None,
+                        edit_costs: EditCosts | None = None, compiled_to_correct: CompiledDFA | None = None,
+                        compiled_minimal_dfa: CompiledDFA | None = None,
+                        worklist: Worklist | None = None, symmetry_reduction: bool = False,
+                        statistics: dict | None = None, target: TargetLanguage | None = None,
+                        limits: ConstructionLimits | None = None) -> SymbolNode | None:
     """
     Compute a SPPF that represents all possible ways to correct the to_correct DFA into a DFA that is language
     equivalent to the given minimal_dfa.
 
+    If only_minimal is set, the nodes are expanded best-first in order of their accumulated costs plus a lower bound
+    of the costs that are still necessary to process the states in their queue (A* search). The construction stops as
+    soon as the minimal costs of a correction are settled and only the sub-forest of the minimal corrections is
+    returned, i.e. the same SPPF that remains after shrinking the complete SPPF to the minimal edits.
+
+    If symmetry_reduction is set, the states of the to_correct DFA that are interchangeable, i.e. swapping them is an
+    automorphism of the to_correct DFA, are detected up front. If several unmapped states of such an orbit can be the
+    next mapped state, only the smallest of them is expanded and its family is annotated with all of them. The
+    corrections of the other states are the corrections of the family with the states swapped.
+
+    If max_cost is set, every status of the parse process whose costs plus the lower bound of its remaining costs
+    exceed max_cost is pruned before it is created. The nodes are then additionally distinguished by the costs to reach
+    them, such that the SPPF represents exactly the corrections with total costs of at most max_cost.
+
     :param to_correct: A DFA that should be corrected.
-    :param minimal_dfa: A minimal DFA that defines the target language.
+    :param minimal_dfa: A minimal DFA that defines the target language, not needed if target is set.
         !!! Must be the minimal DFA for the target language!!!
+    :param alphabet: The alphabet over which both automata are defined.
+    :param only_minimal: Build only the sub-forest that represents the corrections with minimal costs.
+    :param max_cost: The maximal total costs of the corrections represented by the SPPF, None for no limit.
+    :param edit_costs: The costs of the edit operations. Only used if only_minimal or max_cost is set,
+        defaults to EditCosts().
+    :param compiled_to_correct: The compiled to_correct DFA over the alphabet, compiled if None.
+    :param compiled_minimal_dfa: The compiled minimal_dfa over the alphabet, compiled if None.
+    :param worklist: The empty worklist of the nodes that still have to be considered, defaults to a FIFOWorklist.
+        The best-first construction requires a PriorityWorklist ordered by costs and defaults to one. Its statistics
+        describe the frontier of the construction afterward.
+    :param symmetry_reduction: Expand only one representative of interchangeable unmapped states.
+    :param statistics: A dict that is filled with statistics of the construction: the number of symbol nodes, the
+        number of families, the number of duplicate families that were not added again, the number of expanded nodes,
+        the size of the frontier and the exhausted limit (None if the construction is complete).
+    :param target: The compiled target language. If set, it replaces the minimal_dfa, the alphabet and the
+        compiled_minimal_dfa and their preprocessing is skipped.
+    :param limits: The limits of the construction, i.e. a deadline, a maximum number of symbol nodes and a maximum
+        memory. They are checked before each node is expanded. If a limit is exhausted, the construction stops and
+        None is returned, the statistics describe the limit and the state of the construction.
+
+    :return: The root node of the SPPF that represents all possible corrections or None if there is no correction
+        (within the budget) or a limit of the construction is exhausted.
+    """
+    # Without the anytime search, the construction yields no corrections and returns the root node
+    construction = _dfa_corrections(to_correct=to_correct, minimal_dfa=minimal_dfa, alphabet=alphabet,
+                                     only_minimal=only_minimal, max_cost=max_cost, edit_costs=edit_costs,
+                                     compiled_to_correct=compiled_to_correct,
+                                     compiled_minimal_dfa=compiled_minimal_dfa, worklist=worklist,
+                                     symmetry_reduction=symmetry_reduction, statistics=statistics, target=target,
+                                     limits=limits)
+    try:
+        while True:
+            next(construction)
+    except StopIteration as stop:
+        return stop.value
+
+
+def anytime_dfa_corrections(to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata | None = None, alphabet=None,
+                            edit_costs: EditCosts | None = None, compiled_to_correct: CompiledDFA | None = None,
+                            statistics: dict | None = None, target: TargetLanguage | None = None,
+                            limits: ConstructionLimits | None = None):
+    """
+    Compute corrections of the to_correct DFA with progressively smaller costs (depth-first branch and bound). The
+    node that processed the most letters is expanded first and among its families the one with the smallest costs
+    plus lower bound of the remaining costs. Thus, the search first dives greedily along the existing transitions of
+    the to_correct DFA, adds new states only if no cheaper family remains, and finds a first correction quickly.
+    Afterward, the search backtracks and each correction that is cheaper than all previous ones is yielded. Nodes
+    whose costs plus the lower bound of their remaining costs are not below the costs of the best correction are
+    pruned, thus the search ends as soon as no cheaper correction can exist, i.e. the costs of the last correction
+    are proven to be minimal.
 
-    :return: The root node of the SPPF that represents all possible corrections.
+    :param to_correct: A DFA that should be corrected.
+    :param minimal_dfa: A minimal DFA that defines the target language, not needed if target is set.
+        !!! Must be the minimal DFA for the target language!!!
+    :param alphabet: The alphabet over which both automata are defined.
+    :param edit_costs: The costs of the edit operations, defaults to EditCosts().
+    :param compiled_to_correct: The compiled to_correct DFA over the alphabet, compiled if None.
+    :param statistics: A dict that is filled with statistics of the search (see all_dfa_corrections) after the last
+        correction. If the exhausted limit is None, the costs of the last correction are minimal.
+    :param target: The compiled target language, replaces the minimal_dfa and the alphabet.
+    :param limits: The limits of the search, e.g. a deadline. If a limit is exhausted, the search stops.
+
+    :return: A generator of pairs of the costs and the correction, i.e. a list of lists of edit operations, with
+        strictly decreasing costs.
+    """
+    yield from _dfa_corrections(to_correct=to_correct, minimal_dfa=minimal_dfa, alphabet=alphabet, only_minimal=True,
+                                edit_costs=edit_costs, compiled_to_correct=compiled_to_correct,
+                                statistics=statistics, target=target, limits=limits, anytime=True)
+
+
+def _dfa_corrections(to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata | None = None, alphabet=None,
+                     only_minimal: bool = False, max_cost=None,
+                     edit_costs: EditCosts | None = None, compiled_to_correct: CompiledDFA | None = None,
+                     compiled_minimal_dfa: CompiledDFA | None = None,
+                     worklist: Worklist | None = None, symmetry_reduction: bool = False,
+                     statistics: dict | None = None, target: TargetLanguage | None = None,
+                     limits: ConstructionLimits | None = None, anytime: bool = False):
+    """
+    The construction of all_dfa_corrections and the search of anytime_dfa_corrections as a generator. If anytime is
+    set, the generator yields the improving corrections of the search and returns None. Otherwise, it yields nothing
+    and returns the root node of the SPPF.
     """
 
     if alphabet is None:
         alphabet = sorted(list(FiniteAutomata.get_alphabet()))
 
-    def aux_get_or_create_node(node_tuple):
+    if edit_costs is None:
+        edit_costs = EditCosts()
+
+    if worklist is None:
+        worklist = FIFOWorklist() if not only_minimal else PriorityWorklist(order=COSTS)
+    elif only_minimal and worklist.order != COSTS:
+        raise Exception("The best-first construction requires a worklist ordered by costs.")
+
+    def aux_get_or_create_node(node_key, costs=None, lower_bound=0):
         """
         auxiliary function that get or create a new node for the current status of the parse process.
 
-        :param node_tuple: The tuple that defines the current status of the parse process.
+        :param node_key: The key that defines the current status of the parse process.
+        :param costs: The costs to reach the node. Only used if the costs are tracked.
+        :param lower_bound: The lower bound of the remaining costs of the node. Only used if the costs are considered.
         :return: The node for the current status of the parse process.
         """
+        nonlocal number_of_families
+
+        # With a cost budget, the nodes are additionally distinguished by the costs to reach them.
+        cache_key = (node_key, costs) if max_cost is not None and not only_minimal else node_key
+
         # Check if the node already exists.
-        if node_tuple in node_cache:
-            return node_cache[node_tuple]
+        if cache_key in node_cache:
+            return node_cache[cache_key]
         else:
             # Create a new node for the current status of the parse process and add it to the node_cache.
-            new_created_node = SymbolNode(*node_tuple)
-            node_cache[node_tuple] = new_created_node
-
-            # If the queue is not empty, add the new node to the nodes_to_be_consider queue.
-            if node_tuple[2]:
-                nodes_to_be_consider.put(new_created_node)
+            new_created_node = SymbolNode(key=node_key, encoding=encoding)
+            node_cache[cache_key] = new_created_node
+
+            # If the queue is not empty, add the new node to the nodes_to_be_consider worklist. In the best-first
+            # construction the node is added by aux_add_family together with its costs.
+            if encoding.get_queue(node_key):
+                if not only_minimal:
+                    if track_costs:
+                        minimal_costs[new_created_node] = costs
+                    nodes_to_be_consider.put(new_created_node,
+                                             priority=node_key if nodes_to_be_consider.order != COSTS else costs)
+                else:
+                    lower_bounds[new_created_node] = lower_bound
             else:
-                # If the queue is empty, add a new EndNode as a child of the new created node.
-                new_end_node = EndNode()
-                new_created_node.add_family(left_node=None, right_node=new_end_node)
+                # If the queue is empty, add the EndNode as a child of the new created node.
+                new_created_node.add_family(left_node=None, right_node=end_node)
+                number_of_families += 1
 
             return new_created_node
 
+    def aux_add_family(current_node, next_node_key, edit_node=None, interchangeable_states=()):
+        """
+        auxiliary function that adds a family to the current node, which leads with the given edit operation node
+        (or without edit operations if it is None) to the node of the given status of the parse process.
+        With a cost budget, the family is dropped before its node is created if the costs to reach the node
+        plus the lower bound of its remaining costs exceed the budget. In the best-first construction, additionally
+        update the minimal known costs to reach the node and (re-)add it to the nodes_to_be_consider worklist if these
+        costs decrease.
+
+        :param current_node: The node to which the family is added.
+        :param next_node_key: The key that defines the status of the parse process after the family.
+        :param edit_node: The edit operation node of the family or None.
+        :param interchangeable_states: The interchangeable states of the family.
+        """
+        nonlocal number_of_families, number_of_duplicate_families, best_costs, best_end_node
+
+        if not track_costs:
+            next_node = aux_get_or_create_node(node_key=next_node_key)
+        else:
+            next_costs = minimal_costs[current_node]
+            if edit_node is not None:
+                next_costs += edit_node_costs[edit_node]
+
+            lower_bound = 0
+            if only_minimal or max_cost is not None:
+                lower_bound = aux_get_lower_bound(node_key=next_node_key)
+                if max_cost is not None and next_costs + lower_bound > max_cost:
+                    return
+                if best_costs is not None and next_costs + lower_bound >= best_costs:
+                    return
+
+            next_node = aux_get_or_create_node(node_key=next_node_key, costs=next_costs, lower_bound=lower_bound)
+
+        if edit_node is None:
+            is_added = current_node.add_family(left_node=None, right_node=next_node)
+        else:
+            is_added = current_node.add_family(left_node=next_node, right_node=edit_node,
+                                               interchangeable_states=interchangeable_states)
+
+        # Count the families that already existed
+        if is_added:
+            number_of_families += 1
+        else:
+            number_of_duplicate_families += 1
+
+        if not only_minimal:
+            return
+
+        if next_node not in minimal_costs or next_costs < minimal_costs[next_node]:
+            minimal_costs[next_node] = next_costs
+            if not anytime:
+                nodes_to_be_consider.put((next_costs, next_node),
+                                         priority=next_costs + lower_bounds.get(next_node, 0))
+                return
+
+            # In the anytime search, remember the family that reaches the node with its minimal known costs. A node
+            # with an empty queue ends a correction, which becomes the best correction if it is cheaper. The nodes
+            # are expanded depth-first, i.e. the node that processed the most letters first.
+            best_families[next_node] = (current_node, edit_node)
+            depths[next_node] = depths[current_node] + 1
+            if next_node in lower_bounds:
+                nodes_to_be_consider.put((next_costs, next_node),
+                                         priority=(-depths[next_node], next_costs + lower_bounds[next_node]))
+            elif best_costs is None or next_costs < best_costs:
+                best_costs = next_costs
+                best_end_node = next_node
+
+    def aux_get_next_node():
+        """
+        auxiliary function that gets the next node to be considered in the further parse process.
+        In the best-first construction, this is the node with the smallest costs plus lower bound of its remaining
+        costs. Nodes with an empty queue are collected as end nodes of the minimal corrections instead, and no
+        further node is returned as soon as the smallest estimated costs exceed the costs of these corrections.
+
+        :return: The next node to be considered or None if no node has to be considered anymore.
+        """
+        nonlocal optimal_costs
+
+        if not only_minimal:
+            return nodes_to_be_consider.get() if not nodes_to_be_consider.empty() else None
+
+        # In the anytime search, the nodes with an empty queue are handled by aux_add_family. Nodes that cannot lead
+        # to a cheaper correction are skipped.
+        if anytime:
+            while not nodes_to_be_consider.empty():
+                costs, next_node = nodes_to_be_consider.get()
+                if costs > minimal_costs[next_node] or next_node not in lower_bounds:
+                    continue
+                if best_costs is not None and costs + lower_bounds[next_node] >= best_costs:
+                    continue
+                return next_node
+            return None
+
+        while not nodes_to_be_consider.empty():
+            costs, next_node = nodes_to_be_consider.get()
+
+            # Skip outdated entries of nodes that were reached with lower costs afterward.
+            if costs > minimal_costs[next_node]:
+                continue
+
+            # The minimal costs are settled if the estimated costs exceed them.
+            if optimal_costs is not None and costs + lower_bounds.get(next_node, 0) > optimal_costs:
+                return None
+
+            # Nodes with an empty queue end a correction.
+            if next_node not in lower_bounds:
+                optimal_costs = costs
+                minimal_end_nodes.append(next_node)
+                continue
+
+            expanded_nodes.append(next_node)
+            return next_node
+
+        return None
+
+    def aux_get_best_correction():
+        """
+        auxiliary function that follows in the anytime search the families of the minimal known costs back from the
+        node that ends the best correction to the root node.
+
+        :return: The costs and the best correction, i.e. a list of lists of edit operations.
+        """
+        correction = []
+        costs = 0
+        node = best_end_node
+        while node in best_families:
+            node, edit_node = best_families[node]
+            if edit_node is not None:
+                correction.append(edit_node.get_edit_operations())
+                costs += edit_node_costs[edit_node]
+        correction.reverse()
+        return costs, correction
+
+    def aux_get_edit_node(edit_operations):
+        """
+        auxiliary function that gets the interned edit operation node for the given edit operations. The edit
+        operations and the edit operation nodes are hash-consed, such that equal edit operations and equal lists of
+        edit operations are shared by all families.
+
+        :param edit_operations: The list of edit operations.
+        :return: The edit operation node.
+        """
+        edit_operations = tuple(edit_operation_cache.setdefault(edit_operation, edit_operation)
+                                for edit_operation in edit_operations)
+
+        if edit_operations not in edit_node_cache:
+            new_edit_node = EditNode(edit_operations=list(edit_operations))
+            edit_node_cache[edit_operations] = new_edit_node
+            edit_node_costs[new_edit_node] = edit_costs.get_costs(edit_operations=edit_operations)
+
+        return edit_node_cache[edit_operations]
+
+    def aux_get_lower_bound(node_key):
+        """
+        auxiliary function that computes a lower bound of the costs that are at least necessary to process all
+        remaining letters of all states in the queue of the given status of the parse process.
+
+        :param node_key: The key that defines the status of the parse process.
+        :return: The lower bound of the remaining costs.
+        """
+        state_mapping, current_state, queue, _, seen_symbols = encoding.unpack(node_key)
+
+        lower_bound = 0
+        while queue:
+            # Get and remove the smallest state from the queue
+            queued_index = (queue & -queue).bit_length() - 1
+            queue &= queue - 1
+
+            first_letter = seen_symbols if queued_index == current_state - 1 else 0
+
+            if queued_index < number_of_states:
+                equivalence_class = encoding.classes_of_ids[encoding.get_class_id(state_mapping, queued_index)]
+                lower_bound += lower_bounds_to_correct[queued_index][equivalence_class][first_letter]
+            else:
+                lower_bound += lower_bounds_new_state[states_of_both[queued_index][1]][first_letter]
+
+        return lower_bound
+
+    def aux_shrink_to_minimal():
+        """
+        auxiliary function that removes after the best-first construction all families that are not part of a
+        correction with minimal costs. A family is part of such a correction if it is tight, i.e. the costs to reach
+        its symbol node are the costs to reach the current node plus the costs of the family, and from its symbol node
+        a node with an empty queue is reachable with the minimal costs.
+        """
+        # Collect for each node the tight families that lead to it.
+        tight_families = {}
+        for expanded_node in expanded_nodes:
+            for child in expanded_node.get_children():
+                next_node = aux_get_family_node(family=child)
+                if next_node is None:
+                    continue
+
+                family_costs = 0
+                if isinstance(child.get_right_node(), EditNode):
+                    family_costs = edit_node_costs[child.get_right_node()]
+
+                if minimal_costs[expanded_node] + family_costs == minimal_costs.get(next_node):
+                    tight_families.setdefault(next_node, []).append((expanded_node, child))
+
+        # Go backwards from all nodes with an empty queue and minimal costs over the tight families.
+        kept_children = {end_node: set(end_node.get_children()) for end_node in minimal_end_nodes}
+        stack = list(minimal_end_nodes)
+        while stack:
+            next_node = stack.pop()
+            for expanded_node, child in tight_families.get(next_node, []):
+                if expanded_node not in kept_children:
+                    kept_children[expanded_node] = set()
+                    stack.append(expanded_node)
+                kept_children[expanded_node].add(child)
+
+        # Keep the families in the order they were added
+        for kept_node, children in kept_children.items():
+            kept_node.set_children([child for child in kept_node.get_children() if child in children])
+
+        if root_node not in kept_children:
+            root_node.set_children([])
+
+    def aux_shrink_to_productive():
+        """
+        auxiliary function that removes after the construction with a cost budget all families that lead to a node
+        from which no node with an empty queue is reachable, because all continuations exceed the budget.
+        """
+        # Collect for each node its predecessors and start with the nodes with an empty queue.
+        predecessors = {}
+        productive_nodes = set()
+        for node in node_cache.values():
+            for child in node.get_children():
+                next_node = aux_get_family_node(family=child)
+                if next_node is None:
+                    productive_nodes.add(node)
+                else:
+                    predecessors.setdefault(next_node, []).append(node)
+
+        # Go backwards from the nodes with an empty queue.
+        stack = list(productive_nodes)
+        while stack:
+            next_node = stack.pop()
+            for predecessor in predecessors.get(next_node, []):
+                if predecessor not in productive_nodes:
+                    productive_nodes.add(predecessor)
+                    stack.append(predecessor)
+
+        for node in productive_nodes:
+            node.set_children([child for child in node.get_children()
+                               if aux_get_family_node(family=child) in productive_nodes
+                               or aux_get_family_node(family=child) is None])
+
+        if root_node not in productive_nodes:
+            root_node.set_children([])
+
+    def aux_is_swap_automorphism(state, other_state):
+        """
+        auxiliary function that checks if swapping two states of the to_correct DFA is an automorphism of the
+        to_correct DFA, i.e. both states are not initial, have the same final property and the swapped transitions
+        are exactly the transitions.
+
+        :param state: A state of the to_correct DFA.
+        :param other_state: The other state of the to_correct DFA.
+        :return: True if the states are interchangeable.
+        """
+        if old_initial_state in (state, other_state) or \
+                compiled_to_correct.is_final(state=state) != compiled_to_correct.is_final(state=other_state):
+            return False
+
+        swapped_states = list(range(number_of_states))
+        swapped_states[state], swapped_states[other_state] = other_state, state
+
+        for source_state in range(number_of_states):
+            for letter_index in range(number_of_letters):
+                successor = compiled_to_correct.get_successor(state=source_state, letter_index=letter_index)
+                swapped_successor = compiled_to_correct.get_successor(state=swapped_states[source_state],
+                                                                      letter_index=letter_index)
+                if (swapped_states[successor] if successor >= 0 else -1) != swapped_successor:
+                    return False
+        return True
+
+    def aux_get_family_node(family):
+        """
+        auxiliary function that gets the symbol node to which a family leads.
+
+        :param family: The family (packed node).
+        :return: The symbol node of the family or None if the family ends a correction.
+        """
+        if isinstance(family.get_right_node(), EditNode):
+            return family.get_left_node()
+        elif isinstance(family.get_right_node(), SymbolNode):
+            return family.get_right_node()
+        return None
+
     """
     Start of the main all_dfa_corrections function
     Preparation steps
     """
     # Check that both automata are DFAs
     assert to_correct.is_deterministic(require_dead_state=False), "Input automaton to_correct must be a DFA."
-    assert minimal_dfa.is_deterministic(require_dead_state=False), "Input automaton minimal_dfa must be a DFA."
 
-    # Check that the minimal dfa have for each state at least one outgoing transition
-    assert all(minimal_dfa.get_all_successors(s=q) for q in range(minimal_dfa.get_number_of_states())), \
-        "The minimal_dfa have a state without outgoing transitions."
+    # The minimal_dfa of a compiled target language is already checked
+    if target is not None:
+        minimal_dfa = target.minimal_dfa
+        alphabet = target.alphabet
+        compiled_minimal_dfa = target.compiled_minimal_dfa
+    else:
+        assert minimal_dfa.is_deterministic(require_dead_state=False), "Input automaton minimal_dfa must be a DFA."
 
-    # Define an order on the alphabet
-    if alphabet is None:
-        alphabet = sorted(list(FiniteAutomata.get_alphabet()))
+        # Check that the minimal dfa have for each state at least one outgoing transition
+        assert all(minimal_dfa.get_all_successors(s=q) for q in range(minimal_dfa.get_number_of_states())), \
+            "The minimal_dfa have a state without outgoing transitions."
+
+        # Define an order on the alphabet
+        if alphabet is None:
+            alphabet = sorted(list(FiniteAutomata.get_alphabet()))
+
+        assert all(a in alphabet for _, a, _ in minimal_dfa.get_transitions()), \
+            "All letters in minimal_dfa must be in the alphabet."
 
-    # Check that both automata used only alphabet symbols
+    # Check that the to_correct automaton uses only alphabet symbols
     assert all(a in alphabet for _, a, _ in to_correct.get_transitions()), \
         "All letters in to_correct must be in the alphabet."
-    assert all(a in alphabet for _, a, _ in minimal_dfa.get_transitions()), \
-        "All letters in minimal_dfa must be in the alphabet."
+
+    # Compile both automata into successor tables over the ordered alphabet
+    if compiled_to_correct is None:
+        compiled_to_correct = CompiledDFA(dfa=to_correct, alphabet=alphabet)
+    if compiled_minimal_dfa is None:
+        compiled_minimal_dfa = CompiledDFA(dfa=minimal_dfa, alphabet=alphabet)
+    number_of_letters = len(alphabet)
+    to_correct_successors = compiled_to_correct.successors
+    minimal_dfa_successors = compiled_minimal_dfa.successors
 
     # Get the initial state of the to_correct and minimal automaton
-    [old_initial_state] = to_correct.get_initials()
-    [minimal_dfa_start_state] = minimal_dfa.get_initials()
+    [old_initial_state] = compiled_to_correct.initials
+    [minimal_dfa_start_state] = compiled_minimal_dfa.initials
+
+    # Intern the states, equivalence classes and letters to small integers, which define an order on the states
+    number_of_states = compiled_to_correct.number_of_states
+    encoding = StateEncoding(number_of_states=number_of_states,
+                             number_of_classes=compiled_minimal_dfa.number_of_states,
+                             minimal_dfa_start_state=minimal_dfa_start_state, alphabet=alphabet)
+    states_of_both = encoding.states_of_both
+
+    # Assign each state of the to_correct DFA to the smallest state of its orbit of interchangeable states. Swapping
+    # states is transitive, thus it suffices to compare a state with the smallest state of each orbit.
+    orbit_of_states = list(range(number_of_states))
+    if symmetry_reduction:
+        for state in range(number_of_states):
+            for other_state in range(state):
+                if orbit_of_states[other_state] == other_state and aux_is_swap_automorphism(other_state, state):
+                    orbit_of_states[state] = other_state
+                    break
+
+    # Crate a dict that contains all nodes off the CSPPF. Key: the node key, value: the node object.
+    node_cache = {}
 
-    # Define an order on the states
-    states_of_both = [(TO_CORRECT, state) for state in range(to_correct.get_number_of_states())] + \
-                     [(MINIMAL_DFA, state) for state in range(minimal_dfa.get_number_of_states())] + \
-                     [(MINIMAL_DFA_START, minimal_dfa_start_state)]
+    # The intern tables of the edit operations and the edit operation nodes and the costs of each edit operation node
+    edit_operation_cache = {}
+    edit_node_cache = {}
+    edit_node_costs = {}
 
-    # Crate a dict that contains all nodes off the CSPPF. Key: the node label, value: the node object.
-    node_cache = {}
+    # The EndNode shared by all nodes with an empty queue and the counters of the added and the duplicate families
+    end_node = EndNode()
+    number_of_families = 0
+    number_of_duplicate_families = 0
 
     # Create a root node of the sppf.
-    root_tuple = (frozenset({}.items()), (), frozenset(set()), frozenset(set()), frozenset([]))
-    root_node = SymbolNode(*root_tuple)
-    node_cache[root_tuple] = root_node
-
-    # A queue that contains all nodes that still have to be considered in the further parse process
-    nodes_to_be_consider = Queue()
+    root_key = encoding.pack(state_mapping=0, current_state=0, queue=0, added=0, seen_symbols=0)
+    root_node = SymbolNode(key=root_key, encoding=encoding)
+    node_cache[root_key] = root_node
+
+    # A worklist that contains all nodes that still have to be considered in the further parse process. In the
+    # best-first construction, the nodes are ordered by the costs to reach them plus the lower bound of their
+    # remaining costs.
+    nodes_to_be_consider = worklist
+
+    # The costs to reach a node are tracked in the best-first construction, with a cost budget and if the worklist is
+    # ordered by them.
+    track_costs = only_minimal or max_cost is not None or worklist.order == COSTS
+
+    # The data of the best-first construction: the minimal known costs to reach a node (also used if the costs are
+    # tracked otherwise), the lower bounds of the remaining costs, all expanded nodes and the nodes with an empty
+    # queue that are reachable with minimal costs.
+    minimal_costs = {root_node: 0}
+    lower_bounds = {}
+    expanded_nodes = [root_node]
+    minimal_end_nodes = []
+    optimal_costs = None
+
+    # The data of the anytime search: the family that reaches each node with its minimal known costs, the number of
+    # letters processed on the way, the costs and the end node of the best correction and the costs of the last
+    # yielded correction.
+    best_families = {}
+    depths = {root_node: 0}
+    best_costs = None
+    best_end_node = None
+    yielded_costs = None
+
+    # Precompute for each state and equivalence class the lower bounds of the costs to process the letters of the
+    # alphabet starting with the i-th letter. A letter with a transition in the minimal_dfa needs at least a new
+    # transition or leaves an existing transition, a letter without such a transition at least removes an existing
+    # transition.
+    lower_bounds_to_correct = []
+    lower_bounds_new_state = []
+    if only_minimal or max_cost is not None:
+        costs_keep_transition = min(edit_costs.costs_leave_transition,
+                                    edit_costs.costs_remove_transition + edit_costs.costs_add_transition)
+
+        for equivalence_class in range(compiled_minimal_dfa.number_of_states):
+            letter_bounds = [edit_costs.costs_add_transition
+                             if compiled_minimal_dfa.get_successor(state=equivalence_class, letter_index=i) >= 0
+                             else 0 for i in range(number_of_letters)]
+            lower_bounds_new_state.append([sum(letter_bounds[i:]) for i in range(number_of_letters + 1)])
+
+        for state in range(number_of_states):
+            lower_bounds_to_correct.append([])
+            for equivalence_class in range(compiled_minimal_dfa.number_of_states):
+                letter_bounds = []
+                for letter_index in range(number_of_letters):
+                    has_successor = compiled_to_correct.get_successor(state=state, letter_index=letter_index) >= 0
+                    if compiled_minimal_dfa.get_successor(state=equivalence_class, letter_index=letter_index) >= 0:
+                        letter_bounds.append(costs_keep_transition if has_successor
+                                             else edit_costs.costs_add_transition)
+                    else:
+                        letter_bounds.append(edit_costs.costs_remove_transition if has_successor else 0)
+                lower_bounds_to_correct[state].append([sum(letter_bounds[i:]) for i in range(number_of_letters + 1)])
 
     """
     Chosen of the initial state steps
     """
     # Check if the initial state of the minimal_dfa is a final state.
-    is_initial_final = minimal_dfa_start_state in minimal_dfa.get_finals()
+    is_initial_final = compiled_minimal_dfa.is_final(state=minimal_dfa_start_state)
 
     # Iterate over all states and mark them as initial state
-    for state in range(to_correct.get_number_of_states()):
+    for state in range(number_of_states):
 
         if state == old_initial_state:
             edit_operations = [LeaveInitial(state=(TO_CORRECT, state))]
@@ -104,26 +610,21 @@ def all_dfa_corrections(to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata,
                                MarkAsInitial(state=(TO_CORRECT, state))]
 
             # Add eventually an edit operation for the final property of the next_state.
-            is_new_initial_final = state in to_correct.get_finals()
+            is_new_initial_final = compiled_to_correct.is_final(state=state)
             if is_initial_final and not is_new_initial_final:
                 edit_operations.append(MarkStateAsFinal(state=(TO_CORRECT, state)))
             elif not is_initial_final and is_new_initial_final:
                 edit_operations.append(MarkStateAsNonFinal(state=(TO_CORRECT, state)))
 
-        new_edit_node = EditNode(edit_operations=edit_operations)
+        new_edit_node = aux_get_edit_node(edit_operations=edit_operations)
 
         # Create a new node for the current status of the parse process
-        new_node_tuple = (
-            frozenset({state: (MINIMAL_DFA_START, minimal_dfa_start_state)}.items()), (),
-            frozenset({(TO_CORRECT, state)}), frozenset(set()), frozenset([]))
-        new_node = SymbolNode(*new_node_tuple)
-        node_cache[new_node_tuple] = new_node
+        new_node_key = encoding.pack(
+            state_mapping=encoding.map_state(state_mapping=0, state=state, class_id=encoding.start_class_id),
+            current_state=0, queue=1 << state, added=0, seen_symbols=0)
 
         # Add the new node and the edit operation node as children of the root node
-        root_node.add_family(left_node=new_node, right_node=new_edit_node)
-
-        # Add the node into the queue of nodes to be considered
-        nodes_to_be_consider.put(new_node)
+        aux_add_family(current_node=root_node, next_node_key=new_node_key, edit_node=new_edit_node)
 
     # Add a new state as the initial state
     edit_operations = [RemoveMarkAsInitial(state=old_initial_state),
@@ -134,84 +635,99 @@ def all_dfa_corrections(to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata,
     if is_initial_final:
         edit_operations.append(MarkStateAsFinal(state=(MINIMAL_DFA_START, minimal_dfa_start_state)))
 
-    new_edit_node = EditNode(edit_operations=edit_operations)
+    new_edit_node = aux_get_edit_node(edit_operations=edit_operations)
 
     # Create a new node for the current status of the parse process
-    new_node_tuple = (frozenset({}.items()), (), frozenset({(MINIMAL_DFA_START, minimal_dfa_start_state)}),
-                      frozenset({(MINIMAL_DFA_START, minimal_dfa_start_state)}), frozenset([]))
-    new_node = SymbolNode(*new_node_tuple)
-    node_cache[new_node_tuple] = new_node
+    new_node_key = encoding.pack(state_mapping=0, current_state=0, queue=1 << encoding.start_index,
+                                 added=1 << encoding.start_index, seen_symbols=0)
 
     # Add the new node and the edit operation node as children of the root node
-    root_node.add_family(left_node=new_node, right_node=new_edit_node)
-
-    # Add the node into the queue of nodes to be considered
-    nodes_to_be_consider.put(new_node)
+    aux_add_family(current_node=root_node, next_node_key=new_node_key, edit_node=new_edit_node)
 
     """
     Main parse process steps
     """
     # While there are still nodes to be considered. Compute for the next node all possible child nodes.
-    while not nodes_to_be_consider.empty():
+    exhausted_limit = None
+    number_of_expanded_nodes = 0
+    while True:
+        # In the anytime search, yield the best correction if it improved
+        if best_costs is not None and best_costs != yielded_costs:
+            costs, correction = aux_get_best_correction()
+            yielded_costs = best_costs = costs
+            yield costs, correction
+
+        # Stop the construction if a limit is exhausted
+        if limits is not None:
+            exhausted_limit = limits.check(number_of_nodes=len(node_cache))
+            if exhausted_limit is not None:
+                break
+
         # Get the next node to be considered
-        current_node = nodes_to_be_consider.get()
+        current_node = aux_get_next_node()
+        if current_node is None:
+            break
+        number_of_expanded_nodes += 1
 
         # Get the parameters of the current node
-        state_mapping, state, queue, added, seen_symbols = current_node.get_params_unfrozen()
+        state_mapping, current_state, queue, added, seen_symbols = encoding.unpack(current_node.get_key())
 
-        if not state:
+        if current_state:
+            state_index = current_state - 1
+        else:
             # Get the smallest node from the queue
-            state = next(s for s in states_of_both if s in queue)
+            state_index = (queue & -queue).bit_length() - 1
+        state = states_of_both[state_index]
 
         # Get the next symbol to be considered
-        letter = alphabet[len(seen_symbols)]
+        letter_index = seen_symbols
+        letter = alphabet[letter_index]
+
+        # Get the successor of the current state in the to_correct automaton for the letter or -1
+        if state[0] == TO_CORRECT:
+            successor_state = to_correct_successors[state[1] * number_of_letters + letter_index]
+        else:
+            successor_state = -1
 
         # Define the queue and the seen_symbols for the next node
-        if len(seen_symbols) == len(alphabet) - 1:
-            seen_symbols = []
-            next_tuple_state = ()
-            queue.remove(state)
+        if seen_symbols == number_of_letters - 1:
+            seen_symbols = 0
+            next_current_state = 0
+            queue &= ~(1 << state_index)
         else:
-            seen_symbols.append(letter)
-            next_tuple_state = state
+            seen_symbols += 1
+            next_current_state = state_index + 1
 
         # Compute the next equivalence class of the state following the letter transition in the minimal_dfa
         # Therefore, first get the equivalence class of the current state
         if state[0] == TO_CORRECT:
-            equivalence_class_state = state_mapping.get(state[1], None)[1]
+            equivalence_class_state = encoding.classes_of_ids[encoding.get_class_id(state_mapping, state[1])]
         else:
             equivalence_class_state = state[1]
 
         # Get the next equivalence class of the state following the letter transition in the minimal_dfa
         # IF there is no transition for the letter, add as only child the intermediate node with that consider
         # the next symbol and continue with the next node in the queue to_be_considered
-        next_equivalence_class_state = minimal_dfa.get_successors(s=equivalence_class_state, a=letter)
-        if len(next_equivalence_class_state) == 0:
+        next_equivalence_class_state = \
+            minimal_dfa_successors[equivalence_class_state * number_of_letters + letter_index]
+        if next_equivalence_class_state < 0:
 
             # If there are no successor for this letter crate a new node that skip the letter.
-            new_node = aux_get_or_create_node(node_tuple=(frozenset(state_mapping.items()), next_tuple_state,
-                                                          frozenset(queue), frozenset(added), frozenset(seen_symbols)))
+            new_node_key = encoding.pack(state_mapping=state_mapping, current_state=next_current_state, queue=queue,
+                                         added=added, seen_symbols=seen_symbols)
 
             # If the current state is a state in the to_correct automaton and has a successor for the current letter,
             # then remove this letter.
-            if state[0] == TO_CORRECT:
-                successors = to_correct.get_successors(s=state[1], a=letter)
-                if successors:
-                    [successor_state] = successors
-                    edit_node = EditNode(edit_operations=[RemoveTransition(source_state=state, symbol=letter,
-                                                                           target_state=(TO_CORRECT, successor_state))])
-
-                    current_node.add_family(left_node=new_node, right_node=edit_node)
-                else:
-                    current_node.add_family(left_node=None, right_node=new_node)
+            if successor_state >= 0:
+                edit_node = aux_get_edit_node(edit_operations=[
+                    RemoveTransition(source_state=state, symbol=letter, target_state=(TO_CORRECT, successor_state))])
+
+                aux_add_family(current_node=current_node, next_node_key=new_node_key, edit_node=edit_node)
             else:
-                current_node.add_family(left_node=None, right_node=new_node)
+                aux_add_family(current_node=current_node, next_node_key=new_node_key)
 
             continue
 
-        # Get the only next equivalence class state
-        [next_equivalence_class_state] = next_equivalence_class_state
-
         # Compute for the current status of the parser process (defined by the current node) all possible next states
         # for the current_State and the current considered letter. Thereby we have to consider the transition of the
         # equivalence class to next_equivalence_class for this letter (defined by the minimal_dfa).
@@ -225,18 +741,16 @@ def all_dfa_corrections(to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata,
         # 5. Consider the special case that the next state is the start state of the minimal_dfa.
         #
         # Additionally, create for each opportunity the corresponding nodes and edit operations
+        class_ids = encoding.get_class_ids(state_mapping)
 
         # 1. Change the current transition such that they lead to an in the automaton to be correct state
         # that is already mapped to the next equivalence class
-        for next_state in [q for q, eq_class in state_mapping.items() if eq_class[1] == next_equivalence_class_state]:
+        for next_state in [q for q, class_id in enumerate(class_ids)
+                           if class_id and encoding.classes_of_ids[class_id] == next_equivalence_class_state]:
 
             # Compute on based on the current transition of the to_correct automaton the edit operations
             # such that the only successor for the current state and letter is next_state.
-            successors = to_correct.get_successors(s=state[1], a=letter)
-
-            if state[0] == TO_CORRECT and successors:
-                [successor_state] = successors
-
+            if successor_state >= 0:
                 # Leave the transition unchanged
                 if next_state == successor_state:
                     edit_operations = [LeaveTransition(source_state=state, symbol=letter,
@@ -252,30 +766,37 @@ def all_dfa_corrections(to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata,
                 edit_operations = [AddTransition(source_state=state, symbol=letter,
                                                  target_state=(TO_CORRECT, next_state))]
 
-            # Create the new edit operation node and the get or create the new node.
-            new_edit_node = EditNode(edit_operations=edit_operations)
-            new_node = aux_get_or_create_node(node_tuple=(frozenset(state_mapping.items()), next_tuple_state,
-                                                          frozenset(queue), frozenset(added), frozenset(seen_symbols)))
+            # Create the new edit operation node and the key that defines the new node.
+            new_edit_node = aux_get_edit_node(edit_operations=edit_operations)
+            new_node_key = encoding.pack(state_mapping=state_mapping, current_state=next_current_state, queue=queue,
+                                         added=added, seen_symbols=seen_symbols)
 
             # Add the new node and the edit operation node as children of the current node
-            current_node.add_family(left_node=new_node, right_node=new_edit_node)
+            aux_add_family(current_node=current_node, next_node_key=new_node_key, edit_node=new_edit_node)
 
         # 2. Change the current transition such to a state in the automaton to be correct
         # that is not yet mapped to an equivalence class
-        for next_state in [q for q in range(to_correct.get_number_of_states()) if q not in state_mapping.keys()]:
+        unmapped_states = [q for q, class_id in enumerate(class_ids) if not class_id]
+        for next_state in unmapped_states:
+
+            # With the symmetry reduction, expand only the smallest unmapped state of each orbit. Its family
+            # represents all unmapped states of the orbit.
+            interchangeable_states = ()
+            if symmetry_reduction:
+                orbit = [q for q in unmapped_states if orbit_of_states[q] == orbit_of_states[next_state]]
+                if orbit[0] != next_state:
+                    continue
+                if len(orbit) > 1:
+                    interchangeable_states = tuple(orbit)
 
             # Mark the next_state with the corresponding equivalence class and add the next_state into the queue
-            next_state_mapping = copy.copy(state_mapping)
-            next_state_mapping[next_state] = (MINIMAL_DFA, next_equivalence_class_state)
-            next_queue = copy.copy(queue)
-            next_queue.add((TO_CORRECT, next_state))
+            next_state_mapping = encoding.map_state(state_mapping=state_mapping, state=next_state,
+                                                    class_id=next_equivalence_class_state + 1)
+            next_queue = queue | (1 << next_state)
 
             # Compute on based on the current transition of the to_correct automaton the edit operations
             # such that the only successor for the current state and letter is next_state.
-            successors = to_correct.get_successors(s=state[1], a=letter)
-            if state[0] == TO_CORRECT and successors:
-                [successor_state] = successors
-
+            if successor_state >= 0:
                 # Leave the transition unchanged
                 if next_state == successor_state:
                     edit_operations = [LeaveTransition(source_state=state, symbol=letter,
@@ -292,36 +813,32 @@ def all_dfa_corrections(to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata,
                                                  target_state=(TO_CORRECT, next_state))]
 
             # Add eventually an edit operation for the final property of the next_state.
-            is_eq_class_final = next_equivalence_class_state in minimal_dfa.get_finals()
-            is_next_state_final = next_state in to_correct.get_finals()
+            is_eq_class_final = compiled_minimal_dfa.finals >> next_equivalence_class_state & 1
+            is_next_state_final = compiled_to_correct.finals >> next_state & 1
             if is_eq_class_final and not is_next_state_final:
                 edit_operations.append(MarkStateAsFinal(state=(TO_CORRECT, next_state)))
             elif not is_eq_class_final and is_next_state_final:
                 edit_operations.append(MarkStateAsNonFinal(state=(TO_CORRECT, next_state)))
 
-            # Create the new edit operation node and the tuple that defines the new node by the current parameters
-            new_edit_node = EditNode(edit_operations=edit_operations)
-            new_node_tuple = (frozenset(next_state_mapping.items()), next_tuple_state, frozenset(next_queue),
-                              frozenset(added), frozenset(seen_symbols))
-
-            # Get or create the new node for the current status of the parse process.
-            new_node = aux_get_or_create_node(node_tuple=new_node_tuple)
+            # Create the new edit operation node and the key that defines the new node by the current parameters
+            new_edit_node = aux_get_edit_node(edit_operations=edit_operations)
+            new_node_key = encoding.pack(state_mapping=next_state_mapping, current_state=next_current_state,
+                                         queue=next_queue, added=added, seen_symbols=seen_symbols)
 
             # Add the new node and the edit operation node as children of the current node
-            current_node.add_family(left_node=new_node, right_node=new_edit_node)
+            aux_add_family(current_node=current_node, next_node_key=new_node_key, edit_node=new_edit_node,
+                           interchangeable_states=interchangeable_states)
 
         # Start of the cases 3, 4 and 5.
-        next_added = copy.copy(added)
-        next_queue = copy.copy(queue)
+        next_state_bit = 1 << (number_of_states + next_equivalence_class_state)
+        next_added = added
+        next_queue = queue | next_state_bit
         all_edit_options = []
 
-        next_queue.add((MINIMAL_DFA, next_equivalence_class_state))
-
         # 3. The next state is a new state (represented an equivalence class) for an equivalence class that is not
         # yet be added before. Then add this node to the added equivalence classes.
-        if (MINIMAL_DFA, next_equivalence_class_state) not in added:
-            next_added.add((MINIMAL_DFA, next_equivalence_class_state))
-
+        if not added & next_state_bit:
+            next_added = added | next_state_bit
 
         # 4. The next state is a new state (represented an equivalence class) for an equivalence class that is
         # already added before. Then we need to be considered the case that we connect the node to an already
@@ -334,7 +851,7 @@ def all_dfa_corrections(to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata,
         # 5. Consider the special case that the next state is the start state of the minimal_dfa.
         # Then if we had added a new start state we need to be considered to connect to this state.
         if next_equivalence_class_state == minimal_dfa_start_state:
-            if (MINIMAL_DFA_START, minimal_dfa_start_state) in added:
+            if added & (1 << encoding.start_index):
                 all_edit_options.append([AddTransition(source_state=state,
                                                        symbol=letter,
                                                        target_state=(MINIMAL_DFA_START, minimal_dfa_start_state))])
@@ -343,36 +860,52 @@ def all_dfa_corrections(to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata,
         # Note that case 3. und 4. have the same edit operation sequence that add a new node of this
         # equivalence class.
         edit_operation = [AddNewState(state=(MINIMAL_DFA, next_equivalence_class_state))]
-        if next_equivalence_class_state in minimal_dfa.get_finals():
+        if compiled_minimal_dfa.finals >> next_equivalence_class_state & 1:
             edit_operation.append(MarkStateAsFinal(state=(MINIMAL_DFA, next_equivalence_class_state)))
         edit_operation.append(AddTransition(source_state=state,
                                             symbol=letter,
                                             target_state=(MINIMAL_DFA, next_equivalence_class_state)))
         all_edit_options.append(edit_operation)
 
-        # Get or create the new node for the current status of the parse process.
-        new_node = aux_get_or_create_node(node_tuple=(frozenset(state_mapping.items()), next_tuple_state,
-                                                      frozenset(next_queue), frozenset(next_added),
-                                                      frozenset(seen_symbols)))
+        # Define the key of the new node for the current status of the parse process.
+        new_node_key = encoding.pack(state_mapping=state_mapping, current_state=next_current_state, queue=next_queue,
+                                     added=next_added, seen_symbols=seen_symbols)
 
         # If the current state is in the to_correct automaton and has a successor for the current letter,
         # then we need to remove this transition for all edit options.
-        if state[0] == TO_CORRECT:
-            successors = to_correct.get_successors(s=state[1], a=letter)
-            if successors:
-                [successor_state] = successors
-                all_edit_options = [[RemoveTransition(source_state=state, symbol=letter,
-                                                      target_state=(TO_CORRECT, successor_state))] + edit_ops
-                                    for edit_ops in all_edit_options]
+        if successor_state >= 0:
+            all_edit_options = [[RemoveTransition(source_state=state, symbol=letter,
+                                                  target_state=(TO_CORRECT, successor_state))] + edit_ops
+                                for edit_ops in all_edit_options]
 
         # Add for all possible edit operation sequences a new edit operation node
         # and add as a child of the current node.
         for edit_operations in all_edit_options:
             # Create the new edit operation node
-            new_edit_node = EditNode(edit_operations=edit_operations)
+            new_edit_node = aux_get_edit_node(edit_operations=edit_operations)
 
             # Add the new node and the edit operation node as children of the current node
-            current_node.add_family(left_node=new_node, right_node=new_edit_node)
-
-    # Return the root node
+            aux_add_family(current_node=current_node, next_node_key=new_node_key, edit_node=new_edit_node)
+
+    if statistics is not None:
+        statistics["number_of_symbol_nodes"] = len(node_cache)
+        statistics["number_of_families"] = number_of_families
+        statistics["number_of_duplicate_families"] = number_of_duplicate_families
+        statistics["number_of_expanded_nodes"] = number_of_expanded_nodes
+        statistics["frontier_size"] = len(nodes_to_be_consider)
+        statistics["exhausted_limit"] = exhausted_limit
+
+    # The SPPF of an interrupted construction is incomplete, the anytime search constructs no SPPF
+    if exhausted_limit is not None or anytime:
+        return None
+
+    # Remove all families that are not part of a minimal correction or a correction within the budget
+    if only_minimal:
+        aux_shrink_to_minimal()
+    elif max_cost is not None:
+        aux_shrink_to_productive()
+
+    # Return the root node or None if there is no correction
+    if not root_node.get_children():
+        return None
     return root_node
@@ -1,16 +1,20 @@
 from wofa import FiniteAutomata
 from alcep_dfa.Nodes.EditOperations import *
 from alcep_dfa.Constants import *
+from alcep_dfa.CompiledDFA import CompiledDFA
 from collections import defaultdict
 import copy
 
 
-def apply_correction(to_correct: FiniteAutomata, correction: list[list[EditOperation]]):
+def apply_correction(to_correct: FiniteAutomata, correction: list[list[EditOperation]],
+                     compiled_to_correct: CompiledDFA | None = None):
     """
     Apply the given correction to the given automata and return all possible resulting automata.
 
     :param to_correct: The automata to be corrected.
     :param correction: The correction to be applied.
+    :param compiled_to_correct: The compiled automata to be corrected. If given, its transitions and final states are
+        used instead of querying to_correct.
     :return: A list of all possible resulting automata.
     """
 
@@ -43,11 +47,14 @@ def apply_correction(to_correct: FiniteAutomata, correction: list[list[EditOpera
                     res.append([current])
             return res
 
-    old_transitions = to_correct.get_transitions()
+    if compiled_to_correct is None:
+        compiled_to_correct = to_correct
+
+    old_transitions = compiled_to_correct.get_transitions()
     old_states = {q for q, _, p in old_transitions}.union({p for q, _, p in old_transitions})
     states = set()
     initials = set()
-    finals = copy.copy(to_correct.get_finals())
+    finals = copy.copy(compiled_to_correct.get_finals())
     eq_class_to_state_mapping = defaultdict(list)
     transitions_options = []
 
@@ -0,0 +1,205 @@
+import math
+import os
+import time
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from time import perf_counter
+from wofa import FiniteAutomata
+from alcep_dfa.Constants import NUMBER_OF_MINIMAL_CORRECTIONS
+from alcep_dfa.TargetLanguage import TargetLanguage
+from alcep_dfa.Corrections import Correction
+
+# The status of the result of a submission
+CORRECTED = "corrected"
+NO_CORRECTION = "no_correction"
+TIMEOUT = "timeout"
+LIMIT_EXHAUSTED = "limit_exhausted"
+FAILED = "failed"
+
+
+def correct_submission(to_correct: FiniteAutomata, target: TargetLanguage, number_of_corrections: int = 1,
+                       time_limit: float | None = None, **kwargs) -> dict:
+    """
+    Corrects one submission and summarizes the result compactly, i.e. without the SPPF.
+
+    :param to_correct: The DFA that needs to be corrected.
+    :param target: The compiled target language.
+    :param number_of_corrections: The number of chosen corrections, i.e. the corrections with the smallest edit costs.
+    :param time_limit: If set, the construction of the SPPF stops cooperatively after this number of seconds.
+    :param kwargs: The further parameters of the Correction, e.g. the costs, only_minimal or max_nodes.
+    :return: A dict with the status, the runtime in seconds, the runtime of the construction of the SPPF alone (None
+        if the construction failed) and, if the submission is corrected, the minimal edit costs, the number of
+        corrections with these costs (None if the SPPF contains cycles), the chosen corrections and the memory usage
+        of the SPPF. If a limit of the construction is exhausted, the dict contains the limit, the number of expanded
+        nodes and the size of the frontier. If the correction failed, it contains the error.
+    """
+    start_time = perf_counter()
+    construction_runtime = None
+    try:
+        if time_limit is not None:
+            kwargs["deadline"] = time.monotonic() + time_limit
+        correction = Correction(to_correct=to_correct, target=target, **kwargs)
+        construction_runtime = perf_counter() - start_time
+        if correction.exhausted_limit is not None:
+            result = {"status": LIMIT_EXHAUSTED,
+                      "exhausted_limit": correction.exhausted_limit,
+                      "number_of_expanded_nodes": correction.construction_statistics["number_of_expanded_nodes"],
+                      "frontier_size": correction.construction_statistics["frontier_size"]}
+        elif correction.forest is None:
+            result = {"status": NO_CORRECTION}
+        else:
+            correction.compute_minimal_edit_costs()
+            if correction.minimal_edits_costs[0] == math.inf:
+                result = {"status": NO_CORRECTION}
+            else:
+                # The corrections with minimal edit costs are only countable without cycles in the SPPF
+                number_of_minimal_corrections = None
+                if not correction.engine.has_cycles:
+                    number_of_minimal_corrections = correction.analyze(
+                        analyses=[NUMBER_OF_MINIMAL_CORRECTIONS])[NUMBER_OF_MINIMAL_CORRECTIONS]
+                result = {"status": CORRECTED,
+                          "minimal_edit_costs": correction.minimal_edits_costs[0],
+                          "number_of_minimal_corrections": number_of_minimal_corrections,
+                          "corrections": [edits for _, edits in correction.k_best(k=number_of_corrections)],
+                          "memory_usage": correction.get_memory_usage()}
+    except Exception as exception:
+        result = {"status": FAILED, "error": repr(exception)}
+
+    result["runtime"] = perf_counter() - start_time
+    result["construction_runtime"] = construction_runtime
+    return result
+
+
+def _correction_worker(connection, target: TargetLanguage, number_of_corrections: int, kwargs: dict):
+    """
+    The loop of a worker process of correct_many. The target language is received once when the worker is started,
+    afterwards the worker receives the submissions one at a time and sends back their results until it receives None.
+
+    :param connection: The connection to the parent process.
+    :param target: The compiled target language.
+    :param number_of_corrections: The number of chosen corrections of each submission.
+    :param kwargs: The further parameters of the Correction.
+    """
+    FiniteAutomata.set_alphabet(sigma=target.alphabet)
+    while True:
+        try:
+            to_correct = connection.recv()
+        except EOFError:
+            break
+        if to_correct is None:
+            break
+        connection.send(correct_submission(to_correct=to_correct, target=target,
+                                           number_of_corrections=number_of_corrections, **kwargs))
+
+
+def correct_many(submissions, target: TargetLanguage, workers: int | None = None, timeout: float | None = None,
+                 number_of_corrections: int = 1, **kwargs):
+    """
+    Corrects many submissions of one exercise in a pool of long-lived worker processes. Each worker receives the
+    compiled target language only once when it is started and then corrects one submission at a time. A worker that
+    exceeds the timeout for a submission is terminated and replaced by a new worker, thus a single hard submission
+    neither blocks the pool nor leaks memory. The results are yielded as soon as their submission is finished, i.e.
+    not necessarily in the order of the submissions.
+
+    :param submissions: An iterable of the DFAs to be corrected, it is consumed lazily.
+    :param target: The target language compiled by TargetLanguage.compile.
+    :param workers: The number of worker processes, defaults to the number of CPUs.
+    :param timeout: If set, the maximum number of seconds for the correction of a submission.
+    :param number_of_corrections: The number of chosen corrections of each submission.
+    :param kwargs: The further parameters of correct_submission, e.g. the costs, only_minimal or time_limit. A
+        time_limit below the timeout stops a hard submission cooperatively, without terminating its worker.
+    :return: A generator of pairs of the index of the submission and its result (see correct_submission). The result
+        of a submission that exceeded the timeout or crashed its worker has the status TIMEOUT or FAILED.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise Exception("The number of workers must be positive.")
+
+    def aux_start_worker():
+        """
+        auxiliary function that starts a worker process.
+
+        :return: The process and the connection to it.
+        """
+        connection, worker_connection = Pipe()
+        process = Process(target=_correction_worker,
+                          args=(worker_connection, target, number_of_corrections, kwargs), daemon=True)
+        process.start()
+        worker_connection.close()
+        return process, connection
+
+    def aux_stop_worker(process: Process, connection, terminate: bool):
+        """
+        auxiliary function that stops a worker process.
+
+        :param process: The process.
+        :param connection: The connection to the process.
+        :param terminate: If set, the process is terminated. Otherwise, it is asked to finish.
+        """
+        if terminate:
+            process.terminate()
+        else:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        process.join()
+        connection.close()
+
+    submissions = enumerate(submissions)
+    idle = [aux_start_worker() for _ in range(workers)]
+
+    # The running submissions by the connection of their worker: the worker, the index and the start time
+    running = {}
+    exhausted = False
+    try:
+        while True:
+            # Assign the next submissions to the idle workers
+            while idle and not exhausted:
+                next_submission = next(submissions, None)
+                if next_submission is None:
+                    exhausted = True
+                    break
+                index, to_correct = next_submission
+                process, connection = idle.pop()
+                connection.send(to_correct)
+                running[connection] = (process, index, perf_counter())
+
+            if not running:
+                break
+
+            # Wait for the next result or the next deadline
+            wait_time = None
+            if timeout is not None:
+                first_start_time = min(start_time for _, _, start_time in running.values())
+                wait_time = max(0.0, first_start_time + timeout - perf_counter())
+
+            for connection in wait(list(running), timeout=wait_time):
+                process, index, start_time = running.pop(connection)
+                try:
+                    result = connection.recv()
+                except EOFError:
+                    # The worker crashed, e.g. it ran out of memory
+                    aux_stop_worker(process=process, connection=connection, terminate=True)
+                    idle.append(aux_start_worker())
+                    yield index, {"status": FAILED, "error": "The worker terminated without a result.",
+                                  "runtime": perf_counter() - start_time}
+                    continue
+                idle.append((process, connection))
+                yield index, result
+
+            # Recycle the workers whose submission exceeded the timeout
+            if timeout is not None:
+                for connection, (process, index, start_time) in list(running.items()):
+                    runtime = perf_counter() - start_time
+                    if runtime >= timeout:
+                        del running[connection]
+                        aux_stop_worker(process=process, connection=connection, terminate=True)
+                        idle.append(aux_start_worker())
+                        yield index, {"status": TIMEOUT, "runtime": runtime}
+    finally:
+        for process, connection in idle:
+            aux_stop_worker(process=process, connection=connection, terminate=False)
+        for connection, (process, _, _) in running.items():
+            aux_stop_worker(process=process, connection=connection, terminate=True)
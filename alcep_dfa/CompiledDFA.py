@@ -0,0 +1,213 @@
+from wofa import FiniteAutomata
+from array import array
+from collections import deque
+
+
+class CompiledDFA:
+    """
+    A read-only compiled representation of a DFA for the construction of the SPPF. The successors are stored in a
+    dense table indexed by the state and the index of the letter in the ordered alphabet, the final states in a
+    bitmask. This avoids the method calls of the FiniteAutomata on the hot path of the construction.
+    """
+
+    def __init__(self, dfa: FiniteAutomata, alphabet: list):
+        """
+        Compile the given DFA.
+
+        :param dfa: The DFA to compile.
+        :param alphabet: The ordered alphabet over which the DFA is defined.
+        """
+        self.alphabet = alphabet
+        self.letter_indices = {letter: index for index, letter in enumerate(alphabet)}
+        self.number_of_letters = len(alphabet)
+        self.number_of_states = dfa.get_number_of_states()
+        self.initials = sorted(dfa.get_initials())
+        self.transitions = sorted(dfa.get_transitions())
+
+        # The successor table, -1 marks a missing transition
+        self.successors = array('i', [-1]) * (self.number_of_states * self.number_of_letters)
+        for source_state, letter, target_state in self.transitions:
+            self.successors[source_state * self.number_of_letters + self.letter_indices[letter]] = target_state
+
+        # The bitmask of the final states
+        self.finals = 0
+        for state in dfa.get_finals():
+            self.finals |= 1 << state
+
+    def get_successor(self, state: int, letter_index: int) -> int:
+        """
+        Get the successor of a state for the letter with the given index.
+
+        :param state: The state.
+        :param letter_index: The index of the letter in the alphabet.
+        :return: The successor or -1 if there is no transition.
+        """
+        return self.successors[state * self.number_of_letters + letter_index]
+
+    def has_successors(self, state: int) -> bool:
+        """
+        Check if a state has at least one outgoing transition.
+
+        :param state: The state.
+        :return: True if the state has an outgoing transition.
+        """
+        offset = state * self.number_of_letters
+        return any(successor >= 0 for successor in self.successors[offset:offset + self.number_of_letters])
+
+    def is_final(self, state: int) -> bool:
+        """
+        Check if a state is a final state.
+
+        :param state: The state.
+        :return: True if the state is final.
+        """
+        return bool(self.finals >> state & 1)
+
+    def get_finals(self) -> set:
+        """
+        Get the final states.
+
+        :return: The set of final states.
+        """
+        return {state for state in range(self.finals.bit_length()) if self.finals >> state & 1}
+
+    def get_shortest_words(self) -> dict:
+        """
+        Compute for each reachable state the shortest word that leads from the initial state to it, the first in the
+        order of the alphabet among words of the same length.
+
+        :return: A dict with the shortest word of each reachable state.
+        """
+        shortest_words = {}
+        queue = deque((state, "") for state in self.initials)
+
+        while queue:
+            state, word = queue.popleft()
+
+            # Guarantee storage of exactly the shortest word only
+            if state in shortest_words:
+                continue
+            shortest_words[state] = word
+
+            for letter_index, letter in enumerate(self.alphabet):
+                successor = self.get_successor(state=state, letter_index=letter_index)
+                if successor >= 0 and successor not in shortest_words:
+                    queue.append((successor, word + letter))
+        return shortest_words
+
+    def get_canonical_numbering(self) -> list:
+        """
+        Number the states in breadth-first order from the initial states over the ordered alphabet. The unreachable
+        states follow, in breadth-first order from the unnumbered state with the smallest colour (see
+        get_state_colours) and the smallest numbering of the states it reaches, until all states are numbered.
+        Isomorphic DFAs, which differ only in the numbering of their states, have the same renumbered DFA.
+
+        :return: The new number of each state.
+        """
+        numbering = [-1] * self.number_of_states
+        next_number = self.number_reachable_states(numbering=numbering, roots=self.initials, next_number=0)
+
+        while next_number < self.number_of_states:
+            colours = self.get_state_colours(numbering=numbering)
+
+            # The root of the next block, ties of the colour are broken by the numbering the root leads to
+            best_root, best_description = -1, None
+            for state in range(self.number_of_states):
+                if numbering[state] >= 0 or best_root >= 0 and colours[state] > colours[best_root]:
+                    continue
+                block = list(numbering)
+                self.number_reachable_states(numbering=block, roots=[state], next_number=next_number)
+                description = self.get_description(numbering=block)
+                description = description["finals"], description["transitions"]
+                if best_root < 0 or colours[state] < colours[best_root] or description < best_description:
+                    best_root, best_description = state, description
+            next_number = self.number_reachable_states(numbering=numbering, roots=[best_root], next_number=next_number)
+        return numbering
+
+    def number_reachable_states(self, numbering: list, roots: list, next_number: int) -> int:
+        """
+        Number the unnumbered states reachable from the roots in breadth-first order over the ordered alphabet.
+
+        :param numbering: The numbering of the states, -1 for unnumbered states, is extended in place.
+        :param roots: The unnumbered roots in the order of their numbers.
+        :param next_number: The number of the first root.
+        :return: The next free number.
+        """
+        queue = deque()
+        for state in roots:
+            numbering[state] = next_number
+            next_number += 1
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for letter_index in range(self.number_of_letters):
+                successor = self.get_successor(state=state, letter_index=letter_index)
+                if successor >= 0 and numbering[successor] < 0:
+                    numbering[successor] = next_number
+                    next_number += 1
+                    queue.append(successor)
+        return next_number
+
+    def get_state_colours(self, numbering: list) -> list:
+        """
+        Colour the unnumbered states by colour refinement independent of their numbering: the colour of a state is
+        refined from its finality and the numbers or colours of its successors and predecessors for each letter,
+        until the colours are stable. The colours are ranked by their signatures, so that isomorphic DFAs get the
+        same colours.
+
+        :param numbering: The numbering of the states, -1 for unnumbered states.
+        :return: The colour of each state, -1 for numbered states.
+        """
+        predecessors = [[] for _ in range(self.number_of_states)]
+        for source_state, letter, target_state in self.transitions:
+            predecessors[target_state].append((self.letter_indices[letter], source_state))
+
+        colours = [-1 if numbering[state] >= 0 else 0 for state in range(self.number_of_states)]
+
+        # A numbered neighbour is identified by its number, an unnumbered one by its colour
+        def aux_encode(state: int) -> int:
+            return numbering[state] if numbering[state] >= 0 else -2 - colours[state]
+
+        number_of_colours = 0
+        while True:
+            signatures = {}
+            for state in range(self.number_of_states):
+                if numbering[state] < 0:
+                    signatures[state] = (
+                        colours[state], self.is_final(state),
+                        tuple(-1 if successor < 0 else aux_encode(successor)
+                              for successor in (self.get_successor(state=state, letter_index=letter_index)
+                                                for letter_index in range(self.number_of_letters))),
+                        tuple(sorted((letter_index, aux_encode(source_state))
+                                     for letter_index, source_state in predecessors[state])))
+            ranks = {signature: rank for rank, signature in enumerate(sorted(set(signatures.values())))}
+            for state, signature in signatures.items():
+                colours[state] = ranks[signature]
+
+            if len(ranks) == number_of_colours:
+                return colours
+            number_of_colours = len(ranks)
+
+    def get_description(self, numbering: list | None = None) -> dict:
+        """
+        Get a JSON serializable description of the compiled DFA, e.g. to check that a saved SPPF belongs to the DFA.
+
+        :param numbering: If set, the states are renumbered, e.g. by get_canonical_numbering.
+        :return: The dict of the number of states, the initial states, the transitions and the final states.
+        """
+        if numbering is None:
+            numbering = range(self.number_of_states)
+        return {"number_of_states": self.number_of_states,
+                "initials": sorted(numbering[state] for state in self.initials),
+                "transitions": sorted([numbering[source_state], letter, numbering[target_state]]
+                                      for source_state, letter, target_state in self.transitions),
+                "finals": sorted(numbering[state] for state in self.get_finals())}
+
+    def get_transitions(self) -> list:
+        """
+        Get the transitions.
+
+        :return: The list of transitions (source_state, letter, target_state).
+        """
+        return self.transitions
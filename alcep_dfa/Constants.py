@@ -2,3 +2,14 @@
 TO_CORRECT = "to_correct"
 MINIMAL_DFA = "minimal_dfa"
 MINIMAL_DFA_START = "minimal_dfa_start"
+
+# Analyses
+MINIMAL_EDIT_COSTS = "minimal_edit_costs"
+NUMBER_OF_CORRECTIONS = "number_of_corrections"
+NUMBER_OF_MINIMAL_CORRECTIONS = "number_of_minimal_corrections"
+ALLOWED_MAPPING = "allowed_mapping"
+
+# Limits of the construction
+DEADLINE = "deadline"
+MAX_NODES = "max_nodes"
+MAX_MEMORY = "max_memory"
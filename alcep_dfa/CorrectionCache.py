@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from wofa import FiniteAutomata
+from alcep_dfa.CompiledDFA import CompiledDFA
+from alcep_dfa.TargetLanguage import TargetLanguage
+from alcep_dfa.Costs import EditCosts
+from alcep_dfa.FrozenForest import FrozenForest
+from alcep_dfa.ForestStorage import save_forest, load_forest
+from alcep_dfa.Corrections import Correction
+
+
+class CorrectionCache:
+    """
+    A content-addressed cache of the SPPFs of corrections. Submissions that are identical or isomorphic, i.e. differ
+    only in the numbering of their states, share one cached SPPF. The DFA to be corrected is renumbered canonically
+    (see CompiledDFA.get_canonical_numbering) and the key is the hash of the renumbered DFA, the minimal DFA, the
+    alphabet, the costs and the options of the construction.
+
+    The SPPFs are cached with the canonical numbering in a bounded in-memory LRU cache and optionally in a directory
+    on disk (see save_forest). A cached SPPF is translated back to the state numbers of the submission.
+
+    A Correction from the cache represents the same set of corrections as a Correction constructed for the submission,
+    but only up to the order of the corrections and of the steps inside each correction: the cached SPPF keeps the
+    order of the construction for the submission that was cached first, whose states are visited in another order.
+    Thus, the order of get_all_corrections, iter_corrections, correction_at and index_of, the order of corrections
+    with equal costs in k_best, and the order of the steps of a correction can differ from a constructed Correction.
+    Each Correction is consistent in itself, e.g. index_of inverts its correction_at.
+    """
+
+    def __init__(self, maxsize: int = 128, directory: str | None = None):
+        """
+        Initialize a CorrectionCache.
+
+        :param maxsize: The maximum number of SPPFs in memory, the least recently used SPPF is evicted first.
+        :param directory: If set, the SPPFs are also stored in this directory and loaded from it on a miss in memory.
+        """
+        if maxsize < 1:
+            raise Exception("The size of the cache must be positive.")
+        self.maxsize = maxsize
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        # The cached forests with the canonical numbering by their keys, in the order of their last use
+        self.forests = OrderedDict()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get_key(self, compiled_to_correct: CompiledDFA, compiled_minimal_dfa: CompiledDFA, numbering: list,
+                alphabet: list, edit_costs: EditCosts, options: dict) -> str:
+        """
+        Get the key of the SPPF of a correction.
+
+        :param compiled_to_correct: The compiled DFA to be corrected.
+        :param compiled_minimal_dfa: The compiled minimal DFA.
+        :param numbering: The canonical numbering of the states of the DFA to be corrected.
+        :param alphabet: The ordered alphabet.
+        :param edit_costs: The costs of the edit operations.
+        :param options: The options of the construction that change the SPPF.
+        :return: The hex digest of the key.
+        """
+        content = json.dumps({"to_correct": compiled_to_correct.get_description(numbering=numbering),
+                              "minimal_dfa": compiled_minimal_dfa.get_description(),
+                              "alphabet": alphabet,
+                              "costs": edit_costs.get_costs_vector(),
+                              "options": options}, sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get_forest(self, key: str) -> FrozenForest | None:
+        """
+        Get a cached forest with the canonical numbering, from memory or from disk.
+
+        :param key: The key of the SPPF.
+        :return: The forest or None if the SPPF is not cached.
+        """
+        if key in self.forests:
+            self.forests.move_to_end(key)
+            self.hits += 1
+            return self.forests[key]
+
+        if self.directory is not None and os.path.exists(os.path.join(self.directory, key + ".sppf")):
+            forest = load_forest(path=os.path.join(self.directory, key + ".sppf"))[0]
+            self.put_forest(key=key, forest=forest, save=False)
+            self.disk_hits += 1
+            return forest
+
+        self.misses += 1
+        return None
+
+    def put_forest(self, key: str, forest: FrozenForest, save: bool = True):
+        """
+        Cache a forest with the canonical numbering.
+
+        :param key: The key of the SPPF.
+        :param forest: The forest.
+        :param save: If set and the cache has a directory, the forest is also stored on disk.
+        """
+        self.forests[key] = forest
+        self.forests.move_to_end(key)
+        while len(self.forests) > self.maxsize:
+            self.forests.popitem(last=False)
+
+        if save and self.directory is not None:
+            save_forest(path=os.path.join(self.directory, key + ".sppf"), forest=forest, metadata={"key": key})
+
+    def get_correction(self, to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata | None = None,
+                       **kwargs) -> Correction:
+        """
+        Get the Correction of a DFA, the SPPF is taken from the cache if an isomorphic DFA was corrected before.
+        Otherwise, the SPPF is constructed and cached. Empty SPPFs are not cached. The corrections are the same as of
+        a constructed Correction, but their order and the order of their steps can differ (see CorrectionCache).
+
+        :param to_correct: The DFA that needs to be corrected.
+        :param minimal_dfa: The target minimal DFA, not needed if the target language is given.
+        :param kwargs: The further parameters of the Correction, e.g. the costs, max_cost or target.
+        :return: The Correction.
+        """
+        target = kwargs.get("target")
+        if target is None:
+            target = TargetLanguage.compile(minimal_dfa=minimal_dfa, alphabet=kwargs.get("alphabet"))
+            kwargs["target"] = target
+        alphabet = target.alphabet
+        edit_costs = EditCosts(**{name: costs for name, costs in kwargs.items() if name.startswith("costs_")})
+        options = {"only_minimal": kwargs.get("only_minimal", False), "max_cost": kwargs.get("max_cost"),
+                   "symmetry_reduction": kwargs.get("symmetry_reduction", False)}
+
+        compiled_to_correct = CompiledDFA(dfa=to_correct, alphabet=alphabet)
+        numbering = compiled_to_correct.get_canonical_numbering()
+        key = self.get_key(compiled_to_correct=compiled_to_correct,
+                           compiled_minimal_dfa=target.compiled_minimal_dfa,
+                           numbering=numbering, alphabet=alphabet, edit_costs=edit_costs, options=options)
+
+        forest = self.get_forest(key=key)
+        if forest is not None:
+            # Translate the forest back to the numbering of the states of the submission
+            states = [0] * len(numbering)
+            for state, number in enumerate(numbering):
+                states[number] = state
+            return Correction(to_correct=to_correct, minimal_dfa=minimal_dfa,
+                              forest=forest.rename_states(states=states), **kwargs)
+
+        correction = Correction(to_correct=to_correct, minimal_dfa=minimal_dfa, **kwargs)
+        if correction.forest is not None:
+            self.put_forest(key=key, forest=correction.forest.rename_states(states=numbering))
+        return correction
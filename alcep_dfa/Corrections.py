@@ -1,17 +1,62 @@
 from wofa import FiniteAutomata
+import math
+import os
 import random
 from collections import deque
-from alcep_dfa.Nodes import SymbolNode, PackedNode, EditNode, EndNode
-from alcep_dfa.Visitors import MinCostsComputationVisitor, ShrinkToMinimal, GetAllEditsVisitor, \
-    ShrinkToAllowedMappings, ShrinkToMinimalDFAs, GetNumberOfCorrectionsVisitor
-from alcep_dfa.Constants import MINIMAL_DFA, MINIMAL_DFA_START
-from alcep_dfa import all_dfa_corrections
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappop
+from itertools import islice, accumulate
+from bisect import bisect_right
+from alcep_dfa.Nodes import SymbolNode
+from alcep_dfa.Visitors import Engine, MinCostsComputationVisitor, ShrinkToMinimal, GetAllEditsVisitor, \
+    ShrinkToAllowedMappings, ShrinkToMinimalDFAs, GetNumberOfCorrectionsVisitor, SemiringVisitor, FusedVisitor
+from alcep_dfa.Semirings import Semiring, MinimalCountingSemiring, ProfilesTropicalSemiring
+from alcep_dfa.Constants import MINIMAL_DFA, MINIMAL_DFA_START, MINIMAL_EDIT_COSTS, NUMBER_OF_CORRECTIONS, \
+    NUMBER_OF_MINIMAL_CORRECTIONS, ALLOWED_MAPPING
+from alcep_dfa.Costs import EditCosts
+from alcep_dfa.CompiledDFA import CompiledDFA
+from alcep_dfa.TargetLanguage import TargetLanguage
+from alcep_dfa.Limits import ConstructionLimits
+from alcep_dfa.Worklists import create_worklist, FIFO, COSTS
+from alcep_dfa.FrozenForest import FrozenForest, freeze_forest
+from alcep_dfa.ForestStorage import save_forest, load_forest
+from alcep_dfa import all_dfa_corrections, anytime_dfa_corrections
+from alcep_dfa.ApplyCorrection import apply_correction
 
 
 # TODO für 1:1 mapping filter nur auf den ersten buchstaben des Pfades beschränken
 # TODO bei shrink_to_corrections_to_minimal_dfas kann es dazu führen das noch zyklen im SPPF enthalten sind.
 #  Grund bisher unbekannt -> Grund finden und Bug beheben.
 
+# The state of a worker process of Correction.parallel_map
+_worker_correction = None
+_worker_function = None
+
+
+def _initialize_worker(forest: FrozenForest, function):
+    """
+    Initializes a worker process of Correction.parallel_map, the forest is sent to each worker only once.
+
+    :param forest: The frozen forest.
+    :param function: The function to apply to the corrections.
+    """
+    global _worker_correction, _worker_function
+    _worker_correction = Correction.__new__(Correction)
+    _worker_correction.set_forest(forest=forest)
+    _worker_function = function
+
+
+def _map_index_range(start: int, stop: int) -> list:
+    """
+    Applies the function of a worker process to the corrections with the indices start to stop - 1.
+
+    :param start: The index of the first correction.
+    :param stop: The index after the last correction.
+    :return: The list of the results.
+    """
+    return [_worker_function(_worker_correction.correction_at(index=index)) for index in range(start, stop)]
+
+
 class Correction:
     """
     A class that represents and manages corrections from a given DFA to a minimal DFA.
@@ -19,32 +64,55 @@ class Correction:
     represents all possible sequences of edit operations.
     """
 
-    def __init__(self, to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata, alphabet=None, costs_add_new_state=1,
+    def __init__(self, to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata | None = None, alphabet=None,
+                 costs_add_new_state=1,
                  costs_add_transition=1, costs_leave_initial=0, costs_leave_transition=0, costs_mark_as_initial=1,
-                 costs_mark_final=1, costs_mark_non_final=1, costs_remove_initial=1, costs_remove_transition=0):
+                 costs_mark_final=1, costs_mark_non_final=1, costs_remove_initial=1, costs_remove_transition=0,
+                 only_minimal=False, max_cost=None, worklist=None, symmetry_reduction=False,
+                 forest: FrozenForest | None = None, target: TargetLanguage | None = None,
+                 deadline: float | None = None, max_nodes: int | None = None, max_memory: int | None = None):
         """
         Initializes the Correction object and computes the initial SPPF containing all valid corrections.
 
         :param to_correct: The Deterministic Finite Automata (DFA) that needs to be corrected.
         :param minimal_dfa: The target minimal DFA. We assume that this automaton is already minimized, 
             otherwise the results are not correct. Both automata must be defined over the same alphabet.
+            Not needed if target is set.
         :param alphabet: The alphabet over which the DFA is defined. If None, it defaults to the alphabet of the given DFA.
+        :param only_minimal: If set, the SPPF is constructed best-first and contains only the corrections with minimal
+            edit costs, i.e. the SPPF that otherwise results from shrink_to_minimal_edits.
+        :param max_cost: If set, the SPPF contains only the corrections with total edit costs of at most max_cost.
+            Parse states whose lower bound of the costs exceeds max_cost are pruned during the construction.
+        :param worklist: The strategy of the worklist of the construction: "fifo" (default), "lifo", "costs" or
+            "states". The best-first construction always uses "costs". The statistics of the frontier are available
+            by self.worklist.get_statistics().
+        :param symmetry_reduction: If set, interchangeable unmapped states of the DFA to be corrected are expanded
+            only once and the SPPF annotates the families with them. Counting and enumeration remain exact.
+        :param forest: If set, the SPPF is not constructed but given by this frozen forest of the corrections of both
+            automata, e.g. loaded by Correction.load.
+        :param target: The target language compiled by TargetLanguage.compile, e.g. shared by all submissions of an
+            exercise. If set, it replaces the minimal_dfa and the alphabet.
+        :param deadline: If set, the construction stops at this point in time of time.monotonic(), e.g.
+            time.monotonic() + 10 for a time limit of 10 seconds.
+        :param max_nodes: If set, the construction stops as soon as the SPPF has more symbol nodes.
+        :param max_memory: If set, the construction stops as soon as the process has more resident memory in bytes.
+            If a limit is exhausted, the SPPF is empty and self.exhausted_limit is the limit (DEADLINE, MAX_NODES or
+            MAX_MEMORY). The number of expanded nodes and the size of the frontier are in the construction statistics.
         """
         self.to_correct: FiniteAutomata = to_correct
-        self.minimal_dfa: FiniteAutomata = minimal_dfa
 
         # Validate that both automata are deterministic
         if not to_correct.is_deterministic():
             raise Exception("The automata to correct must be a DFA.")
 
-        if not minimal_dfa.is_deterministic():
-            raise Exception("The minimal automata must be a DFA.")
-
-        # Determine the alphabet to use
-        if alphabet is None:
-            self.alphabet = sorted(list(FiniteAutomata.get_alphabet()))
-        else:
-            self.alphabet = alphabet
+        # Check and compile the minimal DFA, unless it is already compiled for the exercise
+        if target is None:
+            if minimal_dfa is None:
+                raise Exception("Either the minimal DFA or the target language must be given.")
+            target = TargetLanguage.compile(minimal_dfa=minimal_dfa, alphabet=alphabet)
+        self.target: TargetLanguage = target
+        self.minimal_dfa: FiniteAutomata = target.minimal_dfa
+        self.alphabet = target.alphabet
 
         # Set the costs for each edit operation
         self.costs_add_new_state = costs_add_new_state
@@ -56,79 +124,380 @@ class Correction:
         self.costs_mark_non_final = costs_mark_non_final
         self.costs_remove_initial = costs_remove_initial
         self.costs_remove_transition = costs_remove_transition
+        self.edit_costs = EditCosts(costs_add_new_state=costs_add_new_state,
+                                    costs_add_transition=costs_add_transition,
+                                    costs_leave_initial=costs_leave_initial,
+                                    costs_leave_transition=costs_leave_transition,
+                                    costs_mark_as_initial=costs_mark_as_initial,
+                                    costs_mark_final=costs_mark_final,
+                                    costs_mark_non_final=costs_mark_non_final,
+                                    costs_remove_initial=costs_remove_initial,
+                                    costs_remove_transition=costs_remove_transition)
 
         self.miniml_costs_calculated = False
+        self.minimal_edits_costs = []
+        self.symmetry_reduction = symmetry_reduction
+
+        # The mode of the construction. The SPPF is complete if it contains all corrections, i.e. if it is neither
+        # bounded by the edit costs nor shrunk afterwards.
+        self.only_minimal = only_minimal
+        self.max_cost = max_cost
+        self.is_complete = not only_minimal and max_cost is None
+
+        # Compile the automaton to correct once into a successor table over the alphabet
+        self.compiled_to_correct = CompiledDFA(dfa=to_correct, alphabet=self.alphabet)
+        self.compiled_minimal_dfa = target.compiled_minimal_dfa
+
+        # Create the worklist of the construction
+        if worklist is None:
+            worklist = COSTS if only_minimal else FIFO
+        self.worklist = create_worklist(strategy=worklist)
+
+        # The statistics of the construction, e.g. the number of duplicate families that were not added again
+        self.construction_statistics = {}
+
+        # The limits of the construction
+        limits = None
+        if deadline is not None or max_nodes is not None or max_memory is not None:
+            limits = ConstructionLimits(deadline=deadline, max_nodes=max_nodes, max_memory=max_memory)
 
         # Compute the SPPF that represents all corrections from the to correct DFA to the minimal DFA.
-        self.root_node = all_dfa_corrections(to_correct=to_correct, minimal_dfa=minimal_dfa, alphabet=self.alphabet)
+        if forest is None:
+            root_node = all_dfa_corrections(to_correct=to_correct, only_minimal=only_minimal, max_cost=max_cost,
+                                            edit_costs=self.edit_costs,
+                                            compiled_to_correct=self.compiled_to_correct,
+                                            worklist=self.worklist, symmetry_reduction=symmetry_reduction,
+                                            statistics=self.construction_statistics, target=self.target,
+                                            limits=limits)
+
+            # Freeze the SPPF into flat arrays, all analyses run on the frozen forest. The object graph is released
+            # and only rebuilt on demand by self.root_node.
+            forest = freeze_forest(root_node=root_node)
+
+        # The limit that stopped the construction or None if the SPPF is complete
+        self.exhausted_limit = self.construction_statistics.get("exhausted_limit")
+
+        self.forest: FrozenForest | None = None
+        self.engine: Engine | None = None
+        self._root_node = None
+        self.set_forest(forest=forest)
+
+    def save(self, path: str):
+        """
+        Saves the frozen SPPF together with the costs, the automata and the computed minimal edit costs in a compact
+        binary file (see save_forest), which can be loaded by Correction.load without constructing the SPPF again.
+
+        :param path: The path of the file.
+        """
+        if self.forest is None:
+            raise Exception("The SPPF is empty, no correction can be returned.")
 
-    def get_random_correction(self) -> list:
+        metadata = {"alphabet": self.alphabet,
+                    "costs": list(self.edit_costs.get_costs_vector()),
+                    "symmetry_reduction": self.symmetry_reduction,
+                    "only_minimal": self.only_minimal,
+                    "max_cost": self.max_cost,
+                    "is_complete": self.is_complete,
+                    "to_correct": self.compiled_to_correct.get_description(),
+                    "minimal_dfa": self.compiled_minimal_dfa.get_description(),
+                    "construction_statistics": self.construction_statistics}
+        save_forest(path=path, forest=self.forest, metadata=metadata,
+                    minimal_edits_costs=self.minimal_edits_costs if self.miniml_costs_calculated else None)
+
+    @classmethod
+    def load(cls, path: str, to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata | None = None,
+             target: TargetLanguage | None = None) -> "Correction":
         """
-        Retrieves a single random sequence of edit operations from the SPPF.
-        Traverses the SPPF recursively by randomly selecting child nodes until end nodes are reached.
+        Loads a Correction saved by save. The arrays of the SPPF are memory-mapped from the file (see load_forest).
 
-        :return: A list of edit operations representing a randomly selected valid correction.
+        :param path: The path of the file.
+        :param to_correct: The DFA that needs to be corrected, the same as of the saved correction.
+        :param minimal_dfa: The target minimal DFA, the same as of the saved correction.
+        :param target: The compiled target language, instead of the minimal DFA.
+        :return: The loaded Correction.
+        """
+        forest, metadata, minimal_edits_costs = load_forest(path=path)
+
+        correction = cls(to_correct, minimal_dfa, metadata["alphabet"], *metadata["costs"],
+                         only_minimal=metadata["only_minimal"], max_cost=metadata["max_cost"],
+                         symmetry_reduction=metadata["symmetry_reduction"], forest=forest, target=target)
+        if correction.alphabet != metadata["alphabet"] or \
+                correction.compiled_to_correct.get_description() != metadata["to_correct"] or \
+                correction.compiled_minimal_dfa.get_description() != metadata["minimal_dfa"]:
+            raise Exception("The SPPF was saved for other automata.")
+
+        correction.construction_statistics = metadata["construction_statistics"]
+        correction.is_complete = metadata["is_complete"]
+        if minimal_edits_costs is not None:
+            correction.minimal_edits_costs = minimal_edits_costs
+            correction.miniml_costs_calculated = True
+        return correction
+
+    @classmethod
+    def anytime(cls, to_correct: FiniteAutomata, minimal_dfa: FiniteAutomata | None = None, alphabet=None,
+                target: TargetLanguage | None = None, deadline: float | None = None, max_nodes: int | None = None,
+                max_memory: int | None = None, statistics: dict | None = None, **kwargs):
+        """
+        The anytime mode of the correction, e.g. for interactive feedback: finds a first correction quickly and yields
+        progressively cheaper corrections until the deadline or until the costs of the last correction are proven to
+        be minimal by the lower bounds of the remaining costs (see anytime_dfa_corrections). No SPPF is constructed.
+
+        :param to_correct: The DFA that needs to be corrected.
+        :param minimal_dfa: The target minimal DFA, not needed if target is set.
+        :param alphabet: The alphabet over which the DFA is defined.
+        :param target: The compiled target language, instead of the minimal DFA.
+        :param deadline: If set, the search stops at this point in time of time.monotonic().
+        :param max_nodes: If set, the search stops as soon as it has more symbol nodes.
+        :param max_memory: If set, the search stops as soon as the process has more resident memory in bytes.
+        :param statistics: A dict that is filled with the statistics of the search after the last correction. If its
+            exhausted limit is None, the costs of the last correction are minimal.
+        :param kwargs: The costs of the edit operations, e.g. costs_add_new_state.
+        :return: A generator of pairs of the costs and the correction with strictly decreasing costs.
+        """
+        if not to_correct.is_deterministic():
+            raise Exception("The automata to correct must be a DFA.")
+
+        if target is None:
+            if minimal_dfa is None:
+                raise Exception("Either the minimal DFA or the target language must be given.")
+            target = TargetLanguage.compile(minimal_dfa=minimal_dfa, alphabet=alphabet)
+
+        limits = None
+        if deadline is not None or max_nodes is not None or max_memory is not None:
+            limits = ConstructionLimits(deadline=deadline, max_nodes=max_nodes, max_memory=max_memory)
+
+        yield from anytime_dfa_corrections(to_correct=to_correct, edit_costs=EditCosts(**kwargs),
+                                           statistics=statistics, target=target, limits=limits)
+
+    @property
+    def root_node(self) -> SymbolNode | None:
+        """
+        The root node of the SPPF, rebuilt from the frozen forest on the first access.
+
+        :return: The root node or None if the SPPF is empty.
+        """
+        if self.forest is None:
+            return None
+        if self._root_node is None:
+            self._root_node = self.forest.thaw()
+        return self._root_node
+
+    def set_forest(self, forest: FrozenForest | None):
         """
+        Replace the frozen forest, e.g. by a restricted forest, and invalidate all results computed for the old one.
+        The topological order of the new forest is computed once by its engine.
 
-        def __aux__(current_node: SymbolNode) -> list:
-            """Auxiliary recursive function to traverse the SPPF randomly."""
-            # Select a random child from the current node's children
-            children = current_node.get_children()
-            selected_child: PackedNode = random.choice(children)
-
-            # Get the edit operations from the child's right child node
-            child_right_child = selected_child.get_right_node()
-            match child_right_child:
-                case SymbolNode():
-                    # Fixed referencing self.get_random_correction -> __aux__
-                    right_correction = __aux__(current_node=child_right_child)
-                case EditNode():
-                    right_correction = [child_right_child.get_edit_operations()]
-                case EndNode():
-                    right_correction = []
-                case _:
-                    raise Exception("The right child must be set")
-
-            # Get the edit operations from the child's left node if it exists
-            child_left_child = selected_child.get_left_node()
-            match child_left_child:
-                case None:
-                    left_correction = []
-                case SymbolNode():
-                    # Fixed referencing self.get_random_correction -> __aux__
-                    left_correction = __aux__(child_left_child)
-                case _:
-                    raise Exception("The left child must be either None or a SymbolNode")
-
-            return right_correction + left_correction
-
-        # Start the recursive selection process from the root node
-        if self.root_node is None:
+        :param forest: The new forest or None if the SPPF is empty.
+        """
+        self.forest = forest
+        self.engine = Engine(forest=forest) if forest is not None else None
+        self._root_node = None
+        self.miniml_costs_calculated = False
+        self.minimal_edits_costs = []
+        self.sampling_weights = None
+
+    def compute_sampling_weights(self):
+        """
+        Computes for each symbol node its choices, i.e. its families and a family with interchangeable states once per
+        state, and the cumulative numbers of the corrections of its choices. These are the weights of the random
+        samples and the ranks of the corrections. If the SPPF contains cycles, the number of corrections is infinite
+        and there are no such weights, thus the SPPF must be bounded, e.g. by only_minimal or max_cost.
+        """
+        if self.forest is None:
+            raise Exception("The SPPF is empty, no correction can be returned.")
+        forest = self.forest
+
+        if self.engine.has_cycles:
+            raise Exception("Cannot weight the corrections, due the presence of cycles in the graph. Construct the "
+                            "SPPF with only_minimal or max_cost.")
+
+        visitor = GetNumberOfCorrectionsVisitor(forest=forest)
+        self.engine.visit_bottom_up(visitor=visitor)
+        number_of_corrections = visitor.values
+
+        self.sampling_weights = []
+        for symbol in range(forest.number_of_symbol_nodes):
+            choices = list(forest.get_choices(symbol=symbol))
+            cumulative_weights = list(accumulate(number_of_corrections[forest.family_symbols[family]]
+                                                 if forest.family_symbols[family] >= 0 else 1
+                                                 for family, _ in choices))
+            self.sampling_weights.append((choices, cumulative_weights))
+
+    def sample(self, n: int, rng: random.Random | None = None) -> list:
+        """
+        Samples corrections uniformly at random (with replacement) from the SPPF. Each family is selected with a
+        probability proportional to the number of corrections it leads to, thus each correction is equally likely.
+        The cumulative weights are computed once and reused by all further samples. An SPPF with cycles represents
+        infinitely many corrections and cannot be sampled uniformly, thus it raises an exception.
+
+        :param n: The number of corrections.
+        :param rng: The random number generator, e.g. random.Random(seed). Defaults to the random module.
+        :return: A list of n corrections.
+        """
+        if self.sampling_weights is None:
+            self.compute_sampling_weights()
+
+        if rng is None:
+            rng = random
+
+        family_symbols = self.forest.family_symbols
+        if not self.sampling_weights[0][1] or self.sampling_weights[0][1][-1] == 0:
             raise Exception("The SPPF is empty, no correction can be returned.")
-        return __aux__(current_node=self.root_node)
+
+        corrections = []
+        for _ in range(n):
+            path = []
+            symbol = 0
+            while symbol >= 0:
+                choices, cumulative_weights = self.sampling_weights[symbol]
+                choice = choices[bisect_right(cumulative_weights, rng.randrange(cumulative_weights[-1]))]
+                path.append(choice)
+                symbol = family_symbols[choice[0]]
+            corrections.append(self.forest.build_correction(path=path))
+        return corrections
+
+    def get_random_correction(self, rng: random.Random | None = None) -> list:
+        """
+        Retrieves a single random sequence of edit operations from the SPPF, uniformly distributed over all
+        corrections. The SPPF must not contain cycles (see sample).
+
+        :param rng: The random number generator, e.g. random.Random(seed). Defaults to the random module.
+        :return: A list of edit operations representing a randomly selected valid correction.
+        """
+        return self.sample(n=1, rng=rng)[0]
+
+    def correction_at(self, index: int) -> list:
+        """
+        Retrieves the correction with the given index in the order of get_all_corrections, without enumerating the
+        corrections before it. Only one family per symbol node on the path of the correction is selected.
+
+        :param index: The index of the correction.
+        :return: The correction, i.e. a list of lists of edit operations.
+        """
+        if self.sampling_weights is None:
+            self.compute_sampling_weights()
+
+        root_weights = self.sampling_weights[0][1]
+        if not 0 <= index < (root_weights[-1] if root_weights else 0):
+            raise Exception(f"There is no correction with the index {index}.")
+
+        family_symbols = self.forest.family_symbols
+        path = []
+        symbol = 0
+        while symbol >= 0:
+            # The corrections of the choices of a symbol node are consecutive, select the choice containing the index
+            choices, cumulative_weights = self.sampling_weights[symbol]
+            position = bisect_right(cumulative_weights, index)
+            if position > 0:
+                index -= cumulative_weights[position - 1]
+            path.append(choices[position])
+            symbol = family_symbols[choices[position][0]]
+        return self.forest.build_correction(path=path)
+
+    def index_of(self, correction: list) -> int:
+        """
+        Retrieves the index of a correction in the order of get_all_corrections, i.e. the inverse of correction_at.
+
+        :param correction: The correction, i.e. a list of lists of edit operations.
+        :return: The index of the correction.
+        """
+        if self.sampling_weights is None:
+            self.compute_sampling_weights()
+
+        forest = self.forest
+
+        def aux_get_edit_operations(position: int, swaps: tuple) -> list:
+            """
+            auxiliary function that gets the edit operations of the correction at a position, with the swaps of the
+            interchangeable states of the families on the path undone.
+
+            :param position: The position in the correction.
+            :param swaps: The pairs of the families and the states swapped by them, outermost first.
+            :return: The edit operations.
+            """
+            edit_operations = correction[position]
+            for family, state in swaps:
+                edit_operations = forest.swap_correction(family=family, correction=[edit_operations],
+                                                         other_state=state)[0]
+            return edit_operations
+
+        # Search the path of the correction depth-first, as a prefix of the correction may match several families.
+        # The stack contains the symbol node, the position in the correction, the swaps on the path, the index of the
+        # first correction of the symbol node and the next choice to try.
+        stack = [(0, 0, (), 0, 0)]
+        while stack:
+            symbol, position, swaps, index, choice = stack.pop()
+            choices, cumulative_weights = self.sampling_weights[symbol]
+            if choice >= len(choices):
+                continue
+            stack.append((symbol, position, swaps, index, choice + 1))
+
+            family, state = choices[choice]
+            if choice > 0:
+                index += cumulative_weights[choice - 1]
+            if state is not None and state != forest.interchangeable_states[family][0]:
+                swaps = swaps + ((family, state),)
+
+            edit = forest.family_edits[family]
+            if edit >= 0:
+                if position == len(correction) or \
+                        aux_get_edit_operations(position, swaps) != forest.get_edit_operations(edit):
+                    continue
+                position += 1
+
+            child = forest.family_symbols[family]
+            if child >= 0:
+                stack.append((child, position, swaps, index, 0))
+            elif position == len(correction):
+                return index
+
+        raise Exception("The correction is not represented by the SPPF.")
+
+    def parallel_map(self, function, workers: int | None = None, chunk_size: int | None = None):
+        """
+        Applies a function to each correction of the SPPF in a pool of worker processes, e.g. to apply and verify the
+        corrections, and yields the results in the order of get_all_corrections. The corrections are split into
+        contiguous ranges of indices, which each worker builds by correction_at from the frozen forest it received
+        once. Only a bounded number of ranges is pending at a time, thus the results are streamed.
+
+        :param function: The function that takes a correction. It must be picklable, e.g. defined at module level.
+        :param workers: The number of worker processes, defaults to the number of CPUs.
+        :param chunk_size: The number of corrections of a range, defaults to a quarter of the corrections per worker
+            but at most 1000.
+        :return: A generator of the results of the function.
+        """
+        number_of_corrections = self.get_number_of_corrections()
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(1, min(number_of_corrections // (workers * 4), 1_000))
+
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker,
+                                       initargs=(self.forest, function))
+        try:
+            pending = deque()
+            for start in range(0, number_of_corrections, chunk_size):
+                pending.append(executor.submit(_map_index_range, start, min(start + chunk_size, number_of_corrections)))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            executor.shutdown(cancel_futures=True)
 
     def compute_minimal_edit_costs(self):
         """
-        Computes the minimal edit costs for all nodes in the SPPF using the MinCostsComputationVisitor.
-        This updates the nodes internally with the minimal achievable cost to reach them.
-        """
-        # Create a visitor configured with the operation costs
-        visitor = MinCostsComputationVisitor(costs_add_new_state=self.costs_add_new_state,
-                                             costs_add_transition=self.costs_add_transition,
-                                             costs_leave_initial=self.costs_leave_initial,
-                                             costs_leave_transition=self.costs_leave_transition,
-                                             costs_mark_as_initial=self.costs_mark_as_initial,
-                                             costs_mark_final=self.costs_mark_final,
-                                             costs_mark_non_final=self.costs_mark_non_final,
-                                             costs_remove_initial=self.costs_remove_initial,
-                                             costs_remove_transition=self.costs_remove_transition)
-
-        if self.root_node is None:
+        Computes the minimal edit costs for all symbol nodes of the SPPF using the MinCostsComputationVisitor.
+        """
+        if self.forest is None:
             raise Exception("The SPPF is empty, no correction can be returned.")
 
         # Traverse the SPPF to compute minimal edit costs bottom-up for each node
-        visitor.visit(root_node=self.root_node)
+        visitor = MinCostsComputationVisitor(forest=self.forest, edit_costs=self.edit_costs)
+        self.engine.visit_bottom_up(visitor=visitor)
 
+        self.minimal_edits_costs = visitor.minimal_edits_costs
         self.miniml_costs_calculated = True
 
     def get_minimal_edit_costs(self) -> int:
@@ -141,33 +510,85 @@ class Correction:
         if not self.miniml_costs_calculated:
             self.compute_minimal_edit_costs()
 
-        return self.root_node.get_minimal_edits_costs()
+        if self.minimal_edits_costs[0] == math.inf:
+            raise Exception("Minimal edits costs not computed yet.")
+        return self.minimal_edits_costs[0]
 
-    def shrink_to_minimal_edits(self) -> SymbolNode:
+    def shrink_to_minimal_edits(self):
         """
         Prunes the SPPF to only retain correction paths that possess the minimal edit cost.
         Any branches representing sub-optimal corrections are removed.
 
-        :return: The root node of the modified SPPF containing only minimal corrections.
+        The SPPF is shrunk in place and nothing is returned, like by the other shrinkers. The shrunk SPPF is
+        self.forest, its object graph is rebuilt on demand by self.root_node.
         """
         if not self.miniml_costs_calculated:
             self.compute_minimal_edit_costs()
 
-        # Create a visitor to remove non-minimal nodes
-        visitor = ShrinkToMinimal(costs_add_new_state=self.costs_add_new_state,
-                                  costs_add_transition=self.costs_add_transition,
-                                  costs_leave_initial=self.costs_leave_initial,
-                                  costs_leave_transition=self.costs_leave_transition,
-                                  costs_mark_as_initial=self.costs_mark_as_initial,
-                                  costs_mark_final=self.costs_mark_final,
-                                  costs_mark_non_final=self.costs_mark_non_final,
-                                  costs_remove_initial=self.costs_remove_initial,
-                                  costs_remove_transition=self.costs_remove_transition)
+        # Create a visitor to remove non-minimal families
+        visitor = ShrinkToMinimal(forest=self.forest, edit_costs=self.edit_costs,
+                                  minimal_edits_costs=self.minimal_edits_costs)
 
         # Apply the pruning process
-        visitor.visit(root_node=self.root_node)
+        self.engine.visit_top_down(visitor=visitor)
+        self.set_forest(forest=visitor.get_forest())
+        self.is_complete = False
+
+        # The symbol nodes are renumbered by the restriction, thus compute the minimal edits costs again
+        self.compute_minimal_edit_costs()
+
+    def compute_profiles_minimal_edit_costs(self, profiles: list) -> list:
+        """
+        Computes the minimal edit costs of all symbol nodes for several costs profiles in one pass over the SPPF,
+        e.g. to tune the costs without constructing the SPPF again. The edit nodes are rated by their numbers of
+        operations per type (see FrozenForest.get_operation_counts). The SPPF must be complete (see is_complete).
+
+        :param profiles: The matrix of the costs profiles, each a list of the nine costs in the order of the costs
+            parameters of this class (see EditCosts.get_costs_vector).
+        :return: For each symbol node the tuple of its minimal edit costs per profile, math.inf if no correction is
+            reachable.
+        """
+        if self.forest is None:
+            raise Exception("The SPPF is empty, no correction can be returned.")
+
+        # The corrections that are minimal for another costs profile can be missing in a bounded or shrunk SPPF
+        if not self.is_complete:
+            raise Exception("The costs profiles require the complete SPPF, construct it without only_minimal and "
+                            "max_cost and do not shrink it.")
+
+        visitor = SemiringVisitor(forest=self.forest, semiring=ProfilesTropicalSemiring(len(profiles)),
+                                  edit_node_costs=self.forest.get_profile_edit_costs(profiles=profiles))
+        self.engine.visit_bottom_up(visitor=visitor)
+        return visitor.values
+
+    def get_profiles_minimal_edit_costs(self, profiles: list) -> list:
+        """
+        Retrieves the minimal overall edit costs for each of several costs profiles.
 
-        return self.root_node
+        :param profiles: The matrix of the costs profiles, each a list of the nine costs in the order of the costs
+            parameters of this class (see EditCosts.get_costs_vector).
+        :return: The list of the minimal edit costs, one per profile.
+        """
+        return list(self.compute_profiles_minimal_edit_costs(profiles=profiles)[0])
+
+    def get_profiles_minimal_forests(self, profiles: list) -> list:
+        """
+        Restricts the SPPF for each of several costs profiles to the corrections with minimal edit costs, like
+        shrink_to_minimal_edits but without changing the SPPF of this correction.
+
+        :param profiles: The matrix of the costs profiles, each a list of the nine costs in the order of the costs
+            parameters of this class (see EditCosts.get_costs_vector).
+        :return: The list of the restricted frozen forests, one per profile.
+        """
+        minimal_edits_costs = self.compute_profiles_minimal_edit_costs(profiles=profiles)
+
+        forests = []
+        for i, profile in enumerate(profiles):
+            visitor = ShrinkToMinimal(forest=self.forest, edit_costs=EditCosts(*profile),
+                                      minimal_edits_costs=[costs[i] for costs in minimal_edits_costs])
+            self.engine.visit_top_down(visitor=visitor)
+            forests.append(visitor.get_forest())
+        return forests
 
     def get_all_corrections(self) -> list:
         """
@@ -175,13 +596,102 @@ class Correction:
 
         :return: A list of lists, where each inner list contains the edit operations for one complete correction.
         """
+        if self.forest is None:
+            raise Exception("The SPPF is empty, no correction can be returned.")
+
         # Create a visitor to aggregate all valid edit sequences
-        visitor = GetAllEditsVisitor()
+        visitor = GetAllEditsVisitor(forest=self.forest)
 
         # Traverse the SPPF to populate the corrections list
-        visitor.visit(root_node=self.root_node)
+        self.engine.visit_bottom_up(visitor=visitor)
+
+        return visitor.get_all_edits(symbol=0)
+
+    def iter_corrections(self):
+        """
+        Yields the corrections represented by the SPPF one at a time, in the order of get_all_corrections. The forest
+        is walked depth-first, thus only the current path is stored and no lists of corrections are materialised.
+
+        :return: A generator of the corrections, each a list of lists of edit operations.
+        """
+        if self.forest is None:
+            raise Exception("The SPPF is empty, no correction can be returned.")
+
+        if self.engine.has_cycles:
+            raise Exception("Cannot compute all edits, due the presence of cycles in the graph.")
+
+        forest = self.forest
+
+        # The stack of the remaining choices of the symbol nodes on the current path
+        stack = [forest.get_choices(symbol=0)]
+        path = []
+        while stack:
+            choice = next(stack[-1], None)
+            if choice is None:
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+
+            path.append(choice)
+            child = forest.family_symbols[choice[0]]
+            if child >= 0:
+                stack.append(forest.get_choices(symbol=child))
+            else:
+                yield forest.build_correction(path=path)
+                path.pop()
+
+    def iter_corrections_by_costs(self):
+        """
+        Yields the corrections represented by the SPPF lazily in non-decreasing order of their edit costs. Corrections
+        with equal costs are yielded in the order of get_all_corrections.
+
+        The partial corrections are expanded best-first, ordered by their costs plus the minimal edit costs of the
+        remaining correction, which are exact. Thus, a correction is yielded as soon as it is completed, without
+        enumerating the corrections with higher costs.
+
+        :return: A generator of pairs of the edit costs and the correction.
+        """
+        if not self.miniml_costs_calculated:
+            self.compute_minimal_edit_costs()
+
+        forest = self.forest
+        minimal_costs = self.minimal_edits_costs
+        edit_node_costs = forest.get_edit_costs(edit_costs=self.edit_costs)
+
+        # The priority queue of the partial corrections. Each entry consists of the total costs, the indices of the
+        # choices (which order partial corrections with equal costs like get_all_corrections), the costs so far,
+        # the next symbol node and the chosen pairs of the family and the state.
+        queue = [(minimal_costs[0], (), 0, 0, ())]
+        while queue:
+            total_costs, indices, costs, symbol, path = heappop(queue)
+            if symbol < 0:
+                yield costs, forest.build_correction(path=path)
+                continue
+
+            for index, (family, state) in enumerate(forest.get_choices(symbol=symbol)):
+                child = forest.family_symbols[family]
+                remaining_costs = minimal_costs[child] if child >= 0 else 0
+                if remaining_costs == math.inf:
+                    continue
+
+                next_costs = costs + edit_node_costs[forest.family_edits[family]] \
+                    if forest.family_edits[family] >= 0 else costs
+                heappush(queue, (next_costs + remaining_costs, indices + (index,), next_costs, child,
+                                 path + ((family, state),)))
+
+    def k_best(self, k: int) -> list:
+        """
+        Get the k corrections with the smallest edit costs, in non-decreasing order of the costs. Corrections with
+        equal costs are returned in the order of get_all_corrections.
+
+        :param k: The number of corrections.
+        :return: A list of at most k pairs of the edit costs and the correction.
+        """
+        if self.forest is None:
+            raise Exception("The SPPF is empty, no correction can be returned.")
 
-        return self.root_node.get_all_edits()
+        return list(islice(self.iter_corrections_by_costs(), k))
 
     def get_number_of_corrections(self) -> int:
         """
@@ -189,16 +699,100 @@ class Correction:
 
         :return: The total count of possible corrections.
         """
-        if self.root_node is None:
+        if self.forest is None:
             raise Exception("The SPPF is empty, no correction can be returned.")
 
         # Create a visitor to compute the number of valid paths bottom-up
-        visitor = GetNumberOfCorrectionsVisitor()
+        visitor = GetNumberOfCorrectionsVisitor(forest=self.forest)
 
         # Traverse the SPPF to count variations
-        visitor.visit(root_node=self.root_node)
+        self.engine.visit_bottom_up(visitor=visitor)
 
-        return self.root_node.get_number_of_corrections()
+        return visitor.get_number_of_corrections(symbol=0)
+
+    def evaluate(self, semiring: Semiring, allowed_symbols: bytearray | None = None):
+        """
+        Evaluates a semiring over the SPPF, e.g. the KBestSemiring or the CostDistributionSemiring.
+
+        :param semiring: The semiring.
+        :param allowed_symbols: If set, only the corrections that pass only allowed symbol nodes are considered.
+        :return: The value of the root node.
+        """
+        if self.forest is None:
+            raise Exception("The SPPF is empty, no correction can be returned.")
+
+        visitor = SemiringVisitor(forest=self.forest, semiring=semiring, edit_costs=self.edit_costs,
+                                  allowed_symbols=allowed_symbols)
+        self.engine.visit_bottom_up(visitor=visitor)
+
+        return visitor.get_value(symbol=0)
+
+    def analyze(self, analyses: list) -> dict:
+        """
+        Evaluates several analyses in a single pass over the SPPF. The minimal edit costs computed by the pass are
+        kept for later calls, e.g. of shrink_to_minimal_edits.
+
+        :param analyses: The analyses, each either a Semiring or one of
+            MINIMAL_EDIT_COSTS: the minimal edit costs,
+            NUMBER_OF_CORRECTIONS: the number of corrections,
+            NUMBER_OF_MINIMAL_CORRECTIONS: the number of corrections with minimal edit costs,
+            ALLOWED_MAPPING: whether there is a correction with the 1-to-1 mapping.
+        :return: A dict with the result of each analysis.
+        """
+        if self.forest is None:
+            raise Exception("The SPPF is empty, no correction can be returned.")
+
+        # Create one visitor per analysis
+        visitors = {}
+        for analysis in analyses:
+            if isinstance(analysis, Semiring):
+                visitors[analysis] = SemiringVisitor(forest=self.forest, semiring=analysis, edit_costs=self.edit_costs)
+            elif analysis == MINIMAL_EDIT_COSTS:
+                visitors[analysis] = MinCostsComputationVisitor(forest=self.forest, edit_costs=self.edit_costs)
+            elif analysis == NUMBER_OF_CORRECTIONS:
+                visitors[analysis] = GetNumberOfCorrectionsVisitor(forest=self.forest)
+            elif analysis == NUMBER_OF_MINIMAL_CORRECTIONS:
+                visitors[analysis] = SemiringVisitor(forest=self.forest, semiring=MinimalCountingSemiring(),
+                                                     edit_costs=self.edit_costs)
+            elif analysis == ALLOWED_MAPPING:
+                if self.symmetry_reduction:
+                    raise Exception("The 1-to-1 mapping is not invariant under swapping interchangeable states, "
+                                    "construct the SPPF without symmetry reduction.")
+                visitors[analysis] = ShrinkToAllowedMappings(
+                    forest=self.forest, allowed_mapping=self.compute_allowed_1_to_1_mapping())
+            else:
+                raise Exception("Unknown analysis: " + str(analysis))
+
+        # Evaluate all analyses together
+        self.engine.visit_bottom_up(visitor=FusedVisitor(forest=self.forest, visitors=list(visitors.values())))
+
+        results = {}
+        for analysis, visitor in visitors.items():
+            if isinstance(analysis, Semiring):
+                results[analysis] = visitor.get_value(symbol=0)
+            elif analysis == MINIMAL_EDIT_COSTS:
+                self.minimal_edits_costs = visitor.minimal_edits_costs
+                self.miniml_costs_calculated = True
+                results[analysis] = visitor.get_minimal_edits_costs(symbol=0)
+            elif analysis == NUMBER_OF_MINIMAL_CORRECTIONS:
+                results[analysis] = visitor.get_value(symbol=0)[1]
+            elif analysis == ALLOWED_MAPPING:
+                results[analysis] = bool(visitor.get_value(symbol=0))
+            else:
+                results[analysis] = visitor.get_value(symbol=0)
+        return results
+
+    def get_memory_usage(self) -> dict:
+        """
+        Measures the memory of the frozen SPPF, i.e. the sizes of its arrays, the keys and the edit operations. The
+        results of the analyses are not included.
+
+        :return: A dict with the number of nodes, the number of bytes and the bytes per node.
+        """
+        if self.forest is None:
+            raise Exception("The SPPF is empty, no correction can be returned.")
+
+        return self.forest.get_memory_usage()
 
     def shrink_to_corrections_to_minimal_dfas(self):
         """
@@ -207,19 +801,24 @@ class Correction:
 
         Uses Breadth-First Search (BFS) to track equivalence classes and identify redundancies.
         """
-        if self.root_node is None:
+        if self.forest is None:
             raise Exception("The SPPF is empty, no correction can be returned.")
+        forest = self.forest
 
         # Initialize BFS queue with a tuple: (current node, seen equivalence classes, last structural equivalence class)
-        init_tuple = (self.root_node, frozenset(set()), None)
+        init_tuple = (0, frozenset(set()), None)
         queue = deque()
         queue.append(init_tuple)
         seen_tuples = {init_tuple}
 
+        # The symbol nodes that are contained in a correction to the minimal DFA
+        contained_in_cor_to_minial_dfa = bytearray([1]) * forest.number_of_symbol_nodes
+
         # Traverse layer by layer to map state equivalence cycles
         while queue:
-            node, seen_eq_classes, last_edit_equivalence_class = queue.popleft()
-            
+            symbol, seen_eq_classes, last_edit_equivalence_class = queue.popleft()
+            node = SymbolNode(key=forest.keys[symbol], encoding=forest.encoding)
+
             # Extract newly added equivalence classes from node parameters
             added_eq_classes = {k[1] for k in node.get_params_unfrozen()[3]}
             eq_class = node.get_equivalence_class()
@@ -231,7 +830,7 @@ class Correction:
 
                     # Detect cycle or redundant representation
                     if eq_class is not None and eq_class in seen_eq_classes:
-                        node.set_contained_in_cor_to_minial_dfa(False)
+                        contained_in_cor_to_minial_dfa[symbol] = 0
                         continue
 
                     new_seen_eq_classes = seen_eq_classes.union({eq_class})
@@ -243,24 +842,42 @@ class Correction:
                 current_eq_class = None
 
             # Enqueue valid children for further evaluation
-            for child in node.get_children():
-                if child.left_node is not None and type(child.left_node) == SymbolNode:
-                    new_tuple = (child.left_node, frozenset(new_seen_eq_classes), current_eq_class)
-                    if new_tuple not in seen_tuples:
-                        seen_tuples.add(new_tuple)
-                        queue.append(new_tuple)
-                if child.right_node is not None and type(child.right_node) == SymbolNode:
-                    new_tuple = (child.right_node, frozenset(new_seen_eq_classes), current_eq_class)
+            for family in forest.get_families(symbol):
+                child = forest.family_symbols[family]
+                if child >= 0:
+                    new_tuple = (child, frozenset(new_seen_eq_classes), current_eq_class)
                     if new_tuple not in seen_tuples:
                         seen_tuples.add(new_tuple)
                         queue.append(new_tuple)
 
         # Shrink the SPPF removing invalid cyclic branches discovered
-        visitor = ShrinkToMinimalDFAs()
-        visitor.visit(root_node=self.root_node)
+        visitor = ShrinkToMinimalDFAs(forest=forest, contained_in_cor_to_minial_dfa=contained_in_cor_to_minial_dfa)
+        self.engine.visit_bottom_up(visitor=visitor)
+        self.set_forest(forest=visitor.get_forest())
+        self.is_complete = False
 
-        # SPPF structure has changed, invalidate cached costs
-        self.miniml_costs_calculated = False
+    def compute_allowed_1_to_1_mapping(self) -> dict:
+        """
+        Identifies the shortest reachability paths for the states of both automata and formulates the permitted
+        state correlations of the 1-to-1 mapping. The shortest paths of the minimal DFA are precomputed by the
+        target language.
+
+        :return: The allowed mapping of the states of the to_correct DFA to the states of the minimal DFA.
+        """
+        allowed_mapping = dict()
+
+        # Map each state of the to_correct DFA to the state of the minimal DFA with the same shortest path
+        states_of_paths_minimal_dfa = self.target.states_of_shortest_words
+        for state, path in self.compiled_to_correct.get_shortest_words().items():
+            if path in states_of_paths_minimal_dfa:
+                state_minimal_dfa = states_of_paths_minimal_dfa[path]
+
+                if state_minimal_dfa == self.target.start_state:
+                    allowed_mapping[state] = (MINIMAL_DFA_START, state_minimal_dfa)
+                else:
+                    allowed_mapping[state] = (MINIMAL_DFA, state_minimal_dfa)
+
+        return allowed_mapping
 
     def shrink_to_corrections_with_1_to_1_mapping(self):
         """
@@ -270,68 +887,27 @@ class Correction:
         Calculates direct state mapping via identical distinct prefix pathways using BFS,
         then prunes SPPF paths not conforming to these permitted mappings.
         """
-        def __compute_allowed_1_to_1_mapping():
-            """
-            Internal helper that identifies shortest reachability paths for states
-            and formulates permitted state correlations.
-            """
-            def __aux(start_state, automata, smallest_states_paths):
-                """
-                Auxiliary Breadth-First Search discovering the shortest possible word 
-                capable of reaching every accessible state from the provided start state.
-                """
-                queue = deque()
-                queue.append((start_state, ""))
-
-                while queue:
-                    current_state, word = queue.popleft()
-
-                    # Guarantee storage of exactly the shortest path only
-                    if current_state in smallest_states_paths:
-                        continue
-
-                    smallest_states_paths[current_state] = word
-
-                    # Expand path using alphabet characters
-                    for letter in self.alphabet:
-                        for next_state in automata.get_successors(s=current_state, a=letter):
-                            if next_state not in smallest_states_paths:
-                                queue.append((next_state, word + letter))
-
-            # Store shortest paths matching a specific final state
-            smallest_states_paths_to_correct = {}
-            smallest_states_paths_minimal_dfa = {}
-            
-            # Start algorithm from the initial states
-            (initial_state_minimal_dfa,) = self.minimal_dfa.get_initials()
-            (initial_state_to_correct,) = self.to_correct.get_initials()
-            
-            __aux(start_state=initial_state_to_correct, automata=self.to_correct,
-                  smallest_states_paths=smallest_states_paths_to_correct)
-
-            __aux(start_state=initial_state_minimal_dfa, automata=self.minimal_dfa,
-                  smallest_states_paths=smallest_states_paths_minimal_dfa)
-
-            # Map the exact reverse lookup correlation between smallest paths and minimal dfa states
-            swapped_stats_path_minimal_dfa = {value: key for key, value in smallest_states_paths_minimal_dfa.items()}
-
-            # Populate mapping dictionary
-            for state, path in smallest_states_paths_to_correct.items():
-                if path in swapped_stats_path_minimal_dfa:
-                    state_minimal_dfa = swapped_stats_path_minimal_dfa[path]
+        if self.forest is None:
+            raise Exception("The SPPF is empty, no correction can be returned.")
 
-                    if state_minimal_dfa == initial_state_minimal_dfa:
-                        allowed_mapping[state] = (MINIMAL_DFA_START, state_minimal_dfa)
-                    else:
-                        allowed_mapping[state] = (MINIMAL_DFA, state_minimal_dfa)
+        if self.symmetry_reduction:
+            raise Exception("The 1-to-1 mapping is not invariant under swapping interchangeable states, "
+                            "construct the SPPF without symmetry reduction.")
 
-            return allowed_mapping
+        allowed_mapping = self.compute_allowed_1_to_1_mapping()
 
-        allowed_mapping = dict()
-        __compute_allowed_1_to_1_mapping()
-        
         # Deploy a visitor to apply the calculated mappings restriction
-        visitor = ShrinkToAllowedMappings(allowed_mapping=allowed_mapping)
-        visitor.visit(root_node=self.root_node)
+        visitor = ShrinkToAllowedMappings(forest=self.forest, allowed_mapping=allowed_mapping)
+        self.engine.visit_bottom_up(visitor=visitor)
+        self.set_forest(forest=visitor.get_forest())
+        self.is_complete = False
 
-        self.miniml_costs_calculated = False
+    def apply_correction(self, correction: list) -> list:
+        """
+        Applies the given correction to the DFA to be corrected.
+
+        :param correction: A correction of the SPPF, i.e. a list of lists of edit operations.
+        :return: A list of all possible resulting automata.
+        """
+        return apply_correction(to_correct=self.to_correct, correction=correction,
+                                compiled_to_correct=self.compiled_to_correct)
@@ -0,0 +1,65 @@
+from alcep_dfa.Nodes.EditOperations import *
+
+
+class EditCosts:
+    """
+    The costs of the single edit operations, used to rate the corrections of a DFA.
+    """
+
+    # The types of the edit operations in the order of the costs parameters
+    operation_types = (AddNewState, AddTransition, LeaveInitial, LeaveTransition, MarkAsInitial, MarkStateAsFinal,
+                       MarkStateAsNonFinal, RemoveMarkAsInitial, RemoveTransition)
+
+    def __init__(self, costs_add_new_state=1, costs_add_transition=1, costs_leave_initial=0, costs_leave_transition=0,
+                 costs_mark_as_initial=1, costs_mark_final=1, costs_mark_non_final=1, costs_remove_initial=1,
+                 costs_remove_transition=0):
+        self.costs_add_new_state = costs_add_new_state
+        self.costs_add_transition = costs_add_transition
+        self.costs_leave_initial = costs_leave_initial
+        self.costs_leave_transition = costs_leave_transition
+        self.costs_mark_as_initial = costs_mark_as_initial
+        self.costs_mark_final = costs_mark_final
+        self.costs_mark_non_final = costs_mark_non_final
+        self.costs_remove_initial = costs_remove_initial
+        self.costs_remove_transition = costs_remove_transition
+
+    def get_costs_vector(self) -> tuple:
+        """
+        Get the costs of the edit operations in the order of the costs parameters, i.e. of operation_types.
+
+        :return: The tuple of the nine costs.
+        """
+        return (self.costs_add_new_state, self.costs_add_transition, self.costs_leave_initial,
+                self.costs_leave_transition, self.costs_mark_as_initial, self.costs_mark_final,
+                self.costs_mark_non_final, self.costs_remove_initial, self.costs_remove_transition)
+
+    def get_costs(self, edit_operations: list):
+        """
+        Compute the total costs of a list of edit operations.
+
+        :param edit_operations: The edit operations to rate.
+        :return: The sum of the costs of all edit operations.
+        """
+        sum_of_costs = 0
+        for edit in edit_operations:
+            match edit:
+                case AddNewState():
+                    sum_of_costs += self.costs_add_new_state
+                case AddTransition():
+                    sum_of_costs += self.costs_add_transition
+                case LeaveInitial():
+                    sum_of_costs += self.costs_leave_initial
+                case LeaveTransition():
+                    sum_of_costs += self.costs_leave_transition
+                case MarkAsInitial():
+                    sum_of_costs += self.costs_mark_as_initial
+                case MarkStateAsFinal():
+                    sum_of_costs += self.costs_mark_final
+                case MarkStateAsNonFinal():
+                    sum_of_costs += self.costs_mark_non_final
+                case RemoveMarkAsInitial():
+                    sum_of_costs += self.costs_remove_initial
+                case RemoveTransition():
+                    sum_of_costs += self.costs_remove_transition
+
+        return sum_of_costs
@@ -0,0 +1,213 @@
+import json
+import math
+import mmap
+import sys
+from array import array
+from alcep_dfa.Nodes import StateEncoding
+from alcep_dfa.Constants import TO_CORRECT, MINIMAL_DFA, MINIMAL_DFA_START
+from alcep_dfa.Costs import EditCosts
+from alcep_dfa.FrozenForest import FrozenForest
+
+# The magic bytes and the version of the binary format of a frozen forest
+FOREST_MAGIC = b"ALCEPSPF"
+FOREST_FORMAT_VERSION = 1
+
+# The kinds of the states of the edit operations, a state of the to_correct DFA that is not tagged has the kind -1
+STATE_KINDS = (TO_CORRECT, MINIMAL_DFA, MINIMAL_DFA_START)
+
+# The number of integers of an edit operation: the type and at most two states and one letter
+OPERATION_WIDTH = 6
+
+
+class PackedKeys:
+    """
+    A read-only sequence of the keys of the symbol nodes, stored in a buffer as little-endian integers of a fixed
+    number of bytes. The keys are only decoded on access.
+    """
+
+    def __init__(self, buffer: memoryview, width: int):
+        """
+        Initialize a PackedKeys instance.
+
+        :param buffer: The buffer of the keys.
+        :param width: The number of bytes of each key.
+        """
+        self.buffer = buffer
+        self.width = width
+
+    def __len__(self):
+        return len(self.buffer) // self.width if self.width else 0
+
+    def __getitem__(self, symbol: int) -> int:
+        if not 0 <= symbol < len(self):
+            raise IndexError("There is no symbol node with this index.")
+        return int.from_bytes(self.buffer[symbol * self.width:(symbol + 1) * self.width], "little")
+
+    def __iter__(self):
+        return (self[symbol] for symbol in range(len(self)))
+
+
+def save_forest(path: str, forest: FrozenForest, metadata: dict, minimal_edits_costs: list | None = None):
+    """
+    Save a frozen forest in a compact binary file. The file starts with the magic bytes, the version, the length of
+    a JSON header and the header itself. The header contains the metadata, the parameters of the encoding and the
+    offsets of the sections. The sections are the integer arrays of the forest, the keys, the interned edit
+    operations, the interchangeable states and the cached minimal edits costs, each aligned to 8 bytes.
+
+    :param path: The path of the file.
+    :param forest: The frozen forest.
+    :param metadata: The JSON serializable metadata, e.g. the costs and the automata of the correction.
+    :param minimal_edits_costs: If set, the minimal edits costs of the symbol nodes.
+    """
+    encoding = forest.encoding
+    letter_indices = {letter: index for index, letter in enumerate(encoding.alphabet)}
+
+    def aux_encode_operation(edit_operation) -> list:
+        """
+        auxiliary function that encodes an edit operation into integers: the index of its type, the kind and the
+        number of each state and the index of each letter.
+
+        :param edit_operation: The edit operation.
+        :return: The list of OPERATION_WIDTH integers.
+        """
+        row = [next(i for i, operation_type in enumerate(EditCosts.operation_types)
+                    if isinstance(edit_operation, operation_type))]
+        for attribute, value in zip(edit_operation.__slots__, edit_operation.get_values()):
+            if attribute == "symbol":
+                row.append(letter_indices[value])
+            elif isinstance(value, tuple):
+                row += [STATE_KINDS.index(value[0]), value[1]]
+            else:
+                row += [-1, value]
+        return row + [0] * (OPERATION_WIDTH - len(row))
+
+    # The keys are stored with the number of bytes of the largest key
+    key_width = max(max((key.bit_length() + 7) // 8 for key in forest.keys), 1)
+
+    interchangeable_families = sorted(forest.interchangeable_states)
+    interchangeable_offsets = array('q', [0])
+    interchangeable_states = array('q')
+    for family in interchangeable_families:
+        interchangeable_states.extend(forest.interchangeable_states[family])
+        interchangeable_offsets.append(len(interchangeable_states))
+
+    sections = {
+        "family_offsets": forest.family_offsets,
+        "family_symbols": forest.family_symbols,
+        "family_edits": forest.family_edits,
+        "edit_offsets": forest.edit_offsets,
+        "operation_ids": forest.operation_ids,
+        "operations": array('q', [value for edit_operation in forest.operations
+                                  for value in aux_encode_operation(edit_operation)]),
+        "interchangeable_families": array('q', interchangeable_families),
+        "interchangeable_offsets": interchangeable_offsets,
+        "interchangeable_states": interchangeable_states,
+        "keys": b"".join(key.to_bytes(key_width, "little") for key in forest.keys),
+    }
+    if minimal_edits_costs is not None:
+        # Infinite costs, i.e. symbol nodes without a reachable correction, are stored as -1
+        sections["minimal_edits_costs"] = array('d', [-1 if costs == math.inf else costs
+                                                      for costs in minimal_edits_costs])
+
+    # Compute the offsets of the sections relative to the end of the header
+    directory = {}
+    offset = 0
+    for name, section in sections.items():
+        data = memoryview(section).cast('B')
+        directory[name] = [offset, len(data), memoryview(section).format]
+        offset += (len(data) + 7) // 8 * 8
+
+    header = json.dumps({"byteorder": sys.byteorder, "metadata": metadata, "key_width": key_width,
+                         "encoding": [encoding.number_of_states, encoding.number_of_classes,
+                                      encoding.minimal_dfa_start_state, encoding.alphabet],
+                         "sections": directory}).encode("utf-8")
+    header += b" " * (-(len(FOREST_MAGIC) + 16 + len(header)) % 8)
+
+    with open(path, "wb") as file:
+        file.write(FOREST_MAGIC)
+        file.write(FOREST_FORMAT_VERSION.to_bytes(8, "little"))
+        file.write(len(header).to_bytes(8, "little"))
+        file.write(header)
+        for section in sections.values():
+            data = memoryview(section).cast('B')
+            file.write(data)
+            file.write(b"\0" * (-len(data) % 8))
+
+
+def load_forest(path: str) -> tuple[FrozenForest, dict, list | None]:
+    """
+    Load a frozen forest saved by save_forest. The file is memory-mapped and the integer arrays of the forest are
+    views of the mapped file, thus they are not copied and only the pages that are accessed are read.
+
+    :param path: The path of the file.
+    :return: The frozen forest, the metadata and the minimal edits costs or None if they were not saved.
+    """
+    with open(path, "rb") as file:
+        buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    if bytes(buffer[:len(FOREST_MAGIC)]) != FOREST_MAGIC:
+        raise Exception("The file does not contain a SPPF.")
+    version = int.from_bytes(buffer[len(FOREST_MAGIC):len(FOREST_MAGIC) + 8], "little")
+    if version != FOREST_FORMAT_VERSION:
+        raise Exception(f"The version {version} of the SPPF file is not supported.")
+
+    header_start = len(FOREST_MAGIC) + 16
+    header_end = header_start + int.from_bytes(buffer[len(FOREST_MAGIC) + 8:header_start], "little")
+    header = json.loads(bytes(buffer[header_start:header_end]).decode("utf-8"))
+    if header["byteorder"] != sys.byteorder:
+        raise Exception("The SPPF file was saved with another byte order.")
+
+    def aux_get_section(name: str) -> memoryview | None:
+        """
+        auxiliary function that gets a section of the file as a view of its values.
+
+        :param name: The name of the section.
+        :return: The view of the section or None if the file has no such section.
+        """
+        if name not in header["sections"]:
+            return None
+        offset, length, typecode = header["sections"][name]
+        return buffer[header_end + offset:header_end + offset + length].cast(typecode)
+
+    number_of_states, number_of_classes, minimal_dfa_start_state, alphabet = header["encoding"]
+    encoding = StateEncoding(number_of_states=number_of_states, number_of_classes=number_of_classes,
+                             minimal_dfa_start_state=minimal_dfa_start_state, alphabet=alphabet)
+
+    # Decode the interned edit operations
+    operations = []
+    encoded_operations = aux_get_section("operations")
+    for i in range(0, len(encoded_operations), OPERATION_WIDTH):
+        operation_type = EditCosts.operation_types[encoded_operations[i]]
+        values = []
+        j = i + 1
+        for attribute in operation_type.__slots__:
+            if attribute == "symbol":
+                values.append(alphabet[encoded_operations[j]])
+                j += 1
+            elif encoded_operations[j] < 0:
+                values.append(encoded_operations[j + 1])
+                j += 2
+            else:
+                values.append((STATE_KINDS[encoded_operations[j]], encoded_operations[j + 1]))
+                j += 2
+        operations.append(operation_type(*values))
+
+    interchangeable_offsets = aux_get_section("interchangeable_offsets")
+    interchangeable_states = aux_get_section("interchangeable_states")
+    interchangeable_states = {family: tuple(interchangeable_states[interchangeable_offsets[i]:
+                                                                   interchangeable_offsets[i + 1]])
+                              for i, family in enumerate(aux_get_section("interchangeable_families"))}
+
+    forest = FrozenForest(keys=PackedKeys(buffer=aux_get_section("keys"), width=header["key_width"]),
+                          encoding=encoding, family_offsets=aux_get_section("family_offsets"),
+                          family_symbols=aux_get_section("family_symbols"),
+                          family_edits=aux_get_section("family_edits"), edit_offsets=aux_get_section("edit_offsets"),
+                          operation_ids=aux_get_section("operation_ids"), operations=operations,
+                          interchangeable_states=interchangeable_states)
+
+    minimal_edits_costs = aux_get_section("minimal_edits_costs")
+    if minimal_edits_costs is not None:
+        minimal_edits_costs = [math.inf if costs == -1 else int(costs) if costs.is_integer() else costs
+                               for costs in minimal_edits_costs]
+
+    return forest, header["metadata"], minimal_edits_costs
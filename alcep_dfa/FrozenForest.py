@@ -0,0 +1,358 @@
+from array import array
+import sys
+from alcep_dfa.Nodes import SymbolNode, EditNode, EndNode, StateEncoding
+from alcep_dfa.Costs import EditCosts
+
+
+class FrozenForest:
+    """
+    A compact read-only representation of a SPPF in flat integer arrays (struct of arrays), built once the
+    construction has finished.
+
+    The symbol nodes are numbered in breadth-first order starting with the root node 0. The families of the symbol
+    node i are the families family_offsets[i] to family_offsets[i + 1] - 1 (compressed sparse rows). For each family f,
+    family_symbols[f] is the symbol node it leads to or -1 if the family ends a correction, and family_edits[f] is the
+    id of its edit node or -1 if the family has no edit operations. The edit node e consists of the edit operations
+    operation_ids[edit_offsets[e]] to operation_ids[edit_offsets[e + 1] - 1] of the interned operations table.
+    """
+
+    def __init__(self, keys: list, encoding: StateEncoding, family_offsets: array, family_symbols: array,
+                 family_edits: array, edit_offsets: array, operation_ids: array, operations: list,
+                 interchangeable_states: dict):
+        """
+        Initialize a FrozenForest instance.
+
+        :param keys: The keys of the symbol nodes.
+        :param encoding: The encoding of the keys.
+        :param family_offsets: The offsets of the families of each symbol node.
+        :param family_symbols: The symbol node of each family or -1.
+        :param family_edits: The edit node of each family or -1.
+        :param edit_offsets: The offsets of the operations of each edit node.
+        :param operation_ids: The ids of the operations of the edit nodes.
+        :param operations: The interned edit operations.
+        :param interchangeable_states: The interchangeable states of the families that have some.
+        """
+        self.keys = keys
+        self.encoding = encoding
+        self.family_offsets = family_offsets
+        self.family_symbols = family_symbols
+        self.family_edits = family_edits
+        self.edit_offsets = edit_offsets
+        self.operation_ids = operation_ids
+        self.operations = operations
+        self.interchangeable_states = interchangeable_states
+
+        self.number_of_symbol_nodes = len(family_offsets) - 1
+        self.number_of_families = len(family_symbols)
+        self.number_of_edits = len(edit_offsets) - 1
+
+        # The lazily computed lists of edit operations and numbers of operations per type of the edit nodes
+        self._edit_operations = None
+        self._operation_counts = None
+
+    def __getstate__(self) -> dict:
+        # Do not copy the cached lists of edit operations, e.g. when the forest is sent to another process. A loaded
+        # forest is copied from its memory-mapped file.
+        state = self.__dict__.copy()
+        for name in ("family_offsets", "family_symbols", "family_edits", "edit_offsets", "operation_ids"):
+            if not isinstance(state[name], array):
+                state[name] = array('q', state[name])
+        if not isinstance(state["keys"], list):
+            state["keys"] = list(state["keys"])
+        state["_edit_operations"] = None
+        state["_operation_counts"] = None
+        return state
+
+    def get_families(self, symbol: int) -> range:
+        """
+        Get the families of a symbol node.
+
+        :param symbol: The symbol node.
+        :return: The range of the families of the symbol node.
+        """
+        return range(self.family_offsets[symbol], self.family_offsets[symbol + 1])
+
+    def get_edit_operations(self, edit: int) -> list:
+        """
+        Get the edit operations of an edit node.
+
+        :param edit: The edit node.
+        :return: The list of edit operations, shared by all corrections that contain the edit node.
+        """
+        if self._edit_operations is None:
+            self._edit_operations = [[self.operations[self.operation_ids[i]]
+                                      for i in range(self.edit_offsets[e], self.edit_offsets[e + 1])]
+                                     for e in range(self.number_of_edits)]
+        return self._edit_operations[edit]
+
+    def get_multiplicity(self, family: int) -> int:
+        """
+        Get the number of families a family represents due to interchangeable states.
+
+        :param family: The family.
+        :return: The multiplicity of the family.
+        """
+        return max(len(self.interchangeable_states.get(family, ())), 1)
+
+    def swap_correction(self, family: int, correction: list, other_state: int) -> list:
+        """
+        Swap in a correction of a family the mapped state with an interchangeable state.
+
+        :param family: The family.
+        :param correction: A correction of the family, i.e. a list of lists of edit operations.
+        :param other_state: The interchangeable state.
+        :return: The correction for the interchangeable state.
+        """
+        state = self.interchangeable_states[family][0]
+        return [[edit_operation.swap_states(state=state, other_state=other_state)
+                 for edit_operation in edit_operations] for edit_operations in correction]
+
+    def get_choices(self, symbol: int):
+        """
+        Get the choices of a symbol node, i.e. its families, a family with interchangeable states once per state.
+
+        :param symbol: The symbol node.
+        :return: A generator of pairs of the family and the state or None.
+        """
+        for family in self.get_families(symbol):
+            for state in self.interchangeable_states.get(family, (None,)):
+                yield family, state
+
+    def build_correction(self, path) -> list:
+        """
+        Build the correction of a path of choices from the root node to the end of a correction.
+
+        :param path: The choices, i.e. pairs of the family and the state or None.
+        :return: The correction, i.e. a list of lists of edit operations.
+        """
+        correction = []
+        swaps = []
+        for family, state in path:
+            if state is not None and state != self.interchangeable_states[family][0]:
+                swaps.append((len(correction), family, state))
+            if self.family_edits[family] >= 0:
+                correction.append(self.get_edit_operations(self.family_edits[family]))
+
+        # Apply the swaps of the inner families first, as the swap of a family applies to its whole correction
+        for position, family, state in reversed(swaps):
+            correction[position:] = self.swap_correction(family=family, correction=correction[position:],
+                                                         other_state=state)
+        return correction
+
+    def get_edit_costs(self, edit_costs: EditCosts) -> list:
+        """
+        Get the costs of each edit node.
+
+        :param edit_costs: The costs of the edit operations.
+        :return: The list of the costs of the edit nodes.
+        """
+        operation_costs = [edit_costs.get_costs(edit_operations=[edit_operation])
+                           for edit_operation in self.operations]
+        return [sum(operation_costs[self.operation_ids[i]]
+                    for i in range(self.edit_offsets[e], self.edit_offsets[e + 1]))
+                for e in range(self.number_of_edits)]
+
+    def get_operation_counts(self) -> list:
+        """
+        Get for each edit node the number of its edit operations of each type, in the order of
+        EditCosts.operation_types. The costs of an edit node are the dot product with a costs vector.
+
+        :return: The list of the tuples of the numbers of operations of the edit nodes.
+        """
+        if self._operation_counts is None:
+            operation_types = EditCosts.operation_types
+            type_indices = [next(i for i, operation_type in enumerate(operation_types)
+                                 if isinstance(edit_operation, operation_type))
+                            for edit_operation in self.operations]
+
+            self._operation_counts = []
+            for e in range(self.number_of_edits):
+                counts = [0] * len(operation_types)
+                for i in range(self.edit_offsets[e], self.edit_offsets[e + 1]):
+                    counts[type_indices[self.operation_ids[i]]] += 1
+                self._operation_counts.append(tuple(counts))
+        return self._operation_counts
+
+    def get_profile_edit_costs(self, profiles: list) -> list:
+        """
+        Get the costs of each edit node for several costs profiles at once.
+
+        :param profiles: The costs profiles, each a costs vector in the order of EditCosts.operation_types.
+        :return: The list of the tuples of the costs of the edit nodes, one costs per profile.
+        """
+        # Only the distinct operation counts are multiplied with the profiles
+        profile_costs = {}
+        edit_costs = []
+        for counts in self.get_operation_counts():
+            if counts not in profile_costs:
+                profile_costs[counts] = tuple(sum(count * costs for count, costs in zip(counts, profile) if count)
+                                              for profile in profiles)
+            edit_costs.append(profile_costs[counts])
+        return edit_costs
+
+    def rename_states(self, states: list) -> "FrozenForest":
+        """
+        Get the forest with the states of the to_correct DFA renamed, i.e. the forest of the corrections of an
+        isomorphic DFA. The arrays of the families are shared, only the keys, the edit operations and the
+        interchangeable states are renamed.
+
+        :param states: The new name of each state of the to_correct DFA, a permutation.
+        :return: The renamed forest.
+        """
+        return FrozenForest(keys=[self.encoding.rename_states(key=key, states=states) for key in self.keys],
+                            encoding=self.encoding, family_offsets=self.family_offsets,
+                            family_symbols=self.family_symbols, family_edits=self.family_edits,
+                            edit_offsets=self.edit_offsets, operation_ids=self.operation_ids,
+                            operations=[edit_operation.rename_states(states=states)
+                                        for edit_operation in self.operations],
+                            interchangeable_states={family: tuple(states[state] for state in family_states)
+                                                    for family, family_states in self.interchangeable_states.items()})
+
+    def restrict(self, kept_families) -> "FrozenForest | None":
+        """
+        Restrict the forest to the given families and the symbol nodes that are reachable from the root over them.
+
+        :param kept_families: For each family a truth value whether it is kept.
+        :return: The restricted forest or None if the root has no kept family.
+        """
+        new_indices = {0: 0}
+        symbols = [0]
+        family_offsets = array('q', [0])
+        family_symbols = array('q')
+        family_edits = array('q')
+        interchangeable_states = {}
+
+        i = 0
+        while i < len(symbols):
+            for family in self.get_families(symbols[i]):
+                if not kept_families[family]:
+                    continue
+
+                child = self.family_symbols[family]
+                if child >= 0 and child not in new_indices:
+                    new_indices[child] = len(symbols)
+                    symbols.append(child)
+
+                if family in self.interchangeable_states:
+                    interchangeable_states[len(family_symbols)] = self.interchangeable_states[family]
+                family_symbols.append(new_indices[child] if child >= 0 else -1)
+                family_edits.append(self.family_edits[family])
+            family_offsets.append(len(family_symbols))
+            i += 1
+
+        if family_offsets[1] == 0:
+            return None
+
+        return FrozenForest(keys=[self.keys[symbol] for symbol in symbols], encoding=self.encoding,
+                            family_offsets=family_offsets, family_symbols=family_symbols, family_edits=family_edits,
+                            edit_offsets=self.edit_offsets, operation_ids=self.operation_ids,
+                            operations=self.operations, interchangeable_states=interchangeable_states)
+
+    def thaw(self) -> SymbolNode:
+        """
+        Rebuild the object graph of the forest.
+
+        :return: The root node of the SPPF.
+        """
+        symbol_nodes = [SymbolNode(key=key, encoding=self.encoding) for key in self.keys]
+        edit_nodes = [EditNode(edit_operations=self.get_edit_operations(edit)) for edit in range(self.number_of_edits)]
+        end_node = EndNode()
+
+        for symbol, symbol_node in enumerate(symbol_nodes):
+            for family in self.get_families(symbol):
+                child, edit = self.family_symbols[family], self.family_edits[family]
+                if child < 0:
+                    symbol_node.add_family(left_node=None, right_node=end_node)
+                elif edit < 0:
+                    symbol_node.add_family(left_node=None, right_node=symbol_nodes[child])
+                else:
+                    symbol_node.add_family(left_node=symbol_nodes[child], right_node=edit_nodes[edit],
+                                           interchangeable_states=self.interchangeable_states.get(family, ()))
+        return symbol_nodes[0]
+
+    def get_memory_usage(self) -> dict:
+        """
+        Measures the memory of the forest, i.e. the sizes of the arrays, the keys and the interned edit operations.
+
+        :return: A dict with the number of nodes (symbol nodes, families and edit nodes), the number of bytes and the
+            bytes per node.
+        """
+        number_of_bytes = sum(sys.getsizeof(buffer) for buffer in (self.family_offsets, self.family_symbols,
+                                                                    self.family_edits, self.edit_offsets,
+                                                                    self.operation_ids))
+        number_of_bytes += sys.getsizeof(self.keys) + sum(sys.getsizeof(key) for key in self.keys)
+        number_of_bytes += sys.getsizeof(self.operations) + sum(sys.getsizeof(edit_operation)
+                                                                for edit_operation in self.operations)
+        number_of_nodes = self.number_of_symbol_nodes + self.number_of_families + self.number_of_edits
+
+        return {"number_of_nodes": number_of_nodes,
+                "number_of_bytes": number_of_bytes,
+                "bytes_per_node": number_of_bytes / number_of_nodes}
+
+
+def freeze_forest(root_node: SymbolNode | None) -> FrozenForest | None:
+    """
+    Freeze the SPPF with the given root node into a FrozenForest.
+
+    :param root_node: The root node of the SPPF or None.
+    :return: The frozen forest or None if the root node is None.
+    """
+    if root_node is None:
+        return None
+
+    # Number the symbol nodes in breadth-first order and collect their families
+    symbol_indices = {root_node: 0}
+    symbol_nodes = [root_node]
+    edit_indices = {}
+    operation_indices = {}
+    operations = []
+
+    family_offsets = array('q', [0])
+    family_symbols = array('q')
+    family_edits = array('q')
+    edit_offsets = array('q', [0])
+    operation_ids = array('q')
+    interchangeable_states = {}
+
+    i = 0
+    while i < len(symbol_nodes):
+        for child in symbol_nodes[i].get_children():
+            right_node = child.get_right_node()
+            match right_node:
+                case EditNode():
+                    next_node = child.get_left_node()
+                case SymbolNode():
+                    next_node = right_node
+                case EndNode():
+                    next_node = None
+                case _:
+                    raise Exception("Unexpected node type.")
+
+            if next_node is not None and next_node not in symbol_indices:
+                symbol_indices[next_node] = len(symbol_nodes)
+                symbol_nodes.append(next_node)
+
+            # Intern the edit node and its edit operations
+            edit = -1
+            if isinstance(right_node, EditNode):
+                if right_node not in edit_indices:
+                    edit_indices[right_node] = len(edit_indices)
+                    for edit_operation in right_node.get_edit_operations():
+                        if edit_operation not in operation_indices:
+                            operation_indices[edit_operation] = len(operations)
+                            operations.append(edit_operation)
+                        operation_ids.append(operation_indices[edit_operation])
+                    edit_offsets.append(len(operation_ids))
+                edit = edit_indices[right_node]
+
+            if child.get_interchangeable_states():
+                interchangeable_states[len(family_symbols)] = child.get_interchangeable_states()
+            family_symbols.append(symbol_indices[next_node] if next_node is not None else -1)
+            family_edits.append(edit)
+        family_offsets.append(len(family_symbols))
+        i += 1
+
+    return FrozenForest(keys=[symbol_node.get_key() for symbol_node in symbol_nodes], encoding=root_node.encoding,
+                        family_offsets=family_offsets, family_symbols=family_symbols, family_edits=family_edits,
+                        edit_offsets=edit_offsets, operation_ids=operation_ids, operations=operations,
+                        interchangeable_states=interchangeable_states)
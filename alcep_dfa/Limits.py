@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+from .Constants import DEADLINE, MAX_NODES, MAX_MEMORY
+
+
+def get_resident_memory() -> int:
+    """
+    Get the resident memory of the current process in bytes. On Linux, this is the current resident set size,
+    otherwise the peak resident set size.
+
+    :return: The number of bytes.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # The peak resident set size is given in bytes on macOS and in kilobytes otherwise
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class ConstructionLimits:
+    """
+    The limits of the construction of the SPPF: a deadline, a maximum number of symbol nodes and a maximum resident
+    memory of the process. The limits are checked cooperatively inside the construction loop, which stops cleanly as
+    soon as one of them is exhausted.
+    """
+
+    # The resident memory is only measured every memory_check_interval checks
+    memory_check_interval = 1024
+
+    def __init__(self, deadline: float | None = None, max_nodes: int | None = None, max_memory: int | None = None):
+        """
+        Initialize the limits of a construction.
+
+        :param deadline: The point in time of time.monotonic() at which the construction stops, e.g.
+            time.monotonic() + 10 for a time limit of 10 seconds. None for no limit.
+        :param max_nodes: The maximum number of symbol nodes of the SPPF, None for no limit.
+        :param max_memory: The maximum resident memory of the process in bytes, None for no limit.
+        """
+        self.deadline = deadline
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory
+        self.number_of_checks = 0
+
+    def check(self, number_of_nodes: int) -> str | None:
+        """
+        Check whether one of the limits is exhausted.
+
+        :param number_of_nodes: The current number of symbol nodes.
+        :return: The exhausted limit (DEADLINE, MAX_NODES or MAX_MEMORY) or None.
+        """
+        self.number_of_checks += 1
+
+        if self.max_nodes is not None and number_of_nodes > self.max_nodes:
+            return MAX_NODES
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return DEADLINE
+        if self.max_memory is not None and self.number_of_checks % self.memory_check_interval == 1 \
+                and get_resident_memory() > self.max_memory:
+            return MAX_MEMORY
+        return None
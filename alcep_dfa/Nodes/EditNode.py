@@ -3,11 +3,12 @@ from .ForestNode import ForestNode
 
 class EditNode(ForestNode):
 
+    __slots__ = ("edit_operations",)
+
     def __init__(self, edit_operations: list):
         """
         Initialize an EditNode instance.
         """
-        super().__init__()
         self.edit_operations = edit_operations
 
     def get_edit_operations(self) -> list:
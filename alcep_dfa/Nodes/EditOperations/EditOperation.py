@@ -1,2 +1,59 @@
+import copy
+from ...Constants import TO_CORRECT
+
+
 class EditOperation:
-    pass
+    """
+    The base class of all edit operations. Edit operations have value semantics, two edit operations are equal if
+    they are of the same class and have the same states and symbol.
+    """
+
+    __slots__ = ()
+
+    def get_values(self) -> tuple:
+        """
+        Get the values that define the edit operation.
+
+        :return: The values of all slots of the edit operation.
+        """
+        return tuple(getattr(self, attribute) for attribute in self.__slots__)
+
+    def swap_states(self, state: int, other_state: int) -> "EditOperation":
+        """
+        Get a copy of the edit operation in which the two given states of the to_correct DFA are swapped.
+
+        :param state: A state of the to_correct DFA.
+        :param other_state: The other state of the to_correct DFA.
+        :return: The edit operation with swapped states.
+        """
+        swapped_operation = copy.copy(self)
+        for attribute in self.__slots__:
+            value = getattr(self, attribute, None)
+            if value == (TO_CORRECT, state):
+                setattr(swapped_operation, attribute, (TO_CORRECT, other_state))
+            elif value == (TO_CORRECT, other_state):
+                setattr(swapped_operation, attribute, (TO_CORRECT, state))
+        return swapped_operation
+
+    def rename_states(self, states: list) -> "EditOperation":
+        """
+        Get a copy of the edit operation in which the states of the to_correct DFA are renamed.
+
+        :param states: The new name of each state of the to_correct DFA.
+        :return: The edit operation with renamed states.
+        """
+        renamed_operation = copy.copy(self)
+        for attribute in self.__slots__:
+            value = getattr(self, attribute, None)
+            if isinstance(value, tuple) and value[0] == TO_CORRECT:
+                setattr(renamed_operation, attribute, (TO_CORRECT, states[value[1]]))
+            elif isinstance(value, int) and attribute != "symbol":
+                # The old initial state is not tagged
+                setattr(renamed_operation, attribute, states[value])
+        return renamed_operation
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.get_values() == other.get_values()
+
+    def __hash__(self):
+        return hash((type(self), self.get_values()))
@@ -3,6 +3,8 @@ from .EditOperation import EditOperation
 
 class MarkStateAsNonFinal(EditOperation):
 
+    __slots__ = ("state",)
+
     def __init__(self, state: tuple):
         self.state = state
 
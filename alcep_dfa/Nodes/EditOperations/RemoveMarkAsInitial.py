@@ -3,6 +3,8 @@ from .EditOperation import EditOperation
 
 class RemoveMarkAsInitial(EditOperation):
 
+    __slots__ = ("state",)
+
     def __init__(self, state: tuple):
         self.state = state
 
@@ -3,6 +3,8 @@ from .EditOperation import EditOperation
 
 class RemoveTransition(EditOperation):
 
+    __slots__ = ("source_state", "symbol", "target_state")
+
     def __init__(self, source_state: tuple, symbol: str, target_state: tuple):
         self.source_state = source_state
         self.symbol = symbol
@@ -3,5 +3,4 @@ from .ForestNode import ForestNode
 
 class EndNode(ForestNode):
 
-    def __init__(self):
-        super().__init__()
+    __slots__ = ()
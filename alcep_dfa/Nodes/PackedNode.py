@@ -3,20 +3,24 @@ from .ForestNode import ForestNode
 
 class PackedNode(ForestNode):
 
-    def __init__(self, parent: ForestNode, left_node: ForestNode | None, right_node: ForestNode):
+    __slots__ = ("left_node", "right_node", "parent", "interchangeable_states")
+
+    def __init__(self, parent: ForestNode, left_node: ForestNode | None, right_node: ForestNode,
+                 interchangeable_states: tuple = ()):
         """
         Initialize a PackedNode instance.
 
         :param parent: The parent node.
         :param left_node: The left child node.
         :param right_node: The right child node.
+        :param interchangeable_states: The states of the to_correct DFA that are interchangeable with the first of
+            them, which is the state the family maps. The family then represents for each of these states the
+            corrections of the family with the first state swapped with it.
         """
-        super().__init__()
         self.left_node = left_node
         self.right_node = right_node
         self.parent = parent
-        self.is_allowed_mapping = None
-        self.contained_in_cor_to_minial_dfa = None
+        self.interchangeable_states = interchangeable_states
 
     def get_right_node(self) -> ForestNode:
         """
@@ -34,14 +38,29 @@ class PackedNode(ForestNode):
         """
         return self.left_node
 
-    def set_is_allowed_mapping(self, is_allowed_mapping: bool):
-        self.is_allowed_mapping = is_allowed_mapping
+    def get_interchangeable_states(self) -> tuple:
+        """
+        Get the states of the to_correct DFA that are interchangeable with the state this family maps.
 
-    def get_is_allowed_mapping(self) -> bool:
-        return self.is_allowed_mapping
+        :return: The interchangeable states, starting with the mapped state, or an empty tuple.
+        """
+        return self.interchangeable_states
 
-    def get_contained_in_cor_to_minial_dfa(self) -> bool:
-        return self.contained_in_cor_to_minial_dfa
+    def get_multiplicity(self) -> int:
+        """
+        Get the number of families this family represents due to interchangeable states.
 
-    def set_contained_in_cor_to_minial_dfa(self, contained_in_cor_to_minial_dfa: bool):
-        self.contained_in_cor_to_minial_dfa = contained_in_cor_to_minial_dfa
+        :return: The multiplicity of the family.
+        """
+        return max(len(self.interchangeable_states), 1)
+
+    def swap_correction(self, correction: list, other_state: int) -> list:
+        """
+        Swap in a correction of this family the mapped state with an interchangeable state.
+
+        :param correction: A correction of this family, i.e. a list of lists of edit operations.
+        :param other_state: The interchangeable state.
+        :return: The correction for the interchangeable state.
+        """
+        return [[edit_operation.swap_states(state=self.interchangeable_states[0], other_state=other_state)
+                 for edit_operation in edit_operations] for edit_operations in correction]
@@ -0,0 +1,185 @@
+from ..Constants import *
+
+
+class StateEncoding:
+    """
+    Interns the states of the to_correct DFA, the equivalence classes of the minimal DFA and the letters of the
+    alphabet to small integers and packs the status of the parse process of a SymbolNode into a single integer key.
+
+    The states of both automata are indexed in the order of states_of_both: first the states of the to_correct DFA,
+    then one new state for each equivalence class of the minimal DFA and last the new start state. The equivalence
+    class a state of the to_correct DFA is mapped to is identified by a class id: 0 if the state is not mapped yet,
+    the equivalence class plus one for (MINIMAL_DFA, class) and the number of equivalence classes plus one for
+    (MINIMAL_DFA_START, start state).
+
+    A key consists of the following fixed-width fields, starting with the lowest bits:
+        - the number of seen symbols of the current state, i.e. the index of the next letter,
+        - the index of the current state plus one (0 if no state is currently processed),
+        - the bitmask of the added new states,
+        - the bitmask of the states in the queue,
+        - for each state of the to_correct DFA the class id of its mapped equivalence class.
+    """
+
+    def __init__(self, number_of_states: int, number_of_classes: int, minimal_dfa_start_state: int, alphabet: list):
+        """
+        Initialize a StateEncoding instance.
+
+        :param number_of_states: The number of states of the to_correct DFA.
+        :param number_of_classes: The number of states (equivalence classes) of the minimal DFA.
+        :param minimal_dfa_start_state: The start state of the minimal DFA.
+        :param alphabet: The ordered alphabet.
+        """
+        self.number_of_states = number_of_states
+        self.number_of_classes = number_of_classes
+        self.minimal_dfa_start_state = minimal_dfa_start_state
+        self.alphabet = alphabet
+
+        # Define an order on the states
+        self.states_of_both = [(TO_CORRECT, state) for state in range(number_of_states)] + \
+                              [(MINIMAL_DFA, state) for state in range(number_of_classes)] + \
+                              [(MINIMAL_DFA_START, minimal_dfa_start_state)]
+        self.start_index = number_of_states + number_of_classes
+        self.start_class_id = number_of_classes + 1
+
+        # The equivalence class and the mapped state of each class id
+        self.classes_of_ids = [-1] + list(range(number_of_classes)) + [minimal_dfa_start_state]
+        self.mapped_states_of_ids = [None] + self.states_of_both[number_of_states:]
+
+        # The widths and offsets of the fields of a key
+        self.class_bits = self.start_class_id.bit_length()
+        self.class_mask = (1 << self.class_bits) - 1
+        self.seen_bits = len(alphabet).bit_length()
+        self.seen_mask = (1 << self.seen_bits) - 1
+        self.current_bits = len(self.states_of_both).bit_length()
+        self.current_mask = (1 << self.current_bits) - 1
+        self.states_bits = len(self.states_of_both)
+        self.states_mask = (1 << self.states_bits) - 1
+
+        self.current_offset = self.seen_bits
+        self.added_offset = self.current_offset + self.current_bits
+        self.queue_offset = self.added_offset + self.states_bits
+        self.mapping_offset = self.queue_offset + self.states_bits
+
+    def pack(self, state_mapping: int, current_state: int, queue: int, added: int, seen_symbols: int) -> int:
+        """
+        Pack the fields of a status of the parse process into a key.
+
+        :param state_mapping: The class ids of the states of the to_correct DFA.
+        :param current_state: The index of the current state plus one or 0.
+        :param queue: The bitmask of the states in the queue.
+        :param added: The bitmask of the added new states.
+        :param seen_symbols: The number of seen symbols.
+        :return: The key.
+        """
+        return ((((state_mapping << self.states_bits | queue) << self.states_bits | added) << self.current_bits
+                 | current_state) << self.seen_bits) | seen_symbols
+
+    def unpack(self, key: int) -> tuple[int, int, int, int, int]:
+        """
+        Unpack a key into the fields of the status of the parse process.
+
+        :param key: The key.
+        :return: A tuple containing the state mapping, current state, queue, added new states and seen symbols.
+        """
+        return (key >> self.mapping_offset,
+                (key >> self.current_offset) & self.current_mask,
+                (key >> self.queue_offset) & self.states_mask,
+                (key >> self.added_offset) & self.states_mask,
+                key & self.seen_mask)
+
+    def get_queue(self, key: int) -> int:
+        """
+        Get the bitmask of the states in the queue of a key.
+
+        :param key: The key.
+        :return: The bitmask of the states in the queue.
+        """
+        return (key >> self.queue_offset) & self.states_mask
+
+    def is_intermediate(self, key: int) -> bool:
+        """
+        Check if a key is in the middle of processing a state, i.e. some symbols of the current state are seen.
+
+        :param key: The key.
+        :return: True if at least one symbol is seen.
+        """
+        return bool(key & self.seen_mask)
+
+    def get_class_id(self, state_mapping: int, state: int) -> int:
+        """
+        Get the class id of the equivalence class a state of the to_correct DFA is mapped to.
+
+        :param state_mapping: The class ids of the states of the to_correct DFA.
+        :param state: The state of the to_correct DFA.
+        :return: The class id or 0 if the state is not mapped.
+        """
+        return (state_mapping >> (state * self.class_bits)) & self.class_mask
+
+    def get_class_ids(self, state_mapping: int) -> list[int]:
+        """
+        Get the class ids of all states of the to_correct DFA.
+
+        :param state_mapping: The class ids of the states of the to_correct DFA.
+        :return: A list with the class id of each state.
+        """
+        class_ids = []
+        for _ in range(self.number_of_states):
+            class_ids.append(state_mapping & self.class_mask)
+            state_mapping >>= self.class_bits
+        return class_ids
+
+    def map_state(self, state_mapping: int, state: int, class_id: int) -> int:
+        """
+        Map a not yet mapped state of the to_correct DFA to an equivalence class.
+
+        :param state_mapping: The class ids of the states of the to_correct DFA.
+        :param state: The state of the to_correct DFA.
+        :param class_id: The class id of the equivalence class.
+        :return: The new state mapping.
+        """
+        return state_mapping | (class_id << (state * self.class_bits))
+
+    def rename_states(self, key: int, states: list) -> int:
+        """
+        Rename the states of the to_correct DFA in a key.
+
+        :param key: The key.
+        :param states: The new name of each state of the to_correct DFA.
+        :return: The key with renamed states.
+        """
+        state_mapping, current_state, queue, added, seen_symbols = self.unpack(key)
+
+        renamed_state_mapping = 0
+        for state, class_id in enumerate(self.get_class_ids(state_mapping)):
+            renamed_state_mapping = self.map_state(state_mapping=renamed_state_mapping, state=states[state],
+                                                   class_id=class_id)
+
+        # The states of the to_correct DFA are the first states of states_of_both
+        if 0 < current_state <= self.number_of_states:
+            current_state = states[current_state - 1] + 1
+        renamed_queue, renamed_added = queue >> self.number_of_states, added >> self.number_of_states
+        renamed_queue <<= self.number_of_states
+        renamed_added <<= self.number_of_states
+        for state in range(self.number_of_states):
+            renamed_queue |= (queue >> state & 1) << states[state]
+            renamed_added |= (added >> state & 1) << states[state]
+
+        return self.pack(state_mapping=renamed_state_mapping, current_state=current_state, queue=renamed_queue,
+                         added=renamed_added, seen_symbols=seen_symbols)
+
+    def decode(self, key: int) -> tuple[dict, tuple, set, set, list]:
+        """
+        Decode a key into the readable status of the parse process.
+
+        :param key: The key.
+        :return: A tuple containing the state mapping, current state, queue, added equivalence classes, and seen
+            symbols.
+        """
+        state_mapping, current_state, queue, added, seen_symbols = self.unpack(key)
+
+        return ({state: self.mapped_states_of_ids[class_id]
+                 for state, class_id in enumerate(self.get_class_ids(state_mapping)) if class_id},
+                self.states_of_both[current_state - 1] if current_state else (),
+                {state for index, state in enumerate(self.states_of_both) if queue >> index & 1},
+                {state for index, state in enumerate(self.states_of_both) if added >> index & 1},
+                self.alphabet[:seen_symbols])
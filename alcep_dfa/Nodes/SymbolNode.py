@@ -1,40 +1,73 @@
 from .ForestNode import ForestNode
 from .PackedNode import PackedNode
+from .StateEncoding import StateEncoding
 from ..Constants import *
 
 
 class SymbolNode(ForestNode):
 
-    def __init__(self, state_mapping: frozenset, current_state: tuple, queue: frozenset, added: frozenset,
-                 seen_symbols: list):
+    __slots__ = ("key", "encoding", "_children")
+
+    def __init__(self, key: int, encoding: StateEncoding):
         """
         Initialize a SymbolNode instance.
 
-        :param state_mapping: The state mapping dictionary.
-        :param current_state: The current state being processed.
-        :param queue: The queue of states to be seen next.
-        :param added: The added equivalence classes of new added states.
-        :param seen_symbols: The list of symbols seen so far, for this node.
+        :param key: The integer key that encodes the status of the parse process of this node, i.e. the state mapping,
+            the current state being processed, the queue of states to be seen next, the added equivalence classes of
+            new added states and the symbols seen so far.
+        :param encoding: The encoding of the keys, shared by all nodes of the SPPF.
         """
-        super().__init__()
-        self.state_mapping = state_mapping
-        self.current_state = current_state
-        self.queue = queue
-        self.added = added
-        self.seen_symbols = seen_symbols
-        self._children = set()
-        self.is_allowed_mapping = None
-        self.contained_in_cor_to_minial_dfa = None
-
-    def add_family(self, left_node: ForestNode | None, right_node: ForestNode):
+        self.key = key
+        self.encoding = encoding
+        # The families of the node, keyed by their (left_node, right_node) pair
+        self._children = {}
+
+    def add_family(self, left_node: ForestNode | None, right_node: ForestNode,
+                   interchangeable_states: tuple = ()) -> bool:
         """
-        Add a child family (left and right child nodes) to the current SymbolNode.
+        Add a child family (left and right child nodes) to the current SymbolNode. The families are keyed
+        structurally, if the node already has a family with the same left and right child nodes it is reused.
 
         :param left_node: The left child node.
         :param right_node: The right child node.
-        :return: None
+        :param interchangeable_states: The states of the to_correct DFA that are interchangeable in this family.
+        :return: True if the family was added, False if the family already existed.
         """
-        self._children.add(PackedNode(parent=self, left_node=left_node, right_node=right_node))
+        family_key = (left_node, right_node)
+        if family_key in self._children:
+            return False
+
+        self._children[family_key] = PackedNode(parent=self, left_node=left_node, right_node=right_node,
+                                                interchangeable_states=interchangeable_states)
+        return True
+
+    @property
+    def state_mapping(self) -> frozenset:
+        return frozenset(self.get_params_unfrozen()[0].items())
+
+    @property
+    def current_state(self) -> tuple:
+        return self.get_params_unfrozen()[1]
+
+    @property
+    def queue(self) -> frozenset:
+        return frozenset(self.get_params_unfrozen()[2])
+
+    @property
+    def added(self) -> frozenset:
+        return frozenset(self.get_params_unfrozen()[3])
+
+    @property
+    def seen_symbols(self) -> frozenset:
+        return frozenset(self.get_params_unfrozen()[4])
+
+    def get_key(self) -> int:
+        """
+        Get the integer key of the SymbolNode.
+
+        :return: The key that encodes the status of the parse process.
+        """
+        return self.key
 
     def get_params_unfrozen(self) -> tuple:
         """
@@ -42,7 +75,7 @@ class SymbolNode(ForestNode):
 
         :return: A tuple containing the state mapping, queue, added equivalence classes, and seen symbols.
         """
-        return dict(self.state_mapping), self.current_state, set(self.queue), set(self.added), list(self.seen_symbols)
+        return self.encoding.decode(self.key)
 
     def get_children(self) -> list:
         """
@@ -50,39 +83,28 @@ class SymbolNode(ForestNode):
 
         :return: A list of PackedNode children.
         """
-        return list(self._children)
+        return list(self._children.values())
 
     def is_intermediate(self) -> bool:
-        return bool(self.seen_symbols)
+        return self.encoding.is_intermediate(self.key)
 
-    def set_children(self, children: set):
+    def set_children(self, children: list):
         """
         Set the children of the SymbolNode.
 
-        :param children: The new children to set.
+        :param children: The new children to set, in the order of the families.
         :return: None
         """
-        self._children = children
-
-    def set_is_allowed_mapping(self, is_allowed_mapping: bool):
-        self.is_allowed_mapping = is_allowed_mapping
-
-    def get_is_allowed_mapping(self) -> bool:
-        return self.is_allowed_mapping
+        self._children = {(child.left_node, child.right_node): child for child in children}
 
     def get_equivalence_class(self):
+        state_mapping, current_state, _, _, _ = self.encoding.unpack(self.key)
 
-        if not self.current_state:
+        if not current_state:
             return None
 
-        if self.current_state[0] == TO_CORRECT:
-            state_mapping = dict(self.state_mapping)
-            return state_mapping[self.current_state[1]][1]
+        state_type, state = self.encoding.states_of_both[current_state - 1]
+        if state_type == TO_CORRECT:
+            return self.encoding.classes_of_ids[self.encoding.get_class_id(state_mapping, state)]
         else:
-            return self.current_state[1]
-
-    def get_contained_in_cor_to_minial_dfa(self) -> bool:
-        return self.contained_in_cor_to_minial_dfa
-
-    def set_contained_in_cor_to_minial_dfa(self, contained_in_cor_to_minial_dfa: bool):
-        self.contained_in_cor_to_minial_dfa = contained_in_cor_to_minial_dfa
+            return state
@@ -1,4 +1,5 @@
 from .ForestNode import *
+from .StateEncoding import *
 from .SymbolNode import *
 from .EditNode import *
 from .PackedNode import *
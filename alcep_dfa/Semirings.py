@@ -0,0 +1,328 @@
+import math
+from abc import ABC, abstractmethod
+from heapq import merge
+from itertools import islice
+from operator import add
+
+
+class Semiring(ABC):
+    """
+    A semiring over the values of an analysis of the SPPF. The value of a symbol node is the sum (plus) over its
+    families of the product (times) of the value of the edit node and the value of the symbol node the family leads
+    to. A family that ends the correction leads to the one, a symbol node without families has the value zero.
+    """
+
+    # The neutral elements of plus and times.
+    zero = None
+    one = None
+
+    # If set, the values of the symbol nodes of a cycle are iterated until they are stable, which requires that the
+    # iteration converges (e.g. for idempotent semirings and non-negative costs). Otherwise, cycles are not supported.
+    iterate_cycles = False
+
+    # If set, the iteration only converges if every cycle has positive edit costs, a cycle of families without edit
+    # costs is not supported.
+    requires_positive_cycles = False
+
+    @abstractmethod
+    def plus(self, a, b):
+        """
+        Add two values, i.e. combine the values of alternative families.
+
+        :param a: The first value.
+        :param b: The second value.
+        :return: The sum.
+        """
+
+    @abstractmethod
+    def times(self, a, b):
+        """
+        Multiply two values, i.e. combine the values of consecutive parts of a correction.
+
+        :param a: The first value.
+        :param b: The second value.
+        :return: The product.
+        """
+
+    def get_edit_value(self, edit_operations: list, costs):
+        """
+        Get the value of an edit node.
+
+        :param edit_operations: The edit operations of the edit node.
+        :param costs: The costs of the edit operations.
+        :return: The value of the edit node.
+        """
+        return self.one
+
+    def scale(self, value, n: int):
+        """
+        Add a value n times to itself.
+
+        :param value: The value.
+        :param n: The positive number of summands.
+        :return: The sum.
+        """
+        result = value
+        for _ in range(n - 1):
+            result = self.plus(result, value)
+        return result
+
+    def get_family_value(self, forest, family: int, value):
+        """
+        Get the value of a family from the product of its edit node and the symbol node it leads to. A family with
+        interchangeable states represents one family per state.
+
+        :param forest: The frozen forest.
+        :param family: The family.
+        :param value: The product of the values of the edit node and the symbol node the family leads to.
+        :return: The value of the family.
+        """
+        multiplicity = forest.get_multiplicity(family)
+        return self.scale(value, multiplicity) if multiplicity > 1 else value
+
+
+class TropicalSemiring(Semiring):
+    """
+    The (min, +) semiring of the minimal edits costs.
+    """
+
+    zero = math.inf
+    one = 0
+    iterate_cycles = True
+
+    def plus(self, a, b):
+        return a if a <= b else b
+
+    def times(self, a, b):
+        return a + b
+
+    def get_edit_value(self, edit_operations: list, costs):
+        return costs
+
+    def scale(self, value, n: int):
+        return value
+
+
+class ProfilesTropicalSemiring(Semiring):
+    """
+    The (min, +) semiring of the minimal edits costs of several costs profiles at once, i.e. tuples of the costs of
+    each profile.
+    """
+
+    iterate_cycles = True
+
+    def __init__(self, number_of_profiles: int):
+        """
+        Initialize a ProfilesTropicalSemiring.
+
+        :param number_of_profiles: The number of costs profiles.
+        """
+        self.zero = (math.inf,) * number_of_profiles
+        self.one = (0,) * number_of_profiles
+
+    def plus(self, a, b):
+        return tuple(map(min, a, b))
+
+    def times(self, a, b):
+        return tuple(map(add, a, b))
+
+    def get_edit_value(self, edit_operations: list, costs):
+        return costs
+
+    def scale(self, value, n: int):
+        return value
+
+
+class CountingSemiring(Semiring):
+    """
+    The (+, *) semiring of the number of corrections.
+    """
+
+    zero = 0
+    one = 1
+
+    def plus(self, a, b):
+        return a + b
+
+    def times(self, a, b):
+        return a * b
+
+    def scale(self, value, n: int):
+        return value * n
+
+
+class MinimalCountingSemiring(Semiring):
+    """
+    The semiring of the minimal edits costs together with the number of corrections with these costs, i.e. pairs of
+    the costs and the number. The iteration of cycles converges, if every cycle of the SPPF has positive edit costs,
+    because then no correction with minimal edit costs runs through a cycle. Otherwise, the number grows forever.
+    """
+
+    zero = (math.inf, 0)
+    one = (0, 1)
+    iterate_cycles = True
+    requires_positive_cycles = True
+
+    def plus(self, a, b):
+        if a[0] == b[0]:
+            return a[0], a[1] + b[1]
+        return a if a[0] < b[0] else b
+
+    def times(self, a, b):
+        return a[0] + b[0], a[1] * b[1]
+
+    def get_edit_value(self, edit_operations: list, costs):
+        return costs, 1
+
+    def scale(self, value, n: int):
+        return value[0], value[1] * n
+
+
+class BooleanSemiring(Semiring):
+    """
+    The (or, and) semiring whether a symbol node is contained in a correction.
+    """
+
+    zero = False
+    one = True
+    iterate_cycles = True
+
+    def plus(self, a, b):
+        return a or b
+
+    def times(self, a, b):
+        return a and b
+
+    def scale(self, value, n: int):
+        return value
+
+
+class KBestSemiring(Semiring):
+    """
+    The semiring of the k smallest edits costs of the corrections, i.e. sorted lists of at most k costs. Corrections
+    with the same costs are counted individually.
+    """
+
+    zero = ()
+    one = (0,)
+    iterate_cycles = True
+
+    def __init__(self, k: int):
+        """
+        Initialize a KBestSemiring.
+
+        :param k: The number of costs to keep.
+        """
+        if k < 1:
+            raise Exception("The number of best corrections must be positive.")
+        self.k = k
+
+    def plus(self, a, b):
+        return tuple(islice(merge(a, b), self.k))
+
+    def times(self, a, b):
+        # The k smallest sums of the two sorted lists
+        return tuple(islice(merge(*[[x + y for y in b] for x in a]), self.k))
+
+    def get_edit_value(self, edit_operations: list, costs):
+        return (costs,)
+
+    def scale(self, value, n: int):
+        return tuple(islice((costs for costs in value for _ in range(n)), self.k))
+
+
+class ViterbiSemiring(Semiring):
+    """
+    The semiring of the minimal edits costs with back-pointers, i.e. pairs of the costs and the family of the symbol
+    node that leads to a correction with these costs (-1 for none). For equal costs the first family is kept.
+    """
+
+    zero = (math.inf, -1)
+    one = (0, -1)
+    iterate_cycles = True
+
+    def plus(self, a, b):
+        return a if a[0] <= b[0] else b
+
+    def times(self, a, b):
+        return a[0] + b[0], -1
+
+    def get_edit_value(self, edit_operations: list, costs):
+        return costs, -1
+
+    def get_family_value(self, forest, family: int, value):
+        return value[0], family
+
+    def get_correction(self, forest, values: list, symbol: int = 0) -> list:
+        """
+        Follow the back-pointers from a symbol node to a correction with minimal edits costs.
+
+        :param forest: The frozen forest.
+        :param values: The values of the symbol nodes.
+        :param symbol: The symbol node to start from.
+        :return: The correction, i.e. a list of lists of edit operations.
+        """
+        if values[symbol][1] < 0:
+            raise Exception("There is no correction for the symbol node.")
+
+        correction = []
+        while symbol >= 0:
+            family = values[symbol][1]
+            if forest.family_edits[family] >= 0:
+                correction.append(forest.get_edit_operations(forest.family_edits[family]))
+            symbol = forest.family_symbols[family]
+        return correction
+
+
+class CostDistributionSemiring(Semiring):
+    """
+    The semiring of the polynomials sum(count * x^costs), i.e. dicts of the number of corrections for each costs.
+    """
+
+    zero = {}
+    one = {0: 1}
+
+    def plus(self, a, b):
+        result = dict(a)
+        for costs, number in b.items():
+            result[costs] = result.get(costs, 0) + number
+        return result
+
+    def times(self, a, b):
+        result = {}
+        for costs_a, number_a in a.items():
+            for costs_b, number_b in b.items():
+                result[costs_a + costs_b] = result.get(costs_a + costs_b, 0) + number_a * number_b
+        return result
+
+    def get_edit_value(self, edit_operations: list, costs):
+        return {costs: 1}
+
+    def scale(self, value, n: int):
+        return {costs: number * n for costs, number in value.items()}
+
+
+class EnumerationSemiring(Semiring):
+    """
+    The semiring of the lists of all corrections, each correction is a list of lists of edit operations.
+    """
+
+    zero = []
+    one = [[]]
+
+    def plus(self, a, b):
+        return a + b
+
+    def times(self, a, b):
+        return [edits_a + edits_b for edits_a in a for edits_b in b]
+
+    def get_edit_value(self, edit_operations: list, costs):
+        return [[edit_operations]]
+
+    def get_family_value(self, forest, family: int, value):
+        # Add the corrections of the interchangeable states
+        all_edits = value
+        for other_state in forest.interchangeable_states.get(family, ())[1:]:
+            all_edits = all_edits + [forest.swap_correction(family=family, correction=edits, other_state=other_state)
+                                     for edits in value]
+        return all_edits
@@ -0,0 +1,56 @@
+from wofa import FiniteAutomata
+from alcep_dfa.CompiledDFA import CompiledDFA
+
+
+class TargetLanguage:
+    """
+    The target language of an exercise, given by its minimal DFA. All preprocessing that depends only on the minimal
+    DFA is done once by TargetLanguage.compile: the checks of the minimal DFA, the order of the alphabet, the compiled
+    successor table with the final states and the start state, and the shortest words of the states. The object is
+    read-only and can be shared by the corrections of all submissions of the exercise.
+    """
+
+    def __init__(self, minimal_dfa: FiniteAutomata, alphabet: list, compiled_minimal_dfa: CompiledDFA):
+        """
+        Initialize a TargetLanguage, use TargetLanguage.compile to check and compile a minimal DFA.
+
+        :param minimal_dfa: The minimal DFA.
+        :param alphabet: The ordered alphabet.
+        :param compiled_minimal_dfa: The compiled minimal DFA over the alphabet.
+        """
+        self.minimal_dfa = minimal_dfa
+        self.alphabet = alphabet
+        self.compiled_minimal_dfa = compiled_minimal_dfa
+        [self.start_state] = compiled_minimal_dfa.initials
+
+        # The shortest word of each state and the state of each shortest word, used by the 1-to-1 mapping
+        self.shortest_words = compiled_minimal_dfa.get_shortest_words()
+        self.states_of_shortest_words = {word: state for state, word in self.shortest_words.items()}
+
+    @classmethod
+    def compile(cls, minimal_dfa: FiniteAutomata, alphabet=None) -> "TargetLanguage":
+        """
+        Check and compile a minimal DFA.
+
+        :param minimal_dfa: The target minimal DFA. We assume that this automaton is already minimized, otherwise the
+            results are not correct.
+        :param alphabet: The alphabet over which the DFA is defined. If None, it defaults to the alphabet of the
+            FiniteAutomata class.
+        :return: The compiled target language.
+        """
+        if not minimal_dfa.is_deterministic():
+            raise Exception("The minimal automata must be a DFA.")
+
+        # Check that the minimal dfa have for each state at least one outgoing transition
+        if not all(minimal_dfa.get_all_successors(s=q) for q in range(minimal_dfa.get_number_of_states())):
+            raise Exception("The minimal_dfa have a state without outgoing transitions.")
+
+        # Define an order on the alphabet
+        if alphabet is None:
+            alphabet = sorted(list(FiniteAutomata.get_alphabet()))
+
+        if not all(a in alphabet for _, a, _ in minimal_dfa.get_transitions()):
+            raise Exception("All letters in minimal_dfa must be in the alphabet.")
+
+        return cls(minimal_dfa=minimal_dfa, alphabet=alphabet,
+                   compiled_minimal_dfa=CompiledDFA(dfa=minimal_dfa, alphabet=alphabet))
@@ -1,7 +1,10 @@
 from .visitor import *
+from .engine import *
+from .semiring_visitor import *
+from .fused_visitor import *
 from .min_costs_computation_visitor import *
 from .shrink_to_minimal_corrections import *
 from .get_all_edits import *
-from .shrink_to_allowed_mappings import *
 from .shrink_to_minimal_dfa import *
+from .shrink_to_allowed_mappings import *
 from .get_number_of_corrections import *
@@ -0,0 +1,123 @@
+from array import array
+from alcep_dfa.FrozenForest import FrozenForest
+from .visitor import Visitor
+
+
+class Engine:
+    """
+    Evaluates visitors on a frozen SPPF. The topological order of the symbol nodes is computed once, the passes of
+    the visitors are flat loops over this order. Cycles of the SPPF are grouped into strongly connected components.
+    """
+
+    def __init__(self, forest: FrozenForest):
+        """
+        Initialize an Engine and compute the topological order of the given forest.
+
+        :param forest: The frozen forest.
+        """
+        self.forest = forest
+
+        # The symbol nodes ordered such that each symbol node follows the symbol nodes its families lead to, the
+        # offsets of the strongly connected components in that order and whether each component is a cycle
+        self.order = array('q')
+        self.component_offsets = array('q', [0])
+        self.is_cyclic = bytearray()
+        self.compute_topological_order()
+        self.has_cycles = any(self.is_cyclic)
+
+    def compute_topological_order(self):
+        """
+        Compute the topological order and the strongly connected components by Tarjan's algorithm. The algorithm is
+        iterative due to the limited stack size in python.
+        """
+        forest = self.forest
+        family_offsets, family_symbols = forest.family_offsets, forest.family_symbols
+
+        index_of_symbols = [-1] * forest.number_of_symbol_nodes
+        low_links = [0] * forest.number_of_symbol_nodes
+        on_stack = bytearray(forest.number_of_symbol_nodes)
+        has_self_loop = bytearray(forest.number_of_symbol_nodes)
+        stack = []
+        next_index = 0
+
+        for start in range(forest.number_of_symbol_nodes):
+            if index_of_symbols[start] >= 0:
+                continue
+
+            # Each entry of the call stack is a symbol node and the next family to consider.
+            call_stack = [(start, family_offsets[start])]
+            index_of_symbols[start] = low_links[start] = next_index
+            next_index += 1
+            stack.append(start)
+            on_stack[start] = 1
+
+            while call_stack:
+                symbol, family = call_stack[-1]
+                if family < family_offsets[symbol + 1]:
+                    call_stack[-1] = (symbol, family + 1)
+                    child = family_symbols[family]
+                    if child < 0:
+                        continue
+                    if index_of_symbols[child] < 0:
+                        index_of_symbols[child] = low_links[child] = next_index
+                        next_index += 1
+                        stack.append(child)
+                        on_stack[child] = 1
+                        call_stack.append((child, family_offsets[child]))
+                    elif on_stack[child]:
+                        low_links[symbol] = min(low_links[symbol], index_of_symbols[child])
+                        if child == symbol:
+                            has_self_loop[symbol] = 1
+                    continue
+
+                call_stack.pop()
+                if call_stack:
+                    parent = call_stack[-1][0]
+                    low_links[parent] = min(low_links[parent], low_links[symbol])
+
+                # Pop the strongly connected component of the symbol node
+                if low_links[symbol] == index_of_symbols[symbol]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        self.order.append(member)
+                        if member == symbol:
+                            break
+                    self.is_cyclic.append(len(self.order) - self.component_offsets[-1] > 1 or has_self_loop[symbol])
+                    self.component_offsets.append(len(self.order))
+
+    def visit_bottom_up(self, visitor: Visitor):
+        """
+        Visit the symbol nodes in topological order, i.e. each symbol node after the symbol nodes its families lead
+        to. The visitor is notified about each cycle before its symbol nodes are visited, and the symbol nodes of the
+        cycle are visited again until the results of the visitor are stable.
+
+        :param visitor: The visitor.
+        """
+        order, component_offsets = self.order, self.component_offsets
+        visit_symbol_node = visitor.visit_symbol_node
+
+        for component in range(len(component_offsets) - 1):
+            if not self.is_cyclic[component]:
+                visit_symbol_node(order[component_offsets[component]])
+                continue
+
+            symbols = order[component_offsets[component]:component_offsets[component + 1]]
+            visitor.on_cycle(symbols=symbols)
+
+            changed = True
+            while changed:
+                changed = False
+                for symbol in symbols:
+                    changed = visit_symbol_node(symbol) or changed
+
+    def visit_top_down(self, visitor: Visitor):
+        """
+        Visit the symbol nodes in reversed topological order, i.e. each symbol node before the symbol nodes its
+        families lead to.
+
+        :param visitor: The visitor.
+        """
+        visit_symbol_node = visitor.visit_symbol_node
+        for symbol in reversed(self.order):
+            visit_symbol_node(symbol)
@@ -0,0 +1,31 @@
+from .visitor import Visitor
+from alcep_dfa.FrozenForest import FrozenForest
+
+
+class FusedVisitor(Visitor):
+    """
+    Evaluates several visitors in a single pass, i.e. each symbol node is visited by all visitors before the next
+    symbol node is visited.
+    """
+
+    def __init__(self, forest: FrozenForest, visitors: list):
+        """
+        Initialize a FusedVisitor.
+
+        :param forest: The frozen forest.
+        :param visitors: The visitors of the forest to evaluate together.
+        """
+        super().__init__(forest=forest)
+        self.visitors = visitors
+        self.iterate_cycles = all(visitor.iterate_cycles for visitor in visitors)
+        self.visit_functions = [visitor.visit_symbol_node for visitor in visitors]
+
+    def on_cycle(self, symbols: list):
+        for visitor in self.visitors:
+            visitor.on_cycle(symbols=symbols)
+
+    def visit_symbol_node(self, symbol: int) -> bool:
+        changed = False
+        for visit_symbol_node in self.visit_functions:
+            changed = visit_symbol_node(symbol) or changed
+        return changed
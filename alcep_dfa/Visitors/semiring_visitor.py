@@ -0,0 +1,120 @@
+from .visitor import Visitor
+from alcep_dfa.FrozenForest import FrozenForest
+from alcep_dfa.Semirings import Semiring
+from alcep_dfa.Costs import EditCosts
+
+
+class SemiringVisitor(Visitor):
+    """
+    Evaluates a semiring bottom-up over a frozen SPPF. Every analysis that combines the values of the families of a
+    symbol node is a semiring, thus a new analysis only needs a semiring definition.
+    """
+
+    def __init__(self, forest: FrozenForest, semiring: Semiring, edit_costs: EditCosts | None = None,
+                 allowed_symbols: bytearray | None = None, edit_node_costs: list | None = None):
+        """
+        Initialize a SemiringVisitor.
+
+        :param forest: The frozen forest.
+        :param semiring: The semiring.
+        :param edit_costs: The costs of the edit operations, if the semiring depends on them.
+        :param allowed_symbols: If set, the symbol nodes that are not allowed have the value zero.
+        :param edit_node_costs: The costs of each edit node, if already computed, e.g. by get_profile_edit_costs.
+        """
+        super().__init__(forest=forest)
+        self.semiring = semiring
+        self.iterate_cycles = semiring.iterate_cycles
+        self.allowed_symbols = allowed_symbols
+
+        # The values of the edit nodes, the edit nodes are shared by the families, thus compute them only once
+        if edit_node_costs is None:
+            edit_node_costs = forest.get_edit_costs(edit_costs=edit_costs) if edit_costs is not None \
+                else [0] * forest.number_of_edits
+        self.edit_node_costs = edit_node_costs
+        self.edit_values = [semiring.get_edit_value(forest.get_edit_operations(edit), edit_node_costs[edit])
+                            for edit in range(forest.number_of_edits)]
+
+        # The side table of the values of the symbol nodes
+        self.values = [semiring.zero] * forest.number_of_symbol_nodes
+
+    def get_value(self, symbol: int):
+        """
+        Get the value of a visited symbol node.
+
+        :param symbol: The symbol node.
+        :return: The value of the symbol node.
+        """
+        return self.values[symbol]
+
+    def get_family_value(self, family: int):
+        """
+        Get the value of a family, i.e. of its edit node and of the symbol node it leads to.
+
+        :param family: The family.
+        :return: The value of the family.
+        """
+        child, edit = self.forest.family_symbols[family], self.forest.family_edits[family]
+        value = self.values[child] if child >= 0 else self.semiring.one
+        if edit >= 0:
+            value = self.semiring.times(self.edit_values[edit], value)
+        return self.semiring.get_family_value(self.forest, family, value)
+
+    def on_cycle(self, symbols: list):
+        if not self.iterate_cycles:
+            raise Exception("Cannot evaluate the semiring, due the presence of cycles in the graph.")
+        if self.semiring.requires_positive_cycles and self.has_cycle_without_costs(symbols=symbols):
+            raise Exception("Cannot evaluate the semiring, due the presence of cycles without edit costs in the graph.")
+
+    def has_cycle_without_costs(self, symbols: list) -> bool:
+        """
+        Check if the symbol nodes of a cycle contain a cycle of families without edit costs. The symbol nodes without
+        such a predecessor are removed repeatedly, the remaining symbol nodes form cycles without edit costs.
+
+        :param symbols: The symbol nodes of the cycle.
+        :return: True if there is a cycle without edit costs.
+        """
+        forest = self.forest
+        members = set(symbols)
+
+        # The successors of each symbol node over the families without edit costs within the cycle
+        successors = {symbol: [] for symbol in symbols}
+        number_of_predecessors = dict.fromkeys(symbols, 0)
+        for symbol in symbols:
+            for family in forest.get_families(symbol):
+                child, edit = forest.family_symbols[family], forest.family_edits[family]
+                if child in members and (edit < 0 or self.edit_node_costs[edit] == 0):
+                    successors[symbol].append(child)
+                    number_of_predecessors[child] += 1
+
+        stack = [symbol for symbol in symbols if number_of_predecessors[symbol] == 0]
+        number_of_removed = 0
+        while stack:
+            symbol = stack.pop()
+            number_of_removed += 1
+            for child in successors[symbol]:
+                number_of_predecessors[child] -= 1
+                if number_of_predecessors[child] == 0:
+                    stack.append(child)
+        return number_of_removed < len(symbols)
+
+    def visit_symbol_node(self, symbol: int) -> bool:
+        """
+        Visit a symbol node and calculate its value as the sum of the values of its families.
+
+        :param symbol: The symbol node to visit.
+        :return: True if the value of the symbol node changed.
+        """
+        value = self.semiring.zero
+        if self.allowed_symbols is None or self.allowed_symbols[symbol]:
+            for family in self.forest.get_families(symbol):
+                value = self.semiring.plus(value, self.get_family_value(family=family))
+
+        # Only the values of a cycle can change after the first visit
+        if not self.iterate_cycles:
+            self.values[symbol] = value
+            return False
+
+        if value != self.values[symbol]:
+            self.values[symbol] = value
+            return True
+        return False
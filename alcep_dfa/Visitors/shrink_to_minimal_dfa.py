@@ -1,56 +1,29 @@
-from .visitor import Visitor
-from alcep_dfa.Nodes import SymbolNode, EditNode, EndNode, PackedNode, ForestNode
+from .semiring_visitor import SemiringVisitor
+from alcep_dfa.FrozenForest import FrozenForest
+from alcep_dfa.Semirings import BooleanSemiring
 
 
-class ShrinkToMinimalDFAs(Visitor):
+class ShrinkToMinimalDFAs(SemiringVisitor):
 
-    def visit_packed_node_in(self, node: PackedNode):
-        yield node.left_node
-        yield node.right_node
+    def __init__(self, forest: FrozenForest, contained_in_cor_to_minial_dfa: bytearray | None = None):
+        # The symbol nodes that may be contained in a correction to the minimal DFA. A symbol node is contained if it
+        # may be contained and one of its families ends the correction or leads to a contained symbol node.
+        super().__init__(forest=forest, semiring=BooleanSemiring(), allowed_symbols=contained_in_cor_to_minial_dfa)
 
-    def visit_symbol_node_in(self, node: SymbolNode):
-        contained_in = node.get_contained_in_cor_to_minial_dfa()
-        if contained_in is None:
-            node.set_contained_in_cor_to_minial_dfa(True)
-            return iter(node.get_children())
+    def get_forest(self) -> FrozenForest:
+        """
+        Get the forest restricted to the contained symbol nodes. If no correction remains, the forest is left
+        unchanged.
 
-    def visit_packed_node_out(self, node: PackedNode):
-        left_in_min = True
-        right_in_min = True
+        :return: The restricted forest.
+        """
+        if not self.values[0]:
+            return self.forest
 
-        if node.left_node:
-            match node.left_node:
-                case SymbolNode():
-                    left_in_min = node.left_node.get_contained_in_cor_to_minial_dfa()
-                case EditNode():
-                    left_in_min = True
-                case EndNode():
-                    left_in_min = True
-                case _:
-                    raise Exception("Unexpected node type.")
+        kept_families = bytearray(self.forest.number_of_families)
+        for symbol in range(self.forest.number_of_symbol_nodes):
+            if self.values[symbol]:
+                for family in self.forest.get_families(symbol):
+                    kept_families[family] = self.get_family_value(family=family)
 
-        if node.right_node:
-            match node.right_node:
-                case SymbolNode():
-                    right_in_min = node.right_node.get_contained_in_cor_to_minial_dfa()
-                case EditNode():
-                    right_in_min = True
-                case EndNode():
-                    right_in_min = True
-                case _:
-                    raise Exception("Unexpected node type.")
-
-        node.set_contained_in_cor_to_minial_dfa(left_in_min and right_in_min)
-
-    def visit_symbol_node_out(self, node: SymbolNode):
-        contained_in = node.get_contained_in_cor_to_minial_dfa()
-        if contained_in:
-            new_children = set()
-            for child in node.get_children():
-                if child.get_contained_in_cor_to_minial_dfa():
-                    new_children.add(child)
-
-            if new_children:
-                node.set_children(new_children)
-            else:
-                node.set_contained_in_cor_to_minial_dfa(False)
+        return self.forest.restrict(kept_families=kept_families)
@@ -0,0 +1,174 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+
+FIFO = "fifo"
+LIFO = "lifo"
+COSTS = "costs"
+STATES = "states"
+
+
+class Worklist(ABC):
+    """
+    A worklist of the nodes that still have to be considered in the construction of the SPPF. The construction is
+    single-threaded, therefore the worklists are not synchronized. Each worklist records statistics about the size of
+    its frontier.
+    """
+
+    # The priority the items are ordered by (COSTS or STATES) or None if the worklist ignores the priorities.
+    order = None
+
+    def __init__(self):
+        self.number_of_puts = 0
+        self.number_of_gets = 0
+        self.max_size = 0
+
+    def put(self, item, priority=0):
+        """
+        Add an item to the worklist.
+
+        :param item: The item.
+        :param priority: The priority of the item. Only used by the PriorityWorklist.
+        """
+        self._put(item=item, priority=priority)
+        self.number_of_puts += 1
+        self.max_size = max(self.max_size, len(self))
+
+    def get(self):
+        """
+        Remove and return the next item of the worklist.
+
+        :return: The next item.
+        """
+        self.number_of_gets += 1
+        return self._get()
+
+    def empty(self) -> bool:
+        """
+        Check if the worklist is empty.
+
+        :return: True if the worklist contains no item.
+        """
+        return len(self) == 0
+
+    def get_statistics(self) -> dict:
+        """
+        Get the statistics about the frontier of the worklist.
+
+        :return: A dict with the number of added and removed items and the maximal size of the frontier.
+        """
+        return {"number_of_puts": self.number_of_puts,
+                "number_of_gets": self.number_of_gets,
+                "max_size": self.max_size}
+
+    @abstractmethod
+    def _put(self, item, priority):
+        """
+        Add an item to the frontier of the worklist.
+
+        :param item: The item.
+        :param priority: The priority of the item.
+        """
+
+    @abstractmethod
+    def _get(self):
+        """
+        Remove and return the next item of the frontier of the worklist.
+
+        :return: The item.
+        """
+
+    @abstractmethod
+    def __len__(self):
+        """
+        Get the size of the frontier of the worklist.
+
+        :return: The number of items.
+        """
+
+
+class FIFOWorklist(Worklist):
+    """
+    A worklist that returns the items in the order they were added (breadth-first).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.items = deque()
+
+    def _put(self, item, priority):
+        self.items.append(item)
+
+    def _get(self):
+        return self.items.popleft()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class LIFOWorklist(Worklist):
+    """
+    A worklist that returns the last added item first (depth-first), which usually keeps the frontier small.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.items = []
+
+    def _put(self, item, priority):
+        self.items.append(item)
+
+    def _get(self):
+        return self.items.pop()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class PriorityWorklist(Worklist):
+    """
+    A worklist that returns the item with the smallest priority first. Items with the same priority are returned in
+    the order they were added.
+    """
+
+    def __init__(self, order: str = COSTS):
+        """
+        Initialize a PriorityWorklist.
+
+        :param order: The priority the items are ordered by: COSTS for the costs to reach a node or STATES for the key
+            of the status of the parse process.
+        """
+        super().__init__()
+        if order not in (COSTS, STATES):
+            raise Exception("Unknown order of the priority worklist: " + str(order))
+        self.order = order
+        self.items = []
+        self.tie_breaker = count()
+
+    def _put(self, item, priority):
+        heappush(self.items, (priority, next(self.tie_breaker), item))
+
+    def _get(self):
+        return heappop(self.items)[2]
+
+    def __len__(self):
+        return len(self.items)
+
+
+def create_worklist(strategy: str) -> Worklist:
+    """
+    Create a new worklist for the given strategy.
+
+    :param strategy: FIFO, LIFO, COSTS or STATES.
+    :return: The worklist.
+    """
+    match strategy:
+        case "fifo":
+            return FIFOWorklist()
+        case "lifo":
+            return LIFOWorklist()
+        case "costs" | "states":
+            return PriorityWorklist(order=strategy)
+        case _:
+            raise Exception("Unknown worklist strategy: " + str(strategy))
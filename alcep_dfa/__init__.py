@@ -1,4 +1,14 @@
+from .Costs import *
+from .CompiledDFA import *
+from .TargetLanguage import *
+from .Worklists import *
+from .Limits import *
 from .AllDFACorrections import *
+from .FrozenForest import *
+from .ForestStorage import *
+from .Semirings import *
 from .Constants import *
 from .Corrections import *
+from .CorrectionCache import *
+from .BatchCorrection import *
 from .ApplyCorrection import *
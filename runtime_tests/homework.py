@@ -1,10 +1,8 @@
 from collections import defaultdict
-from multiprocessing import Process, Queue
 from pathlib import Path
 from statistics import mean
-from time import perf_counter
 from wofa import get_solution, FiniteAutomata, SubmissionIterator
-from alcep_dfa import Correction
+from alcep_dfa import TargetLanguage, correct_many, CORRECTED, NO_CORRECTION, TIMEOUT, LIMIT_EXHAUSTED
 
 import matplotlib
 import matplotlib.pyplot as plt
@@ -14,39 +12,6 @@ matplotlib.use("Agg")
 CORRECTION_TIMEOUT_SECONDS = 180
 
 
-def run_correction_worker(to_correct, solution, result_queue: Queue) -> None:
-    # Run the correction computation in a separate process so it can be terminated on timeout.
-    try:
-        FiniteAutomata.set_alphabet(solution.calc_and_get_alphabet())
-        Correction(to_correct=to_correct, minimal_dfa=solution)
-        result_queue.put(("ok", None))
-    except Exception as exc:
-        result_queue.put(("error", repr(exc)))
-
-
-def run_correction_with_timeout(to_correct, minimal_dfa, timeout_seconds: int) -> tuple[bool, str | None]:
-    # Start a subprocess for the correction computation and stop it if the timeout is exceeded.
-    result_queue = Queue()
-    process = Process(target=run_correction_worker, args=(to_correct, minimal_dfa, result_queue))
-    process.start()
-    process.join(timeout_seconds)
-
-    if process.is_alive():
-        process.terminate()
-        process.join()
-        return False, "timeout"
-
-    if not result_queue.empty():
-        status, message = result_queue.get()
-        if status == "ok":
-            return True, None
-        return False, message
-
-    return False, "worker terminated without result"
-
-
-
-
 def format_duration(seconds: float) -> str:
     # Format durations with a readable unit depending on their magnitude.
     if seconds < 0.001:
@@ -164,8 +129,10 @@ if __name__ == '__main__':
     failed_corrections = 0
     # Count submissions that could not be parsed into an automaton.
     non_parseable = 0
-    # Count how many correction computations have been started.
-    correction_index = 0
+    # Store the memory usage of each computed forest.
+    memory_usages = []
+    # Collect the incorrect DFAs, which are corrected together in a pool of worker processes.
+    incorrect_dfas = []
     # Load the reference solution for the selected exercise.
     solution = get_solution(exercise=task)
     # Use the solution alphabet as the global alphabet for parsed automata.
@@ -195,42 +162,9 @@ if __name__ == '__main__':
                     correct_non_dfa += 1
             else:
                 if is_dfa:
-                    # Count incorrect DFAs and measure how long the correction computation takes.
+                    # Count incorrect DFAs and collect them for the batch correction.
                     incorrect_dfa += 1
-                    correction_index += 1
-                    state_count = sub.get_number_of_states()
-                    print(
-                        f"[Correction {correction_index}] Starting correction computation "
-                        f"for DFA with {state_count} states..."
-                    )
-                    start_time = perf_counter()
-                    completed, error_message = run_correction_with_timeout(
-                        to_correct=sub,
-                        minimal_dfa=solution,
-                        timeout_seconds=CORRECTION_TIMEOUT_SECONDS,
-                    )
-                    end_time = perf_counter()
-                    runtime = end_time - start_time
-                    if completed:
-                        runtimes.append(runtime)
-                        runtime_records.append((state_count, runtime))
-                        runtimes_by_state_count[state_count].append(runtime)
-                        print(
-                            f"[Correction {correction_index}] States: {state_count} | "
-                            f"Runtime: {format_duration(runtime)}"
-                        )
-                    elif error_message == "timeout":
-                        aborted_corrections += 1
-                        print(
-                            f"[Correction {correction_index}] States: {state_count} | "
-                            f"Aborted after {format_duration(runtime)}"
-                        )
-                    else:
-                        failed_corrections += 1
-                        print(
-                            f"[Correction {correction_index}] States: {state_count} | "
-                            f"Failed after {format_duration(runtime)} | {error_message}"
-                        )
+                    incorrect_dfas.append(sub)
                 else:
                     # Count incorrect submissions that are not DFAs.
                     incorrect_non_dfa += 1
@@ -239,6 +173,40 @@ if __name__ == '__main__':
             # Track submissions that are not parseable.
             non_parseable += 1
 
+    # Compile the target language once and correct all incorrect DFAs in a pool of long-lived worker processes.
+    # The results arrive as soon as each correction is finished. The constructions stop cooperatively at the time
+    # limit, a worker is only terminated if it does not stop in time.
+    target = TargetLanguage.compile(minimal_dfa=solution)
+    for correction_index, (index, result) in enumerate(
+            correct_many(submissions=incorrect_dfas, target=target, timeout=2 * CORRECTION_TIMEOUT_SECONDS,
+                         time_limit=CORRECTION_TIMEOUT_SECONDS), start=1):
+        state_count = incorrect_dfas[index].get_number_of_states()
+        runtime = result["runtime"]
+        if result["status"] in (CORRECTED, NO_CORRECTION):
+            if result["status"] == CORRECTED:
+                memory_usages.append(result["memory_usage"])
+            # Report only the construction of the forest, not the analyses of the summary.
+            runtime = result["construction_runtime"]
+            runtimes.append(runtime)
+            runtime_records.append((state_count, runtime))
+            runtimes_by_state_count[state_count].append(runtime)
+            print(
+                f"[Correction {correction_index}] States: {state_count} | "
+                f"Runtime: {format_duration(runtime)}"
+            )
+        elif result["status"] in (TIMEOUT, LIMIT_EXHAUSTED):
+            aborted_corrections += 1
+            print(
+                f"[Correction {correction_index}] States: {state_count} | "
+                f"Aborted after {format_duration(runtime)}"
+            )
+        else:
+            failed_corrections += 1
+            print(
+                f"[Correction {correction_index}] States: {state_count} | "
+                f"Failed after {format_duration(runtime)} | {result['error']}"
+            )
+
     # Compute the total number of processed submissions.
     correct = correct_dfa + correct_non_dfa
     incorrect = incorrect_dfa + incorrect_non_dfa
@@ -270,6 +238,16 @@ if __name__ == '__main__':
         print(f"  Failed corrections:     {failed_corrections / total:.2%}")
         print(f"  Not parseable:          {non_parseable / total:.2%}")
 
+    # Print the memory usage of the computed forests.
+    print("Forest memory statistics")
+    if memory_usages:
+        number_of_nodes = sum(memory_usage["number_of_nodes"] for memory_usage in memory_usages)
+        number_of_bytes = sum(memory_usage["number_of_bytes"] for memory_usage in memory_usages)
+        print(f"  Number of nodes:        {number_of_nodes}")
+        print(f"  Bytes per node:         {number_of_bytes / number_of_nodes:.1f}")
+    else:
+        print("  No forests were measured.")
+
     # Print summary statistics for the measured correction runtimes.
     print("Correction runtime statistics")
     if runtimes:
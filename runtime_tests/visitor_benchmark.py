@@ -0,0 +1,222 @@
+from collections import deque
+from statistics import mean
+from time import perf_counter
+from wofa import get_solution, FiniteAutomata, SubmissionIterator
+from alcep_dfa import Correction
+from alcep_dfa.Nodes import SymbolNode, EditNode, EndNode, PackedNode, ForestNode
+from alcep_dfa.Visitors import Engine, MinCostsComputationVisitor, GetNumberOfCorrectionsVisitor
+
+
+# The number of repetitions of each measurement, the minimum is reported.
+REPETITIONS = 5
+
+
+class GeneratorVisitor:
+    """
+    The former generator-driven traversal of the object graph of the SPPF (taken from the Lark Parser), kept here as
+    the reference of the benchmark. Nodes are not memoised, thus a node shared by many parents is walked again each
+    time.
+    """
+
+    def visit_packed_node_in(self, node: PackedNode):
+        yield node.left_node
+        yield node.right_node
+
+    def visit_symbol_node_in(self, node: SymbolNode):
+        return iter(node.get_children())
+
+    def visit_packed_node_out(self, node: PackedNode):
+        pass
+
+    def visit_symbol_node_out(self, node: SymbolNode):
+        pass
+
+    def visit_edit_node(self, node: EditNode):
+        pass
+
+    def visit_end_node(self, node: EndNode):
+        pass
+
+    def on_cycle(self, node: ForestNode, path: list):
+        pass
+
+    def visit(self, root_node: SymbolNode):
+        visiting = set()
+        path = []
+        input_stack = deque([root_node])
+
+        while input_stack:
+            current = next(reversed(input_stack))
+            try:
+                next_node = next(current)
+            except StopIteration:
+                input_stack.pop()
+                continue
+            except TypeError:
+                pass
+            else:
+                if next_node is None:
+                    continue
+                if id(next_node) in visiting:
+                    self.on_cycle(next_node, path)
+                    continue
+                input_stack.append(next_node)
+                continue
+
+            if isinstance(current, EditNode):
+                self.visit_edit_node(current)
+                input_stack.pop()
+                continue
+            elif isinstance(current, EndNode):
+                self.visit_end_node(current)
+                input_stack.pop()
+                continue
+
+            current_id = id(current)
+            if current_id in visiting:
+                if isinstance(current, PackedNode):
+                    self.visit_packed_node_out(current)
+                else:
+                    self.visit_symbol_node_out(current)
+                input_stack.pop()
+                path.pop()
+                visiting.remove(current_id)
+            else:
+                visiting.add(current_id)
+                path.append(current)
+                if isinstance(current, PackedNode):
+                    next_node = self.visit_packed_node_in(current)
+                else:
+                    next_node = self.visit_symbol_node_in(current)
+                if next_node is None:
+                    continue
+                if not isinstance(next_node, ForestNode):
+                    next_node = iter(next_node)
+                elif id(next_node) in visiting:
+                    self.on_cycle(next_node, path)
+                    continue
+                input_stack.append(next_node)
+
+
+class GeneratorMinCostsVisitor(GeneratorVisitor):
+
+    def __init__(self, edit_costs):
+        self.edit_costs = edit_costs
+        self.minimal_edits_costs = {}
+
+    def visit_packed_node_out(self, node: PackedNode):
+        if node.left_node is None:
+            if node.right_node in self.minimal_edits_costs:
+                self.minimal_edits_costs[node] = self.minimal_edits_costs[node.right_node]
+        elif node.left_node in self.minimal_edits_costs:
+            self.minimal_edits_costs[node] = self.minimal_edits_costs[node.left_node] + \
+                                             self.minimal_edits_costs[node.right_node]
+
+    def visit_symbol_node_out(self, node: SymbolNode):
+        children_costs = [self.minimal_edits_costs[child] for child in node.get_children()
+                          if child in self.minimal_edits_costs]
+        if children_costs:
+            self.minimal_edits_costs[node] = min(children_costs)
+
+    def visit_end_node(self, node: EndNode):
+        self.minimal_edits_costs[node] = 0
+
+    def visit_edit_node(self, node: EditNode):
+        self.minimal_edits_costs[node] = self.edit_costs.get_costs(edit_operations=node.get_edit_operations())
+
+
+class GeneratorNumberOfCorrectionsVisitor(GeneratorVisitor):
+
+    def __init__(self):
+        self.number_of_corrections = {}
+
+    def visit_packed_node_out(self, node: PackedNode):
+        if node.left_node is None:
+            self.number_of_corrections[node] = self.number_of_corrections[node.right_node]
+        else:
+            self.number_of_corrections[node] = (self.number_of_corrections[node.left_node]
+                                                * self.number_of_corrections[node.right_node]
+                                                * node.get_multiplicity())
+
+    def visit_symbol_node_out(self, node: SymbolNode):
+        self.number_of_corrections[node] = sum(self.number_of_corrections[child] for child in node.get_children())
+
+    def visit_end_node(self, node: EndNode):
+        self.number_of_corrections[node] = 1
+
+    def visit_edit_node(self, node: EditNode):
+        self.number_of_corrections[node] = 1
+
+
+def measure(function) -> float:
+    # Return the best runtime of the function over all repetitions.
+    runtimes = []
+    for _ in range(REPETITIONS):
+        start_time = perf_counter()
+        function()
+        runtimes.append(perf_counter() - start_time)
+    return min(runtimes)
+
+
+def benchmark(correction: Correction) -> tuple[float, float, float, float]:
+    # Compare the minimal edits costs on the complete SPPF and the number of corrections on the minimal SPPF.
+    root_node = correction.root_node
+
+    def generator_min_costs():
+        GeneratorMinCostsVisitor(edit_costs=correction.edit_costs).visit(root_node=root_node)
+
+    def engine_min_costs():
+        Engine(forest=correction.forest).visit_bottom_up(
+            visitor=MinCostsComputationVisitor(forest=correction.forest, edit_costs=correction.edit_costs))
+
+    generator_min_costs_runtime = measure(generator_min_costs)
+    engine_min_costs_runtime = measure(engine_min_costs)
+
+    correction.shrink_to_minimal_edits()
+    minimal_root_node = correction.root_node
+
+    def generator_count():
+        GeneratorNumberOfCorrectionsVisitor().visit(root_node=minimal_root_node)
+
+    def engine_count():
+        Engine(forest=correction.forest).visit_bottom_up(visitor=GetNumberOfCorrectionsVisitor(forest=correction.forest))
+
+    return generator_min_costs_runtime, engine_min_costs_runtime, measure(generator_count), measure(engine_count)
+
+
+if __name__ == '__main__':
+    # Select the exercise for which submissions should be evaluated.
+    task = 'A'
+
+    solution = get_solution(exercise=task)
+    FiniteAutomata.set_alphabet(solution.calc_and_get_alphabet())
+    solution.minimize()
+    if not solution.is_deterministic():
+        solution = solution.determine()
+
+    # Store the runtimes of both evaluations for each incorrect DFA submission.
+    records = []
+    for sub in SubmissionIterator(task=task):
+        if not sub:
+            continue
+        sub.remove_non_alphabet_transitions()
+        if not sub.is_deterministic() or solution.equivalence_test(other=sub):
+            continue
+
+        correction = Correction(to_correct=sub, minimal_dfa=solution)
+        if correction.forest is None:
+            continue
+
+        records.append(benchmark(correction=correction))
+        generator_min_costs, engine_min_costs, generator_count, engine_count = records[-1]
+        print(f"[Benchmark {len(records)}] States: {sub.get_number_of_states()} | "
+              f"Minimal costs: {generator_min_costs * 1_000:.2f} ms -> {engine_min_costs * 1_000:.2f} ms | "
+              f"Number of corrections: {generator_count * 1_000:.2f} ms -> {engine_count * 1_000:.2f} ms")
+
+    if records:
+        print("Visitor benchmark (generator visitor -> engine)")
+        for index, name in [(0, "Minimal costs"), (2, "Number of corrections")]:
+            generator_runtime = mean(record[index] for record in records)
+            engine_runtime = mean(record[index + 1] for record in records)
+            print(f"  {name + ':':24}{generator_runtime * 1_000:.2f} ms -> {engine_runtime * 1_000:.2f} ms "
+                  f"(speedup {generator_runtime / engine_runtime:.1f}x)")
@@ -1,35 +1,340 @@
+import os
+import random
+import tempfile
+import time
 import unittest
+from itertools import islice
 from wofa import get_solution, FiniteAutomata
-from alcep_dfa import all_dfa_corrections, get_random_correction, apply_correction
+from alcep_dfa import apply_correction, Correction, CorrectionCache, freeze_forest, \
+    KBestSemiring, CostDistributionSemiring, CountingSemiring, MINIMAL_EDIT_COSTS, NUMBER_OF_CORRECTIONS, \
+    NUMBER_OF_MINIMAL_CORRECTIONS, TargetLanguage, correct_many, CORRECTED, \
+    DEADLINE, MAX_NODES
 
 
 class TestALCEPDFA(unittest.TestCase):
 
-    def test(self):
-        # Get the minimal DFA from exercise "A"
-        minimal_dfa = get_solution(exercise="A")
-
-        # Set the alphabet for the FiniteAutomata class
-        FiniteAutomata.set_alphabet(sigma=minimal_dfa.calc_and_get_alphabet())
-
-        # Minimize the DFA
-        minimal_dfa.minimize()
+    def setUp(self):
+        # Get the minimal DFA from exercise "A", set the alphabet for the FiniteAutomata class and minimize the DFA
+        self.minimal_dfa = get_solution(exercise="A")
+        FiniteAutomata.set_alphabet(sigma=self.minimal_dfa.calc_and_get_alphabet())
+        self.minimal_dfa.minimize()
 
         # Define a DFA to be corrected
-        to_correct = FiniteAutomata({0}, [(0, 'a', 1), (1, '0', 0), (1, 'a', 2)], {1})
+        self.to_correct = FiniteAutomata({0}, [(0, 'a', 1), (1, '0', 0), (1, 'a', 2)], {1})
+
+    def test(self):
+        # Compute all corrections, the complete SPPF contains cycles and thus cannot be sampled uniformly
+        all_corrections = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa)
+        self.assertTrue(all_corrections.engine.has_cycles)
+        self.assertRaises(Exception, all_corrections.sample, n=1)
 
-        # Compute all corrections
-        root_node = all_dfa_corrections(to_correct=to_correct, minimal_dfa=minimal_dfa)
+        # Compute the corrections with at most three more than the minimal edit costs
+        minimal_costs = all_corrections.get_minimal_edit_costs()
+        corrections = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, max_cost=minimal_costs + 3)
 
         # Get different random corrections and check that the application leads
         # to an automaton equivalent to the minimal DFA
-        for _ in range(100):
-
-            # Get a random correction
-            correction = get_random_correction(root_node=root_node)
+        for correction in corrections.sample(n=100, rng=random.Random(0)):
 
             # Apply the correction to the to correct DFA and iterate over all resulting automata
-            for corrected_automata in apply_correction(to_correct=to_correct, correction=correction):
+            for corrected_automata in apply_correction(to_correct=self.to_correct, correction=correction):
 
                 # Check for each resulting automaton that it is equivalent to the minimal DFA
-                self.assertTrue(corrected_automata.equivalence_test(other=minimal_dfa))
+                self.assertTrue(corrected_automata.equivalence_test(other=self.minimal_dfa))
+
+    def test_only_minimal(self):
+        # Shrink the complete SPPF to the minimal corrections
+        all_corrections = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa)
+        all_corrections.shrink_to_minimal_edits()
+
+        # Construct only the minimal corrections best-first
+        minimal_corrections = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, only_minimal=True)
+
+        # Check that both SPPFs represent the same corrections
+        self.assertEqual(all_corrections.get_minimal_edit_costs(), minimal_corrections.get_minimal_edit_costs())
+        self.assertEqual(sorted(repr(correction) for correction in all_corrections.get_all_corrections()),
+                         sorted(repr(correction) for correction in minimal_corrections.get_all_corrections()))
+
+    def test_max_cost(self):
+        # Compute the minimal corrections
+        minimal_corrections = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, only_minimal=True)
+        minimal_costs = minimal_corrections.get_minimal_edit_costs()
+
+        # With a budget below the minimal costs, there is no correction
+        self.assertIsNone(Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                     max_cost=minimal_costs - 1).root_node)
+
+        # With the minimal costs as budget, exactly the minimal corrections remain
+        budget_corrections = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                        max_cost=minimal_costs)
+        self.assertEqual(sorted(repr(correction) for correction in minimal_corrections.get_all_corrections()),
+                         sorted(repr(correction) for correction in budget_corrections.get_all_corrections()))
+
+    def test_worklists(self):
+        minimal_costs = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                   only_minimal=True).get_minimal_edit_costs()
+
+        # Check that all worklist strategies construct the same corrections
+        corrections = []
+        for strategy in ["fifo", "lifo", "costs", "states"]:
+            correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, max_cost=minimal_costs,
+                                    worklist=strategy)
+            corrections.append(sorted(repr(edits) for edits in correction.get_all_corrections()))
+
+            statistics = correction.worklist.get_statistics()
+            self.assertEqual(statistics["number_of_puts"], statistics["number_of_gets"])
+            self.assertLessEqual(statistics["max_size"], statistics["number_of_puts"])
+
+        self.assertTrue(all(other == corrections[0] for other in corrections))
+
+    def test_symmetry_reduction(self):
+        # Define a DFA to be corrected with the two interchangeable unreachable states 3 and 4
+        to_correct = FiniteAutomata({0}, [(0, 'a', 1), (1, '0', 0), (1, 'a', 2), (3, 'a', 0), (4, 'a', 0)], {1})
+
+        # Check that the symmetry reduction represents the same corrections
+        corrections = Correction(to_correct=to_correct, minimal_dfa=self.minimal_dfa, only_minimal=True)
+        reduced_corrections = Correction(to_correct=to_correct, minimal_dfa=self.minimal_dfa, only_minimal=True,
+                                         symmetry_reduction=True)
+
+        self.assertEqual(corrections.get_number_of_corrections(), reduced_corrections.get_number_of_corrections())
+        self.assertEqual(sorted(sorted(repr(edits) for edits in correction)
+                                for correction in corrections.get_all_corrections()),
+                         sorted(sorted(repr(edits) for edits in correction)
+                                for correction in reduced_corrections.get_all_corrections()))
+
+    def test_frozen_forest(self):
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, only_minimal=True)
+
+        # Check that freezing the rebuilt object graph results in the same arrays
+        forest = freeze_forest(root_node=correction.root_node)
+        self.assertEqual(forest.family_offsets, correction.forest.family_offsets)
+        self.assertEqual(forest.family_symbols, correction.forest.family_symbols)
+        self.assertEqual(forest.family_edits, correction.forest.family_edits)
+        self.assertEqual(forest.keys, correction.forest.keys)
+
+    def test_semirings(self):
+        minimal_costs = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                   only_minimal=True).get_minimal_edit_costs()
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, max_cost=minimal_costs + 1)
+
+        # Check that the semirings agree with the costs of the enumerated corrections
+        all_costs = sorted(correction.edit_costs.get_costs(edit_operations=[edit_operation for edits in corrections
+                                                                             for edit_operation in edits])
+                           for corrections in correction.get_all_corrections())
+        self.assertEqual(list(correction.evaluate(semiring=KBestSemiring(k=3))), all_costs[:3])
+        self.assertEqual(correction.evaluate(semiring=CostDistributionSemiring()),
+                         {costs: all_costs.count(costs) for costs in set(all_costs)})
+        self.assertEqual(correction.evaluate(semiring=CountingSemiring()), correction.get_number_of_corrections())
+
+    def test_analyze(self):
+        minimal_costs = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                   only_minimal=True).get_minimal_edit_costs()
+
+        # Check that the fused analyses agree with the single analyses
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, max_cost=minimal_costs + 1)
+        results = correction.analyze(analyses=[MINIMAL_EDIT_COSTS, NUMBER_OF_CORRECTIONS,
+                                               NUMBER_OF_MINIMAL_CORRECTIONS])
+        self.assertEqual(results[MINIMAL_EDIT_COSTS], minimal_costs)
+        self.assertEqual(results[NUMBER_OF_CORRECTIONS], correction.get_number_of_corrections())
+
+        correction.shrink_to_minimal_edits()
+        self.assertEqual(results[NUMBER_OF_MINIMAL_CORRECTIONS], correction.get_number_of_corrections())
+
+        # Check that the minimal corrections are also counted in the complete SPPF with cycles
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa)
+        self.assertTrue(correction.engine.has_cycles)
+        results = correction.analyze(analyses=[MINIMAL_EDIT_COSTS, NUMBER_OF_MINIMAL_CORRECTIONS])
+        self.assertEqual(results[MINIMAL_EDIT_COSTS], minimal_costs)
+
+        correction.shrink_to_minimal_edits()
+        self.assertEqual(results[NUMBER_OF_MINIMAL_CORRECTIONS], correction.get_number_of_corrections())
+
+        # Check that a cycle without edit costs is rejected, since its number of corrections is infinite
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, costs_add_transition=0)
+        self.assertRaises(Exception, correction.analyze, analyses=[NUMBER_OF_MINIMAL_CORRECTIONS])
+
+    def test_iter_corrections(self):
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, only_minimal=True)
+
+        # Check that the lazy enumeration yields the corrections in the same order
+        all_corrections = correction.get_all_corrections()
+        self.assertEqual(repr(list(correction.iter_corrections())), repr(all_corrections))
+        self.assertEqual(repr(list(islice(correction.iter_corrections(), 1))), repr(all_corrections[:1]))
+
+    def test_k_best(self):
+        minimal_costs = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                   only_minimal=True).get_minimal_edit_costs()
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, max_cost=minimal_costs + 1)
+
+        # Check that the k best corrections are the first corrections stably sorted by their costs
+        def get_costs(edits):
+            return correction.edit_costs.get_costs(edit_operations=[edit_operation for edit_operations in edits
+                                                                    for edit_operation in edit_operations])
+
+        sorted_corrections = sorted(correction.get_all_corrections(), key=get_costs)
+        self.assertEqual(repr(correction.k_best(k=5)),
+                         repr([(get_costs(edits), edits) for edits in sorted_corrections[:5]]))
+
+    def test_sample(self):
+        minimal_costs = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                   only_minimal=True).get_minimal_edit_costs()
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, max_cost=minimal_costs + 1)
+
+        # Check that the samples are corrections of the SPPF and that they are reproducible with the same seed
+        all_corrections = {repr(edits) for edits in correction.get_all_corrections()}
+        samples = [repr(edits) for edits in correction.sample(n=200, rng=random.Random(42))]
+        self.assertTrue(set(samples) <= all_corrections)
+        self.assertEqual(samples, [repr(edits) for edits in correction.sample(n=200, rng=random.Random(42))])
+
+    def test_rank(self):
+        minimal_costs = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                   only_minimal=True).get_minimal_edit_costs()
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, max_cost=minimal_costs + 1,
+                                symmetry_reduction=True)
+
+        # Check that the corrections are ranked in the order of get_all_corrections
+        for index, edits in enumerate(correction.get_all_corrections()):
+            self.assertEqual(repr(correction.correction_at(index=index)), repr(edits))
+            self.assertEqual(correction.index_of(correction=edits), index)
+
+    def test_parallel_map(self):
+        minimal_costs = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                   only_minimal=True).get_minimal_edit_costs()
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, max_cost=minimal_costs + 1)
+
+        # Check that the results of the workers are yielded in the order of the corrections
+        self.assertEqual(list(correction.parallel_map(function=len, workers=2, chunk_size=3)),
+                         [len(edits) for edits in correction.get_all_corrections()])
+
+    def test_profiles(self):
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa)
+
+        # Check that the minimal costs of each profile are the minimal costs of a correction with these costs
+        profiles = [[1, 1, 0, 0, 1, 1, 1, 1, 0], [2, 1, 0, 0, 1, 3, 3, 1, 1], [1, 2, 0, 1, 1, 1, 1, 2, 0]]
+        for profile, minimal_costs in zip(profiles, correction.get_profiles_minimal_edit_costs(profiles=profiles)):
+            profile_correction = Correction(self.to_correct, self.minimal_dfa, None, *profile)
+            self.assertEqual(profile_correction.get_minimal_edit_costs(), minimal_costs)
+
+        # Check that the costs profiles are rejected for an SPPF that is bounded by the edit costs or shrunk
+        minimal_correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, only_minimal=True)
+        budget_correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                       max_cost=minimal_correction.get_minimal_edit_costs() + 1)
+        correction.shrink_to_minimal_edits()
+        for bounded_correction in [minimal_correction, budget_correction, correction]:
+            self.assertFalse(bounded_correction.is_complete)
+            self.assertRaises(Exception, bounded_correction.get_profiles_minimal_edit_costs, profiles=profiles)
+            self.assertRaises(Exception, bounded_correction.get_profiles_minimal_forests, profiles=profiles)
+
+    def test_save_load(self):
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, only_minimal=True,
+                                symmetry_reduction=True)
+        minimal_costs = correction.get_minimal_edit_costs()
+
+        # Save the correction and check that the loaded correction represents the same corrections
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "correction.sppf")
+            correction.save(path=path)
+            loaded_correction = Correction.load(path=path, to_correct=self.to_correct, minimal_dfa=self.minimal_dfa)
+
+            self.assertTrue(loaded_correction.miniml_costs_calculated)
+            self.assertEqual(loaded_correction.get_minimal_edit_costs(), minimal_costs)
+            self.assertEqual(repr(loaded_correction.get_all_corrections()), repr(correction.get_all_corrections()))
+
+    def test_cache(self):
+        # Define a DFA to be corrected and an isomorphic DFA with the states 1 and 2 swapped
+        isomorphic_dfa = FiniteAutomata({0}, [(0, 'a', 2), (2, '0', 0), (2, 'a', 1)], {2})
+
+        # Check that the SPPF of the isomorphic DFA is taken from the cache and translated to its states
+        cache = CorrectionCache(maxsize=2)
+        cache.get_correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, only_minimal=True)
+        correction = cache.get_correction(to_correct=isomorphic_dfa, minimal_dfa=self.minimal_dfa, only_minimal=True)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # The cached SPPF represents the same corrections, but only up to their order and the order of their steps
+        expected_correction = Correction(to_correct=isomorphic_dfa, minimal_dfa=self.minimal_dfa, only_minimal=True)
+        self.assertEqual(sorted(sorted(repr(step) for step in edits) for edits in correction.get_all_corrections()),
+                         sorted(sorted(repr(step) for step in edits)
+                                for edits in expected_correction.get_all_corrections()))
+        self.assertEqual([costs for costs, _ in correction.k_best(k=3)],
+                         [costs for costs, _ in expected_correction.k_best(k=3)])
+
+        # Check that the order of the cached SPPF is consistent in itself
+        for index, edits in enumerate(correction.get_all_corrections()):
+            self.assertEqual(repr(correction.correction_at(index=index)), repr(edits))
+            self.assertEqual(correction.index_of(correction=edits), index)
+
+        # Check that DFAs which differ only in the numbering of their unreachable states share the cached SPPF
+        cache = CorrectionCache(maxsize=2)
+        unreachable_dfa = FiniteAutomata({0}, [(0, 'a', 1), (1, '0', 0), (1, 'a', 2), (3, 'a', 4), (4, '0', 0)], {1})
+        isomorphic_dfa = FiniteAutomata({0}, [(0, 'a', 1), (1, '0', 0), (1, 'a', 2), (4, 'a', 3), (3, '0', 0)], {1})
+        cache.get_correction(to_correct=unreachable_dfa, minimal_dfa=self.minimal_dfa, only_minimal=True)
+        correction = cache.get_correction(to_correct=isomorphic_dfa, minimal_dfa=self.minimal_dfa, only_minimal=True)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        expected_correction = Correction(to_correct=isomorphic_dfa, minimal_dfa=self.minimal_dfa, only_minimal=True)
+        self.assertEqual(sorted(sorted(repr(step) for step in edits) for edits in correction.get_all_corrections()),
+                         sorted(sorted(repr(step) for step in edits)
+                                for edits in expected_correction.get_all_corrections()))
+
+    def test_target(self):
+        target = TargetLanguage.compile(minimal_dfa=self.minimal_dfa)
+
+        # Check that the corrections with the compiled target equal the corrections with the minimal DFA
+        for to_correct in [self.to_correct, FiniteAutomata({0}, [(0, 'a', 0)], {0})]:
+            correction = Correction(to_correct=to_correct, target=target, only_minimal=True)
+            expected_correction = Correction(to_correct=to_correct, minimal_dfa=self.minimal_dfa, only_minimal=True)
+            self.assertEqual(sorted(repr(edits) for edits in correction.get_all_corrections()),
+                             sorted(repr(edits) for edits in expected_correction.get_all_corrections()))
+
+    def test_correct_many(self):
+        target = TargetLanguage.compile(minimal_dfa=self.minimal_dfa)
+
+        # Correct the submissions in a pool of two workers
+        submissions = [self.to_correct,
+                       FiniteAutomata({0}, [(0, 'a', 0)], {0}),
+                       FiniteAutomata({0}, [(0, 'a', 1), (1, '0', 0)], {1})]
+        results = dict(correct_many(submissions=submissions, target=target, workers=2, timeout=60,
+                                    number_of_corrections=2, only_minimal=True))
+        self.assertEqual(sorted(results), [0, 1, 2])
+
+        # Check the compact results against the corrections of the submissions
+        for index, to_correct in enumerate(submissions):
+            correction = Correction(to_correct=to_correct, target=target, only_minimal=True)
+            self.assertEqual(results[index]["status"], CORRECTED)
+            self.assertLessEqual(results[index]["construction_runtime"], results[index]["runtime"])
+            self.assertEqual(results[index]["minimal_edit_costs"], correction.get_minimal_edit_costs())
+            self.assertEqual(results[index]["number_of_minimal_corrections"], correction.get_number_of_corrections())
+            self.assertEqual(repr(results[index]["corrections"]), repr([edits for _, edits in correction.k_best(k=2)]))
+
+    def test_limits(self):
+        # Check that the construction stops as soon as the SPPF exceeds the maximum number of symbol nodes
+        correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa)
+        number_of_symbol_nodes = correction.construction_statistics["number_of_symbol_nodes"]
+        limited_correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                        max_nodes=number_of_symbol_nodes // 2)
+        self.assertEqual(limited_correction.exhausted_limit, MAX_NODES)
+        self.assertIsNone(limited_correction.forest)
+        self.assertLess(limited_correction.construction_statistics["number_of_expanded_nodes"],
+                        correction.construction_statistics["number_of_expanded_nodes"])
+        self.assertGreater(limited_correction.construction_statistics["frontier_size"], 0)
+
+        # Check that an expired deadline stops the construction and that sufficient limits do not change the SPPF
+        self.assertEqual(Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                    deadline=time.monotonic()).exhausted_limit, DEADLINE)
+        limited_correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                        deadline=time.monotonic() + 60, max_nodes=number_of_symbol_nodes)
+        self.assertIsNone(limited_correction.exhausted_limit)
+        self.assertEqual(limited_correction.get_minimal_edit_costs(), correction.get_minimal_edit_costs())
+        self.assertEqual(limited_correction.forest.family_symbols, correction.forest.family_symbols)
+        self.assertEqual(limited_correction.forest.family_edits, correction.forest.family_edits)
+
+    def test_anytime(self):
+        # Check that the costs decrease and that the last correction is a minimal correction
+        statistics = {}
+        corrections = list(Correction.anytime(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa,
+                                              deadline=time.monotonic() + 60, statistics=statistics))
+        self.assertTrue(all(costs > next_costs for (costs, _), (next_costs, _) in zip(corrections, corrections[1:])))
+        self.assertIsNone(statistics["exhausted_limit"])
+
+        minimal_correction = Correction(to_correct=self.to_correct, minimal_dfa=self.minimal_dfa, only_minimal=True)
+        self.assertEqual(corrections[-1][0], minimal_correction.get_minimal_edit_costs())
+        self.assertIn(repr(corrections[-1][1]), [repr(edits) for edits in minimal_correction.get_all_corrections()])